@@ -236,6 +236,7 @@ class AssetAdmin(admin.ModelAdmin):
             'fields': (
                 ('purchase_price', 'current_value'),
                 'purchase_date',
+                ('depreciation_method', 'salvage_value', 'useful_life_units'),
                 'depreciated_value',
                 'depreciation_rate',
                 'financial_summary'
@@ -538,13 +539,15 @@ class AssetAdmin(admin.ModelAdmin):
     mark_maintenance_due.short_description = "Mark maintenance due"
 
     def calculate_depreciation(self, request, queryset):
-        """Calculate depreciation for selected assets"""
-        updated = 0
-        for asset in queryset:
-            if asset.purchase_price and asset.purchase_date:
-                # This would trigger depreciation calculation
-                updated += 1
-        self.message_user(request, f"Depreciation calculated for {updated} assets.")
+        """Rebuild the depreciation schedules of selected assets"""
+        from .depreciation import rebuild_depreciation_schedules
+
+        created, updated, deleted = rebuild_depreciation_schedules(queryset)
+        self.message_user(
+            request,
+            f"Depreciation schedules rebuilt: {created} years added, "
+            f"{updated} updated, {deleted} removed.",
+        )
     calculate_depreciation.short_description = "Calculate depreciation"
 
     def schedule_maintenance(self, request, queryset):
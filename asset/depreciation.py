@@ -0,0 +1,308 @@
+# asset/depreciation.py
+"""
+Depreciation schedules for assets, stored as ``AssetDepreciation`` rows.
+
+A schedule has one row per calendar year of service, starting with the
+purchase year (full-year convention), for the method chosen on the asset.
+Amounts are computed per method as whole columns (one list per schedule,
+rounded to cents, with the final year absorbing rounding) and written in
+batches with ``bulk_create``/``bulk_update``. A period close copies the
+book value at the end of the closed year into ``Asset.current_value`` so
+analytics can aggregate stored values instead of calling per-asset
+properties.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from home.widgets import invalidate_dashboard_widgets
+
+from .models import Asset, AssetDepreciation, DepreciationMethod
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+
+# Units-of-production schedules stop here even if usage never reaches the
+# expected lifetime units
+MAX_SCHEDULE_YEARS = 50
+
+
+def _cents(value):
+    return value.quantize(CENT)
+
+
+def _settle(amounts, depreciable):
+    """Round ``amounts`` to cents, putting the rounding difference in the last year"""
+    rounded = [_cents(amount) for amount in amounts]
+    if rounded:
+        rounded[-1] += depreciable - sum(rounded)
+    return rounded
+
+
+def straight_line(depreciable, life):
+    return _settle([depreciable / life] * life, depreciable)
+
+
+def sum_of_years(depreciable, life):
+    total = Decimal(life * (life + 1) // 2)
+    return _settle([depreciable * (life - year) / total for year in range(life)], depreciable)
+
+
+def declining_balance(basis, salvage, life, factor=Decimal("2")):
+    """Double-declining balance, switching to straight line when that is larger"""
+    rate = factor / life
+    book = basis
+    amounts = []
+    for year in range(life):
+        remaining = book - salvage
+        straight = remaining / (life - year)
+        amount = min(max(book * rate, straight), remaining)
+        amounts.append(amount)
+        book -= amount
+    return _settle(amounts, basis - salvage)
+
+
+def units_of_production(depreciable, life_units, units_per_year):
+    """Depreciate in proportion to usage, at ``units_per_year`` until used up"""
+    amounts, used = [], ZERO
+    while used < life_units and len(amounts) < MAX_SCHEDULE_YEARS:
+        units = min(units_per_year, life_units - used)
+        amounts.append(depreciable * units / life_units)
+        used += units
+    if used < life_units:
+        return [_cents(amount) for amount in amounts]
+    return _settle(amounts, depreciable)
+
+
+def annual_amounts(method, basis, salvage, life, life_units=None, units_per_year=None):
+    """Annual depreciation amounts for one asset, first year first
+
+    Units of production falls back to straight line when the expected
+    lifetime units or the usage rate are unknown.
+    """
+    salvage = min(salvage or ZERO, basis)
+    depreciable = basis - salvage
+    if depreciable <= 0 or life < 1:
+        return []
+    if method == DepreciationMethod.DECLINING_BALANCE:
+        return declining_balance(basis, salvage, life)
+    if method == DepreciationMethod.SUM_OF_YEARS:
+        return sum_of_years(depreciable, life)
+    if method == DepreciationMethod.UNITS_OF_PRODUCTION and life_units and units_per_year:
+        return units_of_production(depreciable, life_units, units_per_year)
+    return straight_line(depreciable, life)
+
+
+def _usage_rate(usage_hours, purchase_date, today):
+    """Average usage hours per year since purchase"""
+    years = max(Decimal((today - purchase_date).days) / Decimal("365.25"), Decimal("1"))
+    return (usage_hours or ZERO) / years
+
+
+def asset_schedule(row, today=None):
+    """``[(year, annual, accumulated)]`` for an asset values row"""
+    today = today or date.today()
+    amounts = annual_amounts(
+        row["depreciation_method"],
+        row["purchase_price"],
+        row["salvage_value"],
+        row["category__default_depreciation_years"],
+        life_units=row["useful_life_units"],
+        units_per_year=_usage_rate(row["usage_hours"], row["purchase_date"], today),
+    )
+    schedule, accumulated = [], ZERO
+    first_year = row["purchase_date"].year
+    for offset, amount in enumerate(amounts):
+        accumulated += amount
+        schedule.append((first_year + offset, amount, accumulated))
+    return schedule
+
+
+def schedule_for(asset, today=None):
+    """Compute (without storing) the schedule of an ``Asset`` instance"""
+    if not (asset.purchase_price and asset.purchase_date):
+        return []
+    return asset_schedule({
+        "depreciation_method": asset.depreciation_method,
+        "purchase_price": asset.purchase_price,
+        "salvage_value": asset.salvage_value,
+        "purchase_date": asset.purchase_date,
+        "usage_hours": asset.usage_hours,
+        "useful_life_units": asset.useful_life_units,
+        "category__default_depreciation_years": asset.category.default_depreciation_years,
+    }, today)
+
+
+def book_value_series(asset):
+    """``[(label, book value)]`` from purchase to the end of the schedule
+
+    Stored rows carry their own basis, so they chart correctly even if the
+    asset's purchase price has since been cleared.
+    """
+    records = list(asset.depreciation_records.order_by("depreciation_year"))
+    if records:
+        basis = records[0].basis_value
+        points = [(record.depreciation_year, record.basis_value - record.accumulated_depreciation)
+                  for record in records]
+    else:
+        basis = asset.purchase_price or ZERO
+        points = [(year, basis - accumulated)
+                  for year, _annual, accumulated in schedule_for(asset)]
+    return [("Purchase", basis)] + [(str(year), value) for year, value in points]
+
+
+SCHEDULE_FIELDS = (
+    "pk",
+    "depreciation_method",
+    "purchase_price",
+    "salvage_value",
+    "purchase_date",
+    "usage_hours",
+    "useful_life_units",
+    "category__default_depreciation_years",
+)
+
+
+def _depreciable_assets(assets):
+    return assets.filter(purchase_price__gt=0, purchase_date__isnull=False)
+
+
+def rebuild_depreciation_schedules(assets=None, batch_size=500, today=None):
+    """Recompute and store the schedules of ``assets`` (default: all)
+
+    Assets are processed ``batch_size`` at a time; existing rows are updated in
+    place, missing years created and years no longer in the schedule deleted.
+    Returns ``(created, updated, deleted)``.
+    """
+    if assets is None:
+        assets = Asset.objects.all()
+    rows = list(_depreciable_assets(assets).order_by("pk").values(*SCHEDULE_FIELDS))
+    created = updated = deleted = 0
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        existing = {
+            (record.asset_id, record.depreciation_year): record
+            for record in AssetDepreciation.objects.filter(
+                asset_id__in=[row["pk"] for row in batch]
+            )
+        }
+        to_create, to_update = [], []
+        for row in batch:
+            life = row["category__default_depreciation_years"]
+            for year, annual, accumulated in asset_schedule(row, today):
+                values = {
+                    "method": row["depreciation_method"],
+                    "basis_value": row["purchase_price"],
+                    "salvage_value": row["salvage_value"],
+                    "useful_life_years": life,
+                    "annual_depreciation": annual,
+                    "accumulated_depreciation": accumulated,
+                }
+                record = existing.pop((row["pk"], year), None)
+                if record is None:
+                    to_create.append(AssetDepreciation(
+                        asset_id=row["pk"], depreciation_year=year, **values
+                    ))
+                elif any(getattr(record, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(record, field, value)
+                    to_update.append(record)
+
+        with transaction.atomic():
+            AssetDepreciation.objects.bulk_create(to_create, batch_size=batch_size)
+            AssetDepreciation.objects.bulk_update(
+                to_update,
+                ["method", "basis_value", "salvage_value", "useful_life_years",
+                 "annual_depreciation", "accumulated_depreciation"],
+                batch_size=batch_size,
+            )
+            if existing:
+                AssetDepreciation.objects.filter(
+                    pk__in=[record.pk for record in existing.values()]
+                ).delete()
+        created += len(to_create)
+        updated += len(to_update)
+        deleted += len(existing)
+
+    # Assets that lost their purchase price or date keep no schedule
+    stale = AssetDepreciation.objects.filter(asset__in=assets).exclude(
+        asset__in=_depreciable_assets(assets)
+    )
+    deleted += stale.delete()[0]
+    return created, updated, deleted
+
+
+def _closing_records(assets, year):
+    """Each asset's schedule row for ``year``, or its last row before it"""
+    latest = (
+        AssetDepreciation.objects.filter(asset=OuterRef("asset"), depreciation_year__lte=year)
+        .order_by("-depreciation_year")
+        .values("depreciation_year")[:1]
+    )
+    return AssetDepreciation.objects.filter(
+        asset__in=assets, depreciation_year=Subquery(latest)
+    )
+
+
+def book_values(assets, year):
+    """``{asset_id: book value at the end of year}`` from the stored schedules"""
+    return dict(
+        _closing_records(assets, year)
+        .annotate(book=F("basis_value") - F("accumulated_depreciation"))
+        .values_list("asset_id", "book")
+    )
+
+
+def close_depreciation_period(year, assets=None, batch_size=500):
+    """Write the end-of-``year`` book value into ``Asset.current_value``
+
+    Returns the number of assets updated.
+    """
+    if assets is None:
+        assets = Asset.objects.all()
+    values = book_values(assets, year)
+    changed = [
+        Asset(pk=pk, current_value=_cents(value))
+        for pk, value in values.items()
+    ]
+    with transaction.atomic():
+        Asset.objects.bulk_update(changed, ["current_value"], batch_size=batch_size)
+    invalidate_dashboard_widgets("assets")
+    return len(changed)
+
+
+def portfolio_depreciation(assets, year=None):
+    """Purchase value, book value and accumulated depreciation for ``assets``
+
+    Scheduled assets are valued from their stored schedule as of ``year``
+    (default: this year); the rest from their recorded ``current_value``,
+    or their purchase price when none is recorded.
+    """
+    year = year or date.today().year
+    scheduled = _closing_records(assets, year).aggregate(
+        purchase=Sum("basis_value"),
+        book=Sum(F("basis_value") - F("accumulated_depreciation")),
+    )
+    unscheduled = assets.exclude(
+        pk__in=AssetDepreciation.objects.filter(
+            depreciation_year__lte=year
+        ).values("asset_id")
+    ).aggregate(
+        purchase=Sum("purchase_price", filter=Q(purchase_price__isnull=False)),
+        book=Sum(
+            Coalesce("current_value", "purchase_price"),
+            filter=Q(purchase_price__isnull=False),
+        ),
+    )
+    purchase = (scheduled["purchase"] or ZERO) + (unscheduled["purchase"] or ZERO)
+    book = (scheduled["book"] or ZERO) + (unscheduled["book"] or ZERO)
+    return {
+        "total_purchase_value": purchase,
+        "total_current_value": book,
+        "total_depreciation": purchase - book,
+    }
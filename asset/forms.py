@@ -37,6 +37,7 @@ class AssetForm(forms.ModelForm):
             'manufacturer', 'model', 'year', 'serial_number',
             'description', 'primary_image',
             'purchase_price', 'current_value', 'purchase_date', 'warranty_expiration',
+            'depreciation_method', 'salvage_value', 'useful_life_units',
             'assigned_office', 'assigned_department', 'assigned_worker', 'current_project',
             'status', 'location_status', 'condition',
             'usage_hours', 'mileage', 'is_personal', 'is_billable', 'hourly_rate',
@@ -48,6 +49,9 @@ class AssetForm(forms.ModelForm):
             'description': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
             'purchase_price': forms.NumberInput(attrs={'step': '0.01', 'class': 'form-control'}),
             'current_value': forms.NumberInput(attrs={'step': '0.01', 'class': 'form-control'}),
+            'depreciation_method': forms.Select(attrs={'class': 'form-select'}),
+            'salvage_value': forms.NumberInput(attrs={'step': '0.01', 'class': 'form-control'}),
+            'useful_life_units': forms.NumberInput(attrs={'step': '0.1', 'class': 'form-control'}),
             'hourly_rate': forms.NumberInput(attrs={'step': '0.01', 'class': 'form-control'}),
             'usage_hours': forms.NumberInput(attrs={'step': '0.1', 'class': 'form-control'}),
         }
@@ -0,0 +1,36 @@
+"""
+depreciate_assets.py - Rebuild the stored depreciation schedules and,
+optionally, close a fiscal year by writing each asset's book value at the end
+of that year into its current value.
+"""
+
+from django.core.management.base import BaseCommand
+
+from asset.depreciation import close_depreciation_period, rebuild_depreciation_schedules
+
+
+class Command(BaseCommand):
+    help = 'Rebuild AssetDepreciation schedules and optionally close a year.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--close-year', type=int,
+            help='Write book values at the end of this year to Asset.current_value',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Assets processed per batch (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        created, updated, deleted = rebuild_depreciation_schedules(
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(
+            f'Schedules: {created} rows created, {updated} updated, {deleted} deleted.'
+        )
+        if options['close_year']:
+            count = close_depreciation_period(
+                options['close_year'], batch_size=options['batch_size'],
+            )
+            self.stdout.write(f'Closed {options["close_year"]} for {count} assets.')
@@ -0,0 +1,26 @@
+"""
+rollup_asset_utilization.py - Rebuild the daily asset utilization rollups read
+by the asset analytics page. Meant to run nightly from cron.
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from asset.utilization import rollup_daily_utilization
+
+
+class Command(BaseCommand):
+    help = 'Rebuild AssetUtilizationRollup rows from asset assignment intervals.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=7,
+            help='Number of days up to today to rebuild (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        end = date.today()
+        start = end - timedelta(days=max(options['days'], 1) - 1)
+        count = rollup_daily_utilization(start, end)
+        self.stdout.write(f'Stored {count} utilization rollup rows for {start} to {end}.')
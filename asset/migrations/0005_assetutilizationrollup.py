@@ -0,0 +1,31 @@
+# Generated by Django 5.2.13 on 2026-10-19 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0004_asset_assignment_projects'),
+        ('company', '0004_businessapplication_company_business_apps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetUtilizationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('asset_count', models.PositiveIntegerField(default=0)),
+                ('assets_in_use', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization_rollups', to='asset.assetcategory')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asset_utilization_rollups', to='company.company')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['company', 'date'], name='asset_asset_company_96b6f6_idx')],
+                'unique_together': {('date', 'company', 'category')},
+            },
+        ),
+    ]
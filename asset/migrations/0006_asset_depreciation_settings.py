@@ -0,0 +1,30 @@
+# Generated by Django 5.2.13 on 2026-10-19 13:21
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset', '0005_assetutilizationrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='depreciation_method',
+            field=models.CharField(choices=[('straight_line', 'Straight Line'), ('declining_balance', 'Declining Balance'), ('sum_of_years', 'Sum of Years Digits'), ('units_of_production', 'Units of Production')], default='straight_line', help_text='Method used for the depreciation schedule', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='salvage_value',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Estimated value at the end of its useful life', max_digits=18, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))]),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='useful_life_units',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Expected lifetime usage hours (units of production)', max_digits=12, null=True),
+        ),
+    ]
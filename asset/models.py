@@ -170,6 +170,26 @@ class Asset(UUIDModel, TimeStampedModel):
         validators=[MinValueValidator(Decimal("0.00"))],
         help_text="Current estimated value",
     )
+    depreciation_method = models.CharField(
+        max_length=20,
+        choices=DepreciationMethod.choices,
+        default=DepreciationMethod.STRAIGHT_LINE,
+        help_text="Method used for the depreciation schedule",
+    )
+    salvage_value = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        validators=[MinValueValidator(Decimal("0.00"))],
+        help_text="Estimated value at the end of its useful life",
+    )
+    useful_life_units = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Expected lifetime usage hours (units of production)",
+    )
 
     # Dates
     purchase_date = models.DateField(null=True, blank=True, help_text="Date purchased")
@@ -334,27 +354,42 @@ class Asset(UUIDModel, TimeStampedModel):
         return get_dynamic_choices("asset_type", self.category.business_category)
 
     # Financial calculations
+    def _depreciation_this_year(self):
+        """(year, annual, accumulated) for the latest scheduled year up to now"""
+        from .depreciation import schedule_for
+
+        year = date.today().year
+        record = (
+            self.depreciation_records.filter(depreciation_year__lte=year)
+            .order_by("-depreciation_year")
+            .first()
+        )
+        if record is not None:
+            return (
+                record.depreciation_year,
+                record.annual_depreciation,
+                record.accumulated_depreciation,
+            )
+        past = [row for row in schedule_for(self) if row[0] <= year]
+        return past[-1] if past else None
+
     @property
     def depreciated_value(self):
-        """Calculate depreciated value"""
+        """Book value at the end of this year from the depreciation schedule"""
         if self.purchase_price and self.purchase_date:
-            years_owned = (date.today() - self.purchase_date).days / 365.25
-            depreciation_years = self.category.default_depreciation_years
-
-            if years_owned >= depreciation_years:
-                return Decimal("0.00")
-
-            annual_depreciation = self.purchase_price / depreciation_years
-            total_depreciation = annual_depreciation * Decimal(str(years_owned))
-
-            return max(self.purchase_price - total_depreciation, Decimal("0.00"))
+            current = self._depreciation_this_year()
+            if current is None:
+                return self.purchase_price
+            return max(self.purchase_price - current[2], Decimal("0.00"))
         return self.current_value or Decimal("0.00")
 
     @property
     def depreciation_rate(self):
-        """Calculate annual depreciation rate"""
-        if self.purchase_price and self.purchase_price > 0:
-            return self.purchase_price / self.category.default_depreciation_years
+        """Depreciation charged for this year"""
+        if self.purchase_price and self.purchase_price > 0 and self.purchase_date:
+            current = self._depreciation_this_year()
+            if current is not None and current[0] == date.today().year:
+                return current[1]
         return Decimal("0.00")
 
     @property
@@ -399,10 +434,12 @@ class Asset(UUIDModel, TimeStampedModel):
 
     @property
     def utilization_rate(self):
-        """Calculate utilization rate (for billable assets)"""
-        # This would need to be calculated based on actual usage data
-        # Placeholder for now
-        return 0
+        """Percent of the last 90 days this asset was assigned out"""
+        from .utilization import asset_utilization
+
+        end = date.today()
+        start = end - timedelta(days=89)
+        return round(asset_utilization([self.pk], start, end).get(self.pk, 0) * 100, 1)
 
     # Maintenance management
     def schedule_next_maintenance(self):
@@ -563,6 +600,40 @@ class AssetDepreciation(UUIDModel, TimeStampedModel):
         return f"{self.asset.asset_number} - Year {self.depreciation_year}"
 
 
+class AssetUtilizationRollup(models.Model):
+    """Daily assigned-asset counts per company and category
+
+    Rebuilt from AssetAssignment intervals by
+    ``asset.utilization.rollup_daily_utilization``.
+    """
+
+    date = models.DateField()
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name="asset_utilization_rollups"
+    )
+    category = models.ForeignKey(
+        AssetCategory, on_delete=models.CASCADE, related_name="utilization_rollups"
+    )
+    asset_count = models.PositiveIntegerField(default=0)
+    assets_in_use = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        unique_together = ["date", "company", "category"]
+        indexes = [
+            models.Index(fields=["company", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.category} on {self.date}: {self.assets_in_use}/{self.asset_count}"
+
+    @property
+    def utilization_rate(self):
+        if not self.asset_count:
+            return 0
+        return round(self.assets_in_use / self.asset_count * 100, 1)
+
+
 # Default data creation functions
 def create_default_asset_categories():
     """Create default asset categories for different business types"""
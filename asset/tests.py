@@ -1,9 +1,16 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
 
-from .models import Asset, AssetCategory, AssetAssignment
+from .models import Asset, AssetCategory, AssetAssignment, AssetDepreciation, AssetUtilizationRollup
+from .utilization import asset_utilization, find_conflicts, merge_intervals, rollup_daily_utilization
 from project.models import Project
 from location.models import BusinessCategory
 from company.models import Company
+from home.testing import QueryBudgetMixin
 
 
 class AssetAssignmentTests(TestCase):
@@ -31,3 +38,238 @@ class AssetAssignmentTests(TestCase):
 
         self.assertIn(self.project, self.asset.projects.all())
         self.assertIn(self.asset, self.project.assets.all())
+
+
+class AssetUtilizationTests(TestCase):
+    def setUp(self):
+        self.bc = BusinessCategory.objects.create(name="Test")
+        self.company = Company.objects.create(
+            company_name="Co", primary_contact_name="PC", business_category=self.bc
+        )
+        self.category = AssetCategory.objects.create(
+            business_category=self.bc, name="Tool"
+        )
+        self.asset = Asset.objects.create(
+            asset_number="A1",
+            name="Asset1",
+            category=self.category,
+            asset_type="tool",
+            company=self.company,
+        )
+        self.project = Project.objects.create(job_number="P1", name="Proj1")
+        self.start = date.today() - timedelta(days=9)
+        self.end = date.today()
+
+    def assign(self, first, last, status="active"):
+        return AssetAssignment.objects.create(
+            asset=self.asset,
+            assigned_to_project=self.project,
+            start_date=self.start + timedelta(days=first),
+            end_date=None if last is None else self.start + timedelta(days=last),
+            status=status,
+        )
+
+    def test_merge_intervals_joins_overlapping_and_adjacent_ranges(self):
+        day = date(2024, 1, 1)
+        merged = merge_intervals([
+            (day, day + timedelta(days=2)),
+            (day + timedelta(days=1), day + timedelta(days=4)),
+            (day + timedelta(days=5), day + timedelta(days=5)),
+            (day + timedelta(days=8), day + timedelta(days=9)),
+        ])
+        self.assertEqual(merged, [
+            (day, day + timedelta(days=5)),
+            (day + timedelta(days=8), day + timedelta(days=9)),
+        ])
+
+    def test_utilization_counts_overlapping_days_once(self):
+        self.assign(0, 3)
+        self.assign(2, 4)
+        self.assign(6, 9, status="cancelled")
+
+        utilization = asset_utilization([self.asset.pk], self.start, self.end)
+        self.assertAlmostEqual(utilization[self.asset.pk], 0.5)
+        self.assertEqual(self.asset.utilization_rate, 5.6)
+
+    def test_find_conflicts_reports_double_bookings(self):
+        first = self.assign(0, 5)
+        second = self.assign(4, None)
+        self.assign(7, 8, status="cancelled")
+
+        conflicts = find_conflicts(self.start, self.end)
+        self.assertEqual(conflicts, [{
+            "asset_id": self.asset.pk,
+            "assignment_id": first.pk,
+            "conflicting_assignment_id": second.pk,
+            "overlap_start": self.start + timedelta(days=4),
+            "overlap_end": self.start + timedelta(days=5),
+        }])
+
+    def test_rollup_daily_utilization(self):
+        Asset.objects.create(
+            asset_number="A2",
+            name="Asset2",
+            category=self.category,
+            asset_type="tool",
+            company=self.company,
+        )
+        Asset.objects.update(created_at=timezone.now() - timedelta(days=30))
+        self.assign(2, 3)
+
+        written = rollup_daily_utilization(self.start, self.end)
+        self.assertEqual(written, 10)
+        rollups = {
+            rollup.date: rollup
+            for rollup in AssetUtilizationRollup.objects.filter(company=self.company)
+        }
+        self.assertEqual(rollups[self.start].asset_count, 2)
+        self.assertEqual(rollups[self.start].assets_in_use, 0)
+        self.assertEqual(rollups[self.start + timedelta(days=2)].assets_in_use, 1)
+        self.assertEqual(rollups[self.start + timedelta(days=2)].utilization_rate, 50)
+
+        # Rerunning replaces the window instead of duplicating it
+        rollup_daily_utilization(self.start, self.end)
+        self.assertEqual(AssetUtilizationRollup.objects.count(), 10)
+
+
+class DepreciationScheduleTests(TestCase):
+    def setUp(self):
+        self.bc = BusinessCategory.objects.create(name="Test")
+        self.company = Company.objects.create(
+            company_name="Co", primary_contact_name="PC", business_category=self.bc
+        )
+        self.category = AssetCategory.objects.create(
+            business_category=self.bc, name="Tool", default_depreciation_years=5
+        )
+        self.purchased = date(date.today().year - 2, 3, 1)
+        self.asset = Asset.objects.create(
+            asset_number="D1",
+            name="Lift",
+            category=self.category,
+            asset_type="tool",
+            company=self.company,
+            purchase_price=Decimal("1000.00"),
+            salvage_value=Decimal("100.00"),
+            purchase_date=self.purchased,
+        )
+
+    def test_method_amounts(self):
+        from .depreciation import annual_amounts
+
+        basis, salvage = Decimal("1000"), Decimal("100")
+        self.assertEqual(
+            annual_amounts("straight_line", basis, salvage, 5), [Decimal("180.00")] * 5
+        )
+        self.assertEqual(
+            annual_amounts("sum_of_years", basis, salvage, 5),
+            [Decimal(value) for value in ("300.00", "240.00", "180.00", "120.00", "60.00")],
+        )
+        self.assertEqual(
+            annual_amounts("declining_balance", basis, salvage, 5),
+            [Decimal(value) for value in ("400.00", "240.00", "144.00", "86.40", "29.60")],
+        )
+        self.assertEqual(
+            annual_amounts("units_of_production", basis, salvage, 5,
+                           life_units=Decimal("1000"), units_per_year=Decimal("400")),
+            [Decimal("360.00"), Decimal("360.00"), Decimal("180.00")],
+        )
+        # Without expected lifetime units the schedule is straight line
+        self.assertEqual(len(annual_amounts("units_of_production", basis, salvage, 5)), 5)
+
+    def test_rebuild_and_close_period(self):
+        from .depreciation import (
+            close_depreciation_period,
+            portfolio_depreciation,
+            rebuild_depreciation_schedules,
+        )
+
+        self.assertEqual(rebuild_depreciation_schedules(), (5, 0, 0))
+        self.assertEqual(rebuild_depreciation_schedules(), (0, 0, 0))
+
+        Asset.objects.filter(pk=self.asset.pk).update(depreciation_method="sum_of_years")
+        self.assertEqual(rebuild_depreciation_schedules(), (0, 5, 0))
+        years = list(
+            AssetDepreciation.objects.filter(asset=self.asset)
+            .values_list("depreciation_year", "accumulated_depreciation")
+        )
+        self.assertEqual(years[0], (self.purchased.year, Decimal("300.00")))
+        self.assertEqual(years[-1], (self.purchased.year + 4, Decimal("900.00")))
+
+        close_year = self.purchased.year + 1
+        self.assertEqual(close_depreciation_period(close_year), 1)
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.current_value, Decimal("460.00"))
+
+        totals = portfolio_depreciation(Asset.objects.all())
+        self.assertEqual(totals["total_purchase_value"], Decimal("1000.00"))
+        self.assertEqual(totals["total_current_value"], Decimal("280.00"))
+        self.assertEqual(self.asset.depreciated_value, Decimal("280.00"))
+        self.assertEqual(self.asset.depreciation_rate, Decimal("180.00"))
+
+
+    def test_book_value_series_uses_stored_basis(self):
+        from .depreciation import book_value_series, rebuild_depreciation_schedules
+
+        self.assertEqual(book_value_series(self.asset)[:2], [
+            ("Purchase", Decimal("1000.00")),
+            (str(self.purchased.year), Decimal("820.00")),
+        ])
+        rebuild_depreciation_schedules()
+        Asset.objects.filter(pk=self.asset.pk).update(purchase_price=None)
+        self.asset.refresh_from_db()
+        series = book_value_series(self.asset)
+        self.assertEqual(series[0], ("Purchase", Decimal("1000.00")))
+        self.assertEqual(series[-1], (str(self.purchased.year + 4), Decimal("100.00")))
+
+
+class AssetNumberTests(TestCase):
+    def setUp(self):
+        self.bc = BusinessCategory.objects.create(name="Test")
+        self.company = Company.objects.create(
+            company_name="Co", primary_contact_name="PC", business_category=self.bc
+        )
+        self.category = AssetCategory.objects.create(
+            business_category=self.bc, name="Vehicle"
+        )
+
+    def test_numbers_are_scoped_by_prefix(self):
+        from .utils import allocate_asset_numbers, generate_asset_number, preview_asset_number
+
+        Asset.objects.create(
+            asset_number="VEH0007", name="Truck", category=self.category,
+            asset_type="vehicle", company=self.company,
+        )
+        self.assertEqual(preview_asset_number(self.category), "VEH0008")
+        self.assertEqual(generate_asset_number(self.category), "VEH0008")
+        self.assertEqual(allocate_asset_numbers(None, 2), ["AST0001", "AST0002"])
+        self.assertEqual(generate_asset_number(self.category), "VEH0009")
+
+
+class AssetQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        self.bc = BusinessCategory.objects.create(name="Test")
+        self.company = Company.objects.create(
+            company_name="Co", primary_contact_name="PC", business_category=self.bc
+        )
+        self.category = AssetCategory.objects.create(
+            business_category=self.bc, name="Tool"
+        )
+        project = Project.objects.create(job_number="P1", name="Proj1")
+        for number in range(5):
+            asset = Asset.objects.create(
+                asset_number=f"B{number}", name=f"Asset{number}",
+                category=self.category, asset_type="tool", company=self.company,
+            )
+            AssetAssignment.objects.create(
+                asset=asset, assigned_to_project=project, status="active"
+            )
+        user = get_user_model().objects.create_user(
+            email="assets@example.com", password="pass", employee_id="AB1",
+            roles=["employee"],
+        )
+        self.client.force_login(user)
+
+    def test_asset_list_budget(self):
+        self.assertViewQueryBudget(reverse("asset:list"))
@@ -0,0 +1,64 @@
+"""Utility functions for the asset app."""
+
+import re
+from typing import List, Optional
+
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast, Substr
+
+from home.sequences import allocate_numbers, peek
+
+from .models import Asset, AssetCategory
+
+ASSET_NUMBER_SCOPE = "asset.asset_number:{prefix}"
+DEFAULT_ASSET_PREFIX = "AST"
+
+
+def asset_number_prefix(category: Optional[AssetCategory]) -> str:
+    """Three-letter prefix for a category's asset numbers (``AST`` if none)."""
+    return category.name[:3].upper() if category else DEFAULT_ASSET_PREFIX
+
+
+def _sequence_args(prefix: str):
+    def highest():
+        """Largest numeric suffix already used with ``prefix``."""
+        value = (
+            Asset.objects.filter(asset_number__regex=rf"^{re.escape(prefix)}[0-9]+$")
+            .annotate(
+                number=Cast(Substr("asset_number", len(prefix) + 1), BigIntegerField())
+            )
+            .aggregate(highest=Max("number"))["highest"]
+        )
+        return value or 0
+
+    def taken(numbers):
+        return Asset.objects.filter(asset_number__in=numbers).values_list(
+            "asset_number", flat=True
+        )
+
+    return ASSET_NUMBER_SCOPE.format(prefix=prefix), highest, taken
+
+
+def allocate_asset_numbers(category: Optional[AssetCategory], count: int) -> List[str]:
+    """Allocate ``count`` asset numbers (e.g. ``VEH0042``) for ``category``.
+
+    Call inside the transaction that saves the assets so a rollback returns
+    the numbers.
+    """
+    prefix = asset_number_prefix(category)
+    scope, highest, taken = _sequence_args(prefix)
+    return allocate_numbers(
+        scope, count, lambda value: f"{prefix}{value:04d}", taken=taken, seed=highest
+    )
+
+
+def generate_asset_number(category: Optional[AssetCategory]) -> str:
+    """Allocate the next asset number for ``category``."""
+    return allocate_asset_numbers(category, 1)[0]
+
+
+def preview_asset_number(category: Optional[AssetCategory]) -> str:
+    """The asset number the next asset in ``category`` would get."""
+    prefix = asset_number_prefix(category)
+    scope, highest, _taken = _sequence_args(prefix)
+    return f"{prefix}{peek(scope, seed=highest):04d}"
@@ -14,7 +14,9 @@ from django.views.generic import (
 )
 from django.urls import reverse_lazy, reverse
 from django.http import JsonResponse, HttpResponse, Http404, HttpResponseRedirect
-from django.db.models import Q, Count, Sum, Avg, F, Max
+from django.db.models import (
+    Q, Count, Sum, Avg, F, Max, Value, DateField, DurationField, ExpressionWrapper,
+)
 from django.core.paginator import Paginator
 from django.utils import timezone
 from django.conf import settings
@@ -30,8 +32,10 @@ from decimal import Decimal
 # Import your models
 from .models import (
     Asset, AssetCategory, AssetMaintenanceRecord, 
-    AssetAssignment, AssetDepreciation
+    AssetAssignment, AssetDepreciation, AssetUtilizationRollup
 )
+from .depreciation import book_value_series, portfolio_depreciation
+from .utils import allocate_asset_numbers, generate_asset_number
 from .forms import (
     AssetForm, AssetBulkUpdateForm, AssetAssignmentForm,
     AssetMaintenanceForm, AssetSearchForm, AssetCategoryForm,
@@ -147,32 +151,48 @@ class AssetAnalyticsView(LoginRequiredMixin, TemplateView):
         return context
     
     def get_utilization_analytics(self, assets):
-        """Calculate asset utilization rates."""
-        total_assets = assets.count()
-        in_use = assets.filter(status='in_use').count()
-        utilization_rate = (in_use / total_assets * 100) if total_assets > 0 else 0
+        """Asset utilization from the daily rollups (see asset.utilization)."""
+        user_company = getattr(self.request.user, 'company', None)
+        since = date.today() - timedelta(days=29)
+        trend = list(
+            AssetUtilizationRollup.objects.filter(company=user_company, date__gte=since)
+            .values('date')
+            .annotate(asset_count=Sum('asset_count'), in_use=Sum('assets_in_use'))
+            .order_by('date')
+        )
+        for day in trend:
+            day['utilization_rate'] = round(
+                day['in_use'] / day['asset_count'] * 100 if day['asset_count'] else 0, 1
+            )
+        latest = trend[-1] if trend else {'in_use': 0, 'utilization_rate': 0}
+        status_counts = assets.aggregate(
+            available_count=Count('id', filter=Q(status='available')),
+            maintenance_count=Count('id', filter=Q(status='maintenance')),
+        )
         
         return {
-            'utilization_rate': round(utilization_rate, 1),
-            'in_use_count': in_use,
-            'available_count': assets.filter(status='available').count(),
-            'maintenance_count': assets.filter(status='maintenance').count(),
+            'utilization_rate': latest['utilization_rate'],
+            'in_use_count': latest['in_use'],
+            'available_count': status_counts['available_count'],
+            'maintenance_count': status_counts['maintenance_count'],
+            'trend': trend,
         }
     
     def get_depreciation_analytics(self, assets):
-        """Calculate depreciation analytics."""
-        with_purchase_price = assets.exclude(purchase_price__isnull=True)
-        
-        total_purchase = with_purchase_price.aggregate(Sum('purchase_price'))['purchase_price__sum'] or 0
-        total_current = with_purchase_price.aggregate(Sum('current_value'))['current_value__sum'] or 0
-        total_depreciation = total_purchase - total_current
-        
+        """Calculate depreciation analytics from the stored schedules."""
+        totals = portfolio_depreciation(assets)
+        total_purchase = totals['total_purchase_value']
+        total_depreciation = totals['total_depreciation']
+
+        today = Value(date.today(), output_field=DateField())
+        avg_age = assets.filter(purchase_date__isnull=False).aggregate(
+            avg=Avg(ExpressionWrapper(today - F('purchase_date'), output_field=DurationField()))
+        )['avg']
+
         return {
-            'total_purchase_value': total_purchase,
-            'total_current_value': total_current,
-            'total_depreciation': total_depreciation,
+            **totals,
             'depreciation_rate': round((total_depreciation / total_purchase * 100) if total_purchase > 0 else 0, 1),
-            'avg_asset_age': round(sum([asset.age_in_years for asset in assets]) / assets.count() if assets.count() > 0 else 0, 1),
+            'avg_asset_age': round(avg_age.days / 365.25 if avg_age else 0, 1),
         }
     
     def get_maintenance_analytics(self, assets):
@@ -343,12 +363,18 @@ class AssetDetailView(LoginRequiredMixin, DetailView):
         # Depreciation info
         current_depreciation = asset.depreciated_value
         depreciation_rate = asset.depreciation_rate
+        book_values = book_value_series(asset)
+        depreciation_chart = {
+            'labels': [label for label, _value in book_values],
+            'values': [float(value) for _label, value in book_values],
+        }
         
         context.update({
             'maintenance_records': maintenance_records,
             'assignment_history': assignment_history,
             'current_depreciation': current_depreciation,
             'depreciation_rate': depreciation_rate,
+            'depreciation_chart': depreciation_chart,
             'is_maintenance_due': asset.is_maintenance_due,
             'days_until_maintenance': asset.days_until_maintenance,
             'is_warranty_active': asset.is_warranty_active,
@@ -371,32 +397,18 @@ class AssetCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
         if hasattr(self.request.user, 'company'):
             form.instance.company = self.request.user.company
         
-        # Generate asset number if not provided
-        if not form.instance.asset_number:
-            form.instance.asset_number = self.generate_asset_number(form.instance.category)
+        with transaction.atomic():
+            # Generate asset number if not provided, in the saving transaction
+            if not form.instance.asset_number:
+                form.instance.asset_number = self.generate_asset_number(form.instance.category)
+            response = super().form_valid(form)
         
         messages.success(self.request, f'Asset {form.instance.name} created successfully.')
-        return super().form_valid(form)
+        return response
     
     def generate_asset_number(self, category):
-        """Generate a unique asset number based on category."""
-        prefix = category.name[:3].upper() if category else 'AST'
-        
-        # Find the next number
-        last_asset = Asset.objects.filter(
-            asset_number__startswith=prefix
-        ).order_by('-asset_number').first()
-        
-        if last_asset:
-            try:
-                last_num = int(last_asset.asset_number[3:])
-                next_num = last_num + 1
-            except ValueError:
-                next_num = 1
-        else:
-            next_num = 1
-        
-        return f"{prefix}{next_num:04d}"
+        """Allocate a unique asset number based on category."""
+        return generate_asset_number(category)
 
 
 class AssetUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
@@ -1058,15 +1070,20 @@ class AssetImportView(LoginRequiredMixin, PermissionRequiredMixin, FormView):
             file_data = csv_file.read().decode('utf-8')
             csv_data = csv.DictReader(io.StringIO(file_data))
             
+            rows = list(csv_data)
             created_count = 0
             error_count = 0
             
-            for row in csv_data:
+            # Pre-allocate one block of numbers for rows that have none
+            missing = sum(1 for row in rows if not (row.get('asset_number') or '').strip())
+            new_numbers = iter(allocate_asset_numbers(None, missing) if missing else [])
+            
+            for row in rows:
                 try:
                     # Create asset from CSV row
                     asset = Asset.objects.create(
                         name=row.get('name', ''),
-                        asset_number=row.get('asset_number', ''),
+                        asset_number=(row.get('asset_number') or '').strip() or next(new_numbers),
                         manufacturer=row.get('manufacturer', ''),
                         model=row.get('model', ''),
                         description=row.get('description', ''),
@@ -1667,39 +1684,39 @@ def process_asset_import(csv_file, user):
     
     try:
         file_data = csv_file.read().decode('utf-8')
-        csv_data = csv.DictReader(io.StringIO(file_data))
+        rows = list(csv.DictReader(io.StringIO(file_data)))
+        
+        # Pre-allocate one block of numbers for rows that have none
+        missing = sum(1 for row in rows if not (row.get('asset_number') or '').strip())
+        new_numbers = iter(allocate_asset_numbers(None, missing) if missing else [])
         
-        for row_num, row in enumerate(csv_data, start=2):
+        for row_num, row in enumerate(rows, start=2):
             try:
-                asset_number = row.get('asset_number', '').strip()
+                asset_number = (row.get('asset_number') or '').strip() or next(new_numbers)
                 
                 # Check if asset exists
-                if asset_number:
-                    asset, created = Asset.objects.get_or_create(
-                        asset_number=asset_number,
-                        defaults={
-                            'name': row.get('name', '').strip(),
-                            'manufacturer': row.get('manufacturer', '').strip(),
-                            'model': row.get('model', '').strip(),
-                            'description': row.get('description', '').strip(),
-                            'purchase_price': Decimal(row.get('purchase_price', '0') or '0'),
-                            'purchase_date': row.get('purchase_date') or None,
-                            'status': row.get('status', 'available').strip(),
-                        }
-                    )
-                    
-                    if created:
-                        results['created'] += 1
-                    else:
-                        # Update existing asset
-                        for field in ['name', 'manufacturer', 'model', 'description']:
-                            if row.get(field):
-                                setattr(asset, field, row[field].strip())
-                        asset.save()
-                        results['updated'] += 1
+                asset, created = Asset.objects.get_or_create(
+                    asset_number=asset_number,
+                    defaults={
+                        'name': row.get('name', '').strip(),
+                        'manufacturer': row.get('manufacturer', '').strip(),
+                        'model': row.get('model', '').strip(),
+                        'description': row.get('description', '').strip(),
+                        'purchase_price': Decimal(row.get('purchase_price', '0') or '0'),
+                        'purchase_date': row.get('purchase_date') or None,
+                        'status': row.get('status', 'available').strip(),
+                    }
+                )
                 
+                if created:
+                    results['created'] += 1
                 else:
-                    results['errors'].append(f'Row {row_num}: Asset number is required')
+                    # Update existing asset
+                    for field in ['name', 'manufacturer', 'model', 'description']:
+                        if row.get(field):
+                            setattr(asset, field, row[field].strip())
+                    asset.save()
+                    results['updated'] += 1
                     
             except Exception as e:
                 results['errors'].append(f'Row {row_num}: {str(e)}')
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.13 on 2026-10-19 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Project primary keys are UUIDs, so the old integer ids could never
+    match a project. The column is recreated rather than altered because
+    databases cannot cast integers to UUIDs."""
+
+    dependencies = [
+        ('client', '0004_servicelocation'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='projectfinancials',
+            name='project_id',
+        ),
+        migrations.AddField(
+            model_name='projectfinancials',
+            name='project_id',
+            field=models.UUIDField(blank=True, db_index=True, help_text='Link to existing Project', null=True),
+        ),
+    ]
@@ -346,7 +346,7 @@ class WIPReport(TimeStampedModel):
 class ProjectFinancials(TimeStampedModel):
     """Detailed financial tracking per project"""
     # This would link to your existing Project model
-    project_id = models.IntegerField(db_index=True, help_text='Link to existing Project')
+    project_id = models.UUIDField(null=True, blank=True, db_index=True, help_text='Link to existing Project')
     
     # Budget vs Actual tracking
     budgeted_labor_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
@@ -380,52 +380,69 @@ class ProjectFinancials(TimeStampedModel):
         return f"Financials for Project {self.project_id}"
 
 # Management functions for automatic calculations
-def update_client_revenue_totals():
-    """Management command to recalculate client revenue totals"""
-    from django.db.models import Sum
-    from django.utils import timezone
-    
-    current_year = timezone.now().year
-    
-    for client in Client.objects.all():
-        # Calculate YTD revenue
-        ytd_revenue = Revenue.objects.filter(
-            client=client,
-            period__start_date__year=current_year
-        ).aggregate(
-            total=Sum('contract_revenue') + Sum('service_revenue') + 
-                  Sum('material_revenue') + Sum('labor_revenue')
-        )['total'] or 0
-        
-        # Calculate total revenue
-        total_revenue = Revenue.objects.filter(
-            client=client
-        ).aggregate(
-            total=Sum('contract_revenue') + Sum('service_revenue') + 
-                  Sum('material_revenue') + Sum('labor_revenue')
-        )['total'] or 0
-        
-        # Update client
-        client.ytd_revenue = ytd_revenue
-        client.total_revenue = total_revenue
-        client.save(update_fields=['ytd_revenue', 'total_revenue'])
+CLIENT_REVENUE_TOTALS_LAST_RUN_KEY = 'client_revenue_totals_last_run'
+
+
+def update_client_revenue_totals(incremental=False, batch_size=1000):
+    """Management command to recalculate client revenue totals
 
-def generate_wip_report(report_date=None):
-    """Generate WIP report data"""
+    Totals for every client come from one grouped aggregation and are
+    written back with ``bulk_update`` in batches, touching only rows whose
+    values changed. With ``incremental=True`` only clients with Revenue rows
+    created or edited since the previous run are recomputed (a full run is
+    still needed to pick up deleted Revenue rows). Returns the number of
+    clients updated.
+    """
+    from django.core.cache import cache
+    from django.db.models import F, Q, Sum
     from django.utils import timezone
-    from django.db.models import Sum, Count
-    
-    if not report_date:
-        report_date = timezone.now().date()
-    
-    # This would integrate with your existing Project model
-    # For now, showing the structure
-    
-    wip_data = {
-        'backlog_by_status': {},
-        'revenue_by_month': {},
-        'top_clients': [],
-        # Add more report sections as needed
+
+    started = timezone.now()
+    current_year = started.year
+
+    revenues = Revenue.objects.all()
+    clients = Client.objects.all()
+    last_run = cache.get(CLIENT_REVENUE_TOTALS_LAST_RUN_KEY) if incremental else None
+    if last_run is not None:
+        changed = Revenue.objects.filter(updated_at__gte=last_run).values('client_id')
+        revenues = revenues.filter(client_id__in=changed)
+        clients = clients.filter(id__in=changed)
+
+    amount = (F('contract_revenue') + F('service_revenue') +
+              F('material_revenue') + F('labor_revenue'))
+    totals = {
+        row['client_id']: row
+        for row in revenues.values('client_id').annotate(
+            ytd=Sum(amount, filter=Q(period__start_date__year=current_year)),
+            total=Sum(amount),
+        ).order_by()
     }
-    
-    return wip_data
+
+    updated = 0
+    pending = []
+    for client in clients.only('id', 'ytd_revenue', 'total_revenue'):
+        row = totals.get(client.id, {})
+        ytd_revenue = row.get('ytd') or Decimal('0')
+        total_revenue = row.get('total') or Decimal('0')
+        if client.ytd_revenue != ytd_revenue or client.total_revenue != total_revenue:
+            client.ytd_revenue = ytd_revenue
+            client.total_revenue = total_revenue
+            pending.append(client)
+        if len(pending) >= batch_size:
+            updated += Client.objects.bulk_update(pending, ['ytd_revenue', 'total_revenue'])
+            pending = []
+    if pending:
+        updated += Client.objects.bulk_update(pending, ['ytd_revenue', 'total_revenue'])
+
+    cache.set(CLIENT_REVENUE_TOTALS_LAST_RUN_KEY, started, None)
+    return updated
+
+def generate_wip_report(report_date=None, save=True):
+    """Generate WIP report data
+
+    See ``client.wip`` for how the figures are computed. The report is saved
+    as the ``WIPReport`` snapshot for ``report_date`` unless ``save`` is off.
+    """
+    from .wip import build_wip_report
+
+    return build_wip_report(report_date, save=save)
@@ -1,3 +1,128 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import (
+    Client, FinancialPeriod, ProjectFinancials, Revenue, WIPReport,
+    generate_wip_report, update_client_revenue_totals,
+)
+
+
+class ClientRevenueTotalsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        year = timezone.now().year
+        self.current = FinancialPeriod.objects.create(
+            name="Current", start_date=date(year, 1, 1), end_date=date(year, 12, 31),
+            period_type="yearly",
+        )
+        self.previous = FinancialPeriod.objects.create(
+            name="Previous", start_date=date(year - 1, 1, 1), end_date=date(year - 1, 12, 31),
+            period_type="yearly",
+        )
+        self.acme = Client.objects.create(company_name="Acme")
+        self.globex = Client.objects.create(company_name="Globex")
+        Revenue.objects.create(
+            client=self.acme, period=self.current,
+            contract_revenue=100, service_revenue=50, warranty_revenue=999,
+        )
+        Revenue.objects.create(client=self.acme, period=self.previous, labor_revenue=25)
+
+    def test_totals_are_recomputed_in_bulk(self):
+        with self.assertNumQueries(3):  # totals, clients, one bulk update
+            self.assertEqual(update_client_revenue_totals(), 2)
+
+        self.acme.refresh_from_db()
+        self.globex.refresh_from_db()
+        self.assertEqual(self.acme.ytd_revenue, Decimal("150"))
+        self.assertEqual(self.acme.total_revenue, Decimal("175"))
+        self.assertEqual(self.globex.total_revenue, Decimal("0"))
+
+        self.assertEqual(update_client_revenue_totals(), 0)
+
+    def test_incremental_run_only_recomputes_changed_clients(self):
+        update_client_revenue_totals()
+        Client.objects.filter(pk=self.acme.pk).update(total_revenue=1)
+        Revenue.objects.create(client=self.globex, period=self.current, material_revenue=10)
+
+        self.assertEqual(update_client_revenue_totals(incremental=True), 1)
+
+        self.acme.refresh_from_db()
+        self.globex.refresh_from_db()
+        self.assertEqual(self.acme.total_revenue, Decimal("1"))
+        self.assertEqual(self.globex.ytd_revenue, Decimal("10"))
+
+
+class WIPReportTests(TestCase):
+    def setUp(self):
+        from location.models import Location
+        from project.models import Project
+
+        self.client_obj = Client.objects.create(company_name="Acme")
+        location = Location.objects.create(client=self.client_obj, name="Site", description="d")
+        self.job = Project.objects.create(
+            job_number="J1", name="Job", status="installing", primary_location=location,
+            contract_value=1000, estimated_cost=600, percent_complete=40, invoiced_amount=500,
+        )
+        Project.objects.create(
+            job_number="J2", name="Other", status="installing",
+            contract_value=200, percent_complete=50,
+        )
+        Project.objects.create(job_number="Q1", name="Quote", status="quoted", contract_value=999)
+
+    def test_report_figures(self):
+        today = timezone.now().date()
+        data = generate_wip_report(today)
+
+        job = data["projects"][str(self.job.pk)]
+        self.assertEqual(job["earned"], Decimal("400.00"))
+        self.assertEqual(job["over_billing"], Decimal("100.00"))
+        self.assertEqual(job["backlog"], Decimal("600.00"))
+        self.assertEqual(data["totals"]["under_billing"], Decimal("100.00"))
+        self.assertEqual(data["backlog_by_status"], {"installing": Decimal("700.00")})
+
+        report = WIPReport.objects.get(report_date=today)
+        self.assertEqual(report.total_wip, Decimal("500.00"))
+        self.assertEqual(report.projects_installing, 2)
+        self.assertEqual(report.projects_quoted, 1)
+        self.assertEqual(report.period.period_type, "monthly")
+
+    def test_financials_and_previous_snapshot(self):
+        today = timezone.now().date()
+        generate_wip_report(today)
+        ProjectFinancials.objects.create(
+            project_id=self.job.pk, percent_complete=70, change_order_amount=100,
+            invoiced_to_date=800,
+        )
+
+        data = generate_wip_report(today + timedelta(days=30))
+        job = data["projects"][str(self.job.pk)]
+        self.assertEqual(job["contract"], Decimal("1100.00"))
+        self.assertEqual(job["earned"], Decimal("770.00"))
+        self.assertEqual(job["earned_this_period"], Decimal("370.00"))
+        self.assertEqual(job["billed"], Decimal("800.00"))
+
+        # Re-running a date replaces its snapshot
+        generate_wip_report(today + timedelta(days=30))
+        self.assertEqual(WIPReport.objects.count(), 2)
+
+    def test_revenue_by_month_covers_exactly_the_last_twelve_months(self):
+        from .wip import REVENUE_MONTHS, _add_months
+
+        report_date = date(2026, 10, 31)
+        for offset in range(-13, 1):
+            start = _add_months(report_date, offset)
+            period = FinancialPeriod.objects.create(
+                name=start.strftime("%b %Y"), start_date=start,
+                end_date=_add_months(start, 1) - timedelta(days=1), period_type="monthly",
+            )
+            Revenue.objects.create(client=self.client_obj, period=period, contract_revenue=10)
 
-# Create your tests here.
+        months = generate_wip_report(report_date)["revenue_by_month"]
+        self.assertEqual(REVENUE_MONTHS, 12)
+        self.assertEqual(len(months), 12)
+        self.assertEqual(min(months), "2025-11")
+        self.assertEqual(max(months), "2026-10")
@@ -20,6 +20,7 @@ import json
 from .models import Client, Address, Contact, Revenue, FinancialPeriod
 from .forms import ClientForm, AddressForm, ContactForm
 from wip.models import WIPItem
+from home.stats import StatsQuery
 
 class StaffRequiredMixin(UserPassesTestMixin):
     """Mixin to require staff permissions"""
@@ -33,6 +34,17 @@ class AdminRequiredMixin(UserPassesTestMixin):
                 hasattr(self.request.user, 'is_admin') and 
                 self.request.user.is_admin)
 
+# Dashboard counters, evaluated as one conditional aggregate over Client
+CLIENT_DASHBOARD_STATS = (
+    StatsQuery('client_dashboard', Client.objects.all(), tags=('clients',))
+    .count('total_clients')
+    .count('active_clients', status='active')
+    .count('prospect_clients', status='prospect')
+    .count('inactive_clients', status='inactive')
+    .count_each_choice('status')
+    .count_each_choice('business_type', exclude=('',))
+)
+
 @login_required
 def client_dashboard(request):
     """
@@ -40,13 +52,12 @@ def client_dashboard(request):
     """
     template = 'client/client_dashboard.html'
     
-    # Get client statistics
+    # Get client statistics (one aggregate query, cached until clients change)
     clients = Client.objects.all()
+    client_stats = CLIENT_DASHBOARD_STATS.get()
     stats = {
-        'total_clients': clients.count(),
-        'active_clients': clients.filter(status='active').count(),
-        'prospect_clients': clients.filter(status='prospect').count(),
-        'inactive_clients': clients.filter(status='inactive').count(),
+        key: client_stats[key]
+        for key in ('total_clients', 'active_clients', 'prospect_clients', 'inactive_clients')
     }
     
     # Recent clients
@@ -59,15 +70,9 @@ def client_dashboard(request):
         total_revenue__isnull=False
     ).order_by('-total_revenue')[:5]
     
-    # Client status distribution
-    status_stats = clients.values('status').annotate(
-        count=Count('id')
-    ).order_by('status')
-    
-    # Business type distribution
-    business_stats = clients.exclude(business_type='').values(
-        'business_type'
-    ).annotate(count=Count('id')).order_by('business_type')
+    # Client status and business type distribution
+    status_stats = client_stats['status']
+    business_stats = client_stats['business_type']
     
     context = {
         'stats': stats,
@@ -241,15 +246,7 @@ class ClientDetailView(LoginRequiredMixin, generic.DetailView):
         try:
             # Compute from project contracts associated with this client
             from project.models import Project
-            projects = Project.objects.filter(
-                locations__client=client,
-                contract_value__isnull=False
-            )
-            if projects.exists():
-                total_value = projects.aggregate(Sum('contract_value'))[
-                    'contract_value__sum'
-                ]
-                return total_value / projects.count() if total_value else 0
+            return Project.objects.for_client(client).contract_rollup()['average']
         except ImportError:
             pass
         return 0
@@ -0,0 +1,250 @@
+"""Work-in-progress (WIP) schedule engine behind ``generate_wip_report``
+
+Builds the percentage-of-completion figures for every open job from a single
+query over ``Project`` (with its latest ``ProjectFinancials`` row folded in by
+subqueries) and aggregates ``Revenue`` by month and client in the database.
+Results are stored as a ``WIPReport`` snapshot per report date. Revenue earned
+in the period is the change in cumulative earned revenue since the previous
+snapshot, so each run only needs the prior snapshot rather than history.
+"""
+import calendar
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import FinancialPeriod, ProjectFinancials, Revenue, WIPReport
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+# Statuses of jobs that are not (or no longer) on the WIP schedule
+WIP_EXCLUDED_STATUSES = ('prospect', 'quoted', 'cancelled', 'paid')
+
+# WIPReport count field -> project statuses it covers
+STATUS_COUNT_FIELDS = {
+    'projects_prospecting': ('prospect',),
+    'projects_quoted': ('quoted',),
+    'projects_installing': ('active', 'installing'),
+    'projects_complete': ('complete',),
+    'projects_invoiced': ('invoiced',),
+    'projects_paid': ('paid',),
+}
+
+TOP_CLIENTS_LIMIT = 10
+REVENUE_MONTHS = 12
+
+MONEY = DecimalField(max_digits=20, decimal_places=2)
+
+
+def _money(value):
+    return (value or ZERO).quantize(CENT)
+
+
+def _period_for(report_date):
+    """Monthly FinancialPeriod containing ``report_date``, created if missing"""
+    period = FinancialPeriod.objects.filter(
+        period_type='monthly', start_date__lte=report_date, end_date__gte=report_date,
+    ).first()
+    if period is None:
+        last_day = calendar.monthrange(report_date.year, report_date.month)[1]
+        period = FinancialPeriod.objects.create(
+            name=report_date.strftime('%b %Y'),
+            start_date=report_date.replace(day=1),
+            end_date=report_date.replace(day=last_day),
+            period_type='monthly',
+        )
+    return period
+
+
+def _project_rows(report_date):
+    """One row per job on the WIP schedule as of ``report_date``"""
+    from project.models import Project  # Avoid circular import
+
+    financials = ProjectFinancials.objects.filter(
+        project_id=OuterRef('pk'),
+    ).order_by('-updated_at')
+
+    def latest(field):
+        return Subquery(financials.values(field)[:1], output_field=MONEY)
+
+    return (
+        Project.objects.filter(created_at__date__lte=report_date)
+        .exclude(status__in=WIP_EXCLUDED_STATUSES)
+        .annotate(
+            change_orders=latest('change_order_amount'),
+            financials_percent=latest('percent_complete'),
+            financials_invoiced=latest('invoiced_to_date'),
+            financials_collected=latest('collected_to_date'),
+        )
+        .values(
+            'id', 'job_number', 'name', 'status',
+            'contract_value', 'estimated_cost', 'percent_complete',
+            'invoiced_amount', 'paid_amount',
+            'change_orders', 'financials_percent',
+            'financials_invoiced', 'financials_collected',
+            'primary_location__client__company_name',
+        )
+        .order_by('job_number')
+    )
+
+
+def project_wip(row, previous_earned=None):
+    """Percentage-of-completion figures for one project row
+
+    ProjectFinancials values win over the project's own progress and billing
+    fields when a financials row exists. ``previous_earned`` is the job's
+    cumulative earned revenue in the prior snapshot.
+    """
+    contract = _money(row['contract_value']) + _money(row['change_orders'])
+    percent = row['financials_percent']
+    if percent is None:
+        percent = row['percent_complete']
+    percent = min(max(percent or ZERO, ZERO), Decimal('100'))
+
+    billed = row['financials_invoiced']
+    if billed is None:
+        billed = row['invoiced_amount']
+    collected = row['financials_collected']
+    if collected is None:
+        collected = row['paid_amount']
+    billed = _money(billed)
+    collected = _money(collected)
+
+    earned = _money(contract * percent / 100)
+    estimated_cost = _money(row['estimated_cost'])
+    return {
+        'job_number': row['job_number'],
+        'name': row['name'],
+        'client': row['primary_location__client__company_name'] or '',
+        'status': row['status'],
+        'contract': contract,
+        'percent_complete': percent.quantize(CENT),
+        'earned': earned,
+        'earned_this_period': earned - _money(previous_earned),
+        'cost_to_date': _money(estimated_cost * percent / 100),
+        'billed': billed,
+        'collected': collected,
+        'backlog': max(contract - earned, ZERO),
+        'over_billing': max(billed - earned, ZERO),
+        'under_billing': max(earned - billed, ZERO),
+    }
+
+
+def _status_counts(report_date):
+    from project.models import Project  # Avoid circular import
+
+    return Project.objects.filter(created_at__date__lte=report_date).aggregate(**{
+        field: Count('id', filter=Q(status__in=statuses))
+        for field, statuses in STATUS_COUNT_FIELDS.items()
+    })
+
+
+def _revenue_amount():
+    return (F('contract_revenue') + F('service_revenue') + F('material_revenue') +
+            F('labor_revenue') + F('change_order_revenue') + F('warranty_revenue'))
+
+
+def _add_months(day, months):
+    """First day of the month ``months`` calendar months after ``day``'s"""
+    years, month = divmod(day.month - 1 + months, 12)
+    return day.replace(year=day.year + years, month=month + 1, day=1)
+
+
+def _revenue_by_month(report_date):
+    first_month = _add_months(report_date, -(REVENUE_MONTHS - 1))
+    rows = (
+        Revenue.objects.filter(period__start_date__gte=first_month,
+                               period__start_date__lte=report_date)
+        .annotate(month=TruncMonth('period__start_date'))
+        .values('month')
+        .annotate(total=Sum(_revenue_amount()))
+        .order_by('month')
+    )
+    return {row['month'].strftime('%Y-%m'): _money(row['total']) for row in rows}
+
+
+def _top_clients(report_date):
+    rows = (
+        Revenue.objects.filter(period__start_date__year=report_date.year,
+                               period__start_date__lte=report_date)
+        .values('client_id', 'client__company_name')
+        .annotate(total=Sum(_revenue_amount()))
+        .order_by('-total')[:TOP_CLIENTS_LIMIT]
+    )
+    return [
+        {'client_id': str(row['client_id']), 'client': row['client__company_name'],
+         'revenue': _money(row['total'])}
+        for row in rows
+    ]
+
+
+def _jsonable(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def build_wip_report(report_date=None, save=True):
+    """Compute the WIP schedule for ``report_date`` and return its data
+
+    With ``save`` the figures are stored as the ``WIPReport`` for that date,
+    replacing an earlier run for the same date.
+    """
+    if not report_date:
+        report_date = timezone.now().date()
+
+    previous = (
+        WIPReport.objects.filter(report_date__lt=report_date)
+        .only('report_date', 'detailed_data').order_by('-report_date').first()
+    )
+    previous_projects = previous.detailed_data.get('projects', {}) if previous else {}
+
+    projects = {}
+    for row in _project_rows(report_date):
+        prior = previous_projects.get(str(row['id']), {})
+        projects[str(row['id'])] = project_wip(row, Decimal(prior.get('earned', '0')))
+
+    totals = defaultdict(lambda: ZERO)
+    backlog_by_status = defaultdict(lambda: ZERO)
+    for figures in projects.values():
+        for key in ('contract', 'earned', 'earned_this_period', 'cost_to_date', 'billed',
+                    'collected', 'backlog', 'over_billing', 'under_billing'):
+            totals[key] += figures[key]
+        backlog_by_status[figures['status']] += figures['backlog']
+
+    wip_data = {
+        'report_date': report_date.isoformat(),
+        'previous_report_date': previous.report_date.isoformat() if previous else None,
+        'totals': dict(totals),
+        'backlog_by_status': dict(backlog_by_status),
+        'revenue_by_month': _revenue_by_month(report_date),
+        'top_clients': _top_clients(report_date),
+        'projects': projects,
+    }
+    counts = _status_counts(report_date)
+    wip_data['status_counts'] = counts
+
+    if save:
+        with transaction.atomic():
+            WIPReport.objects.update_or_create(
+                report_date=report_date,
+                defaults={
+                    'name': f'WIP Report {report_date:%Y-%m-%d}',
+                    'period': _period_for(report_date),
+                    'total_backlog': totals['backlog'],
+                    'total_wip': totals['earned'],
+                    'total_invoiced': totals['billed'],
+                    'total_paid': totals['collected'],
+                    'detailed_data': _jsonable(wip_data),
+                    **counts,
+                },
+            )
+    return wip_data
@@ -0,0 +1,230 @@
+"""
+django-helpdesk - A Django powered ticket tracker for small enterprise.
+
+(c) Copyright 2008 Jutda. All Rights Reserved. See LICENSE for details.
+
+bulk.py - Set-based ticket operations behind the ticket list's mass update.
+
+Each operation narrows the given ticket queryset to the tickets it would
+change, applies the change with a single UPDATE and bulk creates the matching
+FollowUps, so closing thousands of tickets costs a handful of queries rather
+than several per ticket. Because the UPDATE skips Ticket's post_save, the
+dashboard widgets of the affected queues are expired explicitly. Notification
+e-mails are queued until the transaction commits and then delivered in
+batches over shared connections, one message per recipient.
+"""
+import logging
+import threading
+
+from django.core.mail import get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from helpdesk import settings as helpdesk_settings
+from helpdesk.lib import (
+    get_compiled_email_template, queue_template_context, safe_template_context,
+    send_templated_mail,
+)
+from helpdesk.models import FollowUp, Ticket
+from home.widgets import invalidate_dashboard_widgets
+
+logger = logging.getLogger('helpdesk')
+
+
+def _apply(tickets, changes, user, title, public, new_status=None):
+    """
+    Apply changes to every ticket in the queryset and add one FollowUp each.
+
+    Mirrors what FollowUp.save() does for a single ticket: bumps modified and,
+    for public follow-ups, records the first response date.
+    Returns the ids of the tickets that were updated.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(tickets.order_by().values_list('id', 'status', 'queue_id'))
+        if not rows:
+            return []
+        ids = [pk for pk, _status, _queue in rows]
+
+        Ticket.objects.filter(id__in=ids).update(modified=now, **changes)
+        if public:
+            Ticket.objects.filter(
+                id__in=ids, first_response_date__isnull=True,
+            ).update(first_response_date=now)
+
+        FollowUp.objects.bulk_create([
+            FollowUp(
+                ticket_id=pk,
+                date=now,
+                title=title,
+                public=public,
+                user=user,
+                new_status=new_status,
+                old_status=status if new_status is not None else None,
+            )
+            for pk, status, _queue in rows
+        ], batch_size=500)
+    invalidate_dashboard_widgets(*{'queue:%s' % queue for _pk, _status, queue in rows})
+    return ids
+
+
+def bulk_assign(tickets, owner, user):
+    """Assign the tickets that aren't already owned by owner to them."""
+    return _apply(
+        tickets.exclude(assigned_to=owner),
+        {'assigned_to': owner},
+        user,
+        _('Assigned to %(username)s in bulk update' % {
+            'username': owner.get_username()
+        }),
+        public=True,
+    )
+
+
+def bulk_unassign(tickets, user):
+    """Clear the owner of every assigned ticket."""
+    return _apply(
+        tickets.filter(assigned_to__isnull=False),
+        {'assigned_to': None},
+        user,
+        _('Unassigned in bulk update'),
+        public=True,
+    )
+
+
+def bulk_close(tickets, user, public=False):
+    """
+    Close every ticket that isn't closed yet. Public closes also notify the
+    submitter, CCs, owner and queue CC once the transaction commits.
+    """
+    ids = _apply(
+        tickets.exclude(status=Ticket.CLOSED_STATUS),
+        {'status': Ticket.CLOSED_STATUS},
+        user,
+        _('Closed in bulk update'),
+        public=public,
+        new_status=Ticket.CLOSED_STATUS,
+    )
+    if public and ids:
+        queue_closed_notifications(ids, user)
+    return ids
+
+
+def bulk_delete(tickets):
+    """Delete the tickets; returns how many were removed."""
+    count = tickets.count()
+    tickets.delete()
+    return count
+
+
+def closed_ticket_messages(ticket_ids, user):
+    """
+    Build the (template_name, context, recipient, sender) tuples that a
+    public close of ticket_ids should send.
+
+    Tickets, queues, owners and CCs are loaded in three queries. Addresses
+    are compared case-insensitively across the whole batch and each recipient
+    gets one message: the usual per-ticket e-mail if only one of their
+    tickets was closed, otherwise a single closed_batch e-mail listing all of
+    them. Without a closed_batch template the per-ticket e-mails are sent.
+    """
+    tickets = Ticket.objects.filter(id__in=ticket_ids).select_related(
+        'queue', 'assigned_to',
+    ).prefetch_related('cc_list__user')
+
+    # lowered address -> [address, [(template_name, context, sender)]]
+    recipients = {}
+
+    def add(template_name, ticket, context, address):
+        address = (address or '').strip()
+        if not address:
+            return
+        entry = recipients.setdefault(address.lower(), [address, []])
+        if all(queued[1] is not context for queued in entry[1]):
+            entry[1].append((template_name, context, ticket.queue.from_address))
+
+    for ticket in tickets:
+        context = safe_template_context(ticket)
+        context.update(resolution=ticket.resolution,
+                       queue=queue_template_context(ticket.queue))
+
+        add('closed_submitter', ticket, context, ticket.submitter_email)
+        for cc in ticket.cc_list.all():
+            add('closed_submitter', ticket, context, cc.recipient_email)
+        if ticket.assigned_to and ticket.assigned_to != user:
+            add('closed_owner', ticket, context, ticket.assigned_to.email)
+        add('closed_cc', ticket, context, ticket.queue.updated_ticket_cc)
+
+    messages = []
+    batch_templates = {}
+    for address, queued in recipients.values():
+        _name, context, sender = queued[0]
+        locale = context['queue'].get('locale') or helpdesk_settings.HELPDESK_EMAIL_FALLBACK_LOCALE
+        if len(queued) > 1 and locale not in batch_templates:
+            batch_templates[locale] = get_compiled_email_template('closed_batch', locale)
+            if batch_templates[locale] is None:
+                logger.warning('No closed_batch e-mail template for locale %s, '
+                               'sending one e-mail per ticket', locale)
+        if len(queued) > 1 and batch_templates[locale] is not None:
+            context = dict(
+                context,
+                tickets=[ticket_context['ticket'] for _name, ticket_context, _sender in queued],
+                other_count=len(queued) - 1,
+            )
+            messages.append(('closed_batch', context, address, sender))
+        else:
+            messages.extend((name, ticket_context, address, ticket_sender)
+                            for name, ticket_context, ticket_sender in queued)
+    return messages
+
+
+def deliver_messages(messages):
+    """Send queued messages, reusing one mail connection per batch."""
+    batch_size = max(helpdesk_settings.HELPDESK_BULK_NOTIFICATION_BATCH_SIZE, 1)
+    for start in range(0, len(messages), batch_size):
+        with get_connection(fail_silently=True) as connection:
+            for template_name, context, recipient, sender in messages[start:start + batch_size]:
+                send_templated_mail(
+                    template_name,
+                    context,
+                    recipients=recipient,
+                    sender=sender,
+                    fail_silently=True,
+                    connection=connection,
+                )
+
+
+def _send_closed_notifications(ticket_ids, user):
+    try:
+        deliver_messages(closed_ticket_messages(ticket_ids, user))
+    except Exception:
+        logger.exception('Failed to send bulk close notifications')
+
+
+def _send_closed_notifications_in_thread(ticket_ids, user):
+    try:
+        _send_closed_notifications(ticket_ids, user)
+    finally:
+        db_connection.close()
+
+
+def queue_closed_notifications(ticket_ids, user):
+    """
+    Send the close notifications for ticket_ids after the current transaction
+    commits, from a background thread unless
+    HELPDESK_BULK_NOTIFICATIONS_ASYNC is turned off.
+    """
+    ticket_ids = list(ticket_ids)
+
+    def dispatch():
+        if helpdesk_settings.HELPDESK_BULK_NOTIFICATIONS_ASYNC:
+            threading.Thread(
+                target=_send_closed_notifications_in_thread,
+                args=(ticket_ids, user),
+                daemon=True,
+            ).start()
+        else:
+            _send_closed_notifications(ticket_ids, user)
+
+    transaction.on_commit(dispatch)
@@ -9,6 +9,8 @@ lib.py - Common functions (eg multipart e-mail)
 import logging
 import mimetypes
 import os
+import threading
+from collections import OrderedDict
 from smtplib import SMTPException
 
 try:
@@ -35,13 +37,160 @@ from helpdesk.models import Attachment, EmailTemplate
 logger = logging.getLogger('helpdesk')
 
 
+class CompiledEmailTemplate(object):
+    """
+    The subject, plain text and HTML parts of an EmailTemplate, compiled once
+    and reused by every send_templated_mail() call that needs them.
+    """
+
+    def __init__(self, email_template, locale):
+        from django.template import engines
+        from helpdesk.settings import HELPDESK_EMAIL_SUBJECT_TEMPLATE
+        from_string = engines['django'].from_string
+
+        self.pk = email_template.pk
+        self.template_name = email_template.template_name
+        self.updated_at = email_template.updated_at
+
+        self.subject = from_string(
+            HELPDESK_EMAIL_SUBJECT_TEMPLATE % {
+                "subject": email_template.subject
+            })
+
+        footer_file = os.path.join('helpdesk', locale, 'email_text_footer.txt')
+        self.text = from_string(
+            "%s{%% include '%s' %%}" % (email_template.plain_text, footer_file)
+        )
+
+        email_html_base_file = os.path.join('helpdesk', locale, 'email_html_base.html')
+        self.html = from_string(
+            "{%% extends '%s' %%}{%% block title %%}"
+            "%s"
+            "{%% endblock %%}{%% block content %%}%s{%% endblock %%}" %
+            (email_html_base_file, email_template.heading, email_template.html)
+        )
+
+
+# Process-local LRU of compiled templates, keyed by (version, template_name,
+# locale). Missing templates are cached as None so repeated sends don't keep
+# querying. version is a counter in the shared cache that is bumped whenever
+# an EmailTemplate is saved or deleted (see helpdesk.models.templates), so
+# every worker process stops using its stale copies, not just the one that
+# saved the template.
+EMAIL_TEMPLATE_VERSION_KEY = 'helpdesk_email_template_version'
+
+_email_template_cache = OrderedDict()
+_email_template_cache_lock = threading.Lock()
+
+
+def get_compiled_email_template(template_name, locale):
+    """
+    Return the CompiledEmailTemplate for template_name in locale, falling back
+    to the template with no locale, or None if neither exists.
+    """
+    from django.core.cache import cache
+    from helpdesk.settings import HELPDESK_EMAIL_TEMPLATE_CACHE_SIZE
+
+    version = cache.get_or_set(EMAIL_TEMPLATE_VERSION_KEY, 0, None)
+    key = (version, template_name.lower(), locale)
+    with _email_template_cache_lock:
+        if key in _email_template_cache:
+            _email_template_cache.move_to_end(key)
+            return _email_template_cache[key]
+
+    try:
+        t = EmailTemplate.objects.get(template_name__iexact=template_name, locale=locale)
+    except EmailTemplate.DoesNotExist:
+        try:
+            t = EmailTemplate.objects.get(template_name__iexact=template_name, locale__isnull=True)
+        except EmailTemplate.DoesNotExist:
+            t = None
+
+    compiled = CompiledEmailTemplate(t, locale) if t is not None else None
+
+    if HELPDESK_EMAIL_TEMPLATE_CACHE_SIZE > 0:
+        with _email_template_cache_lock:
+            _email_template_cache[key] = compiled
+            _email_template_cache.move_to_end(key)
+            while len(_email_template_cache) > HELPDESK_EMAIL_TEMPLATE_CACHE_SIZE:
+                _email_template_cache.popitem(last=False)
+
+    return compiled
+
+
+def invalidate_email_template_cache(email_template=None):
+    """
+    Expire compiled templates in every process by bumping the shared version,
+    and drop this process's copies of email_template (matched by name or
+    primary key, so renames and locale fallbacks are covered), or empty the
+    local cache when no template is given.
+    """
+    from django.core.cache import cache
+
+    cache.add(EMAIL_TEMPLATE_VERSION_KEY, 0, None)
+    try:
+        cache.incr(EMAIL_TEMPLATE_VERSION_KEY)
+    except ValueError:
+        cache.set(EMAIL_TEMPLATE_VERSION_KEY, 1, None)
+
+    with _email_template_cache_lock:
+        if email_template is None:
+            _email_template_cache.clear()
+            return
+
+        name = (email_template.template_name or '').lower()
+        stale = [
+            key for key, compiled in _email_template_cache.items()
+            if key[1] == name or (compiled is not None and compiled.pk == email_template.pk)
+        ]
+        for key in stale:
+            del _email_template_cache[key]
+
+
+PRESET_REPLIES_VERSION_KEY = 'helpdesk_preset_replies_version'
+
+
+def get_preset_replies(queue):
+    """
+    Return the [{'id': ..., 'name': ...}] preset replies usable on queue:
+    those limited to it plus those with no queue at all. Cached per queue
+    until any PreSetReply changes.
+    """
+    from django.core.cache import cache
+    from helpdesk.models import PreSetReply
+    from helpdesk.settings import HELPDESK_PRESET_REPLIES_CACHE_TIMEOUT
+
+    version = cache.get_or_set(PRESET_REPLIES_VERSION_KEY, 0, None)
+    key = 'helpdesk_preset_replies:%s:%s' % (version, queue.pk)
+    replies = cache.get(key)
+    if replies is None:
+        replies = list(
+            PreSetReply.objects.filter(Q(queues=queue) | Q(queues__isnull=True))
+            .distinct().values('id', 'name')
+        )
+        cache.set(key, replies, HELPDESK_PRESET_REPLIES_CACHE_TIMEOUT)
+    return replies
+
+
+def invalidate_preset_replies():
+    """Expire every queue's cached preset reply list"""
+    from django.core.cache import cache
+
+    cache.add(PRESET_REPLIES_VERSION_KEY, 0, None)
+    try:
+        cache.incr(PRESET_REPLIES_VERSION_KEY)
+    except ValueError:
+        cache.set(PRESET_REPLIES_VERSION_KEY, 1, None)
+
+
 def send_templated_mail(template_name,
                         context,
                         recipients,
                         sender=None,
                         bcc=None,
                         fail_silently=False,
-                        files=None):
+                        files=None,
+                        connection=None):
     """
     send_templated_mail() is a wrapper around Django's e-mail routines that
     allows us to easily send multipart (text/plain & text/html) e-mails using
@@ -67,48 +216,30 @@ def send_templated_mail(template_name,
     files can be a list of tuples. Each tuple should be a filename to attach,
         along with the File objects to be read. files can be blank.
 
+    connection is an optional open mail backend connection, so callers
+        sending many messages can reuse one SMTP session.
+
     """
     from django.core.mail import EmailMultiAlternatives
-    from django.template import engines
-    from_string = engines['django'].from_string
 
-    from helpdesk.models import EmailTemplate
-    from helpdesk.settings import HELPDESK_EMAIL_SUBJECT_TEMPLATE, \
-        HELPDESK_EMAIL_FALLBACK_LOCALE
+    from helpdesk.settings import HELPDESK_EMAIL_FALLBACK_LOCALE
 
     locale = context['queue'].get('locale') or HELPDESK_EMAIL_FALLBACK_LOCALE
 
-    try:
-        t = EmailTemplate.objects.get(template_name__iexact=template_name, locale=locale)
-    except EmailTemplate.DoesNotExist:
-        try:
-            t = EmailTemplate.objects.get(template_name__iexact=template_name, locale__isnull=True)
-        except EmailTemplate.DoesNotExist:
-            logger.warning('template "%s" does not exist, no mail sent', template_name)
-            return  # just ignore if template doesn't exist
-
-    subject_part = from_string(
-        HELPDESK_EMAIL_SUBJECT_TEMPLATE % {
-            "subject": t.subject
-        }).render(context).replace('\n', '').replace('\r', '')
+    compiled = get_compiled_email_template(template_name, locale)
+    if compiled is None:
+        logger.warning('template "%s" does not exist, no mail sent', template_name)
+        return  # just ignore if template doesn't exist
 
-    footer_file = os.path.join('helpdesk', locale, 'email_text_footer.txt')
+    subject_part = compiled.subject.render(context).replace('\n', '').replace('\r', '')
 
-    text_part = from_string(
-        "%s{%% include '%s' %%}" % (t.plain_text, footer_file)
-    ).render(context)
+    text_part = compiled.text.render(context)
 
-    email_html_base_file = os.path.join('helpdesk', locale, 'email_html_base.html')
     # keep new lines in html emails
     if 'comment' in context:
         context['comment'] = mark_safe(context['comment'].replace('\r\n', '<br>'))
 
-    html_part = from_string(
-        "{%% extends '%s' %%}{%% block title %%}"
-        "%s"
-        "{%% endblock %%}{%% block content %%}%s{%% endblock %%}" %
-        (email_html_base_file, t.heading, t.html)
-    ).render(context)
+    html_part = compiled.html.render(context)
 
     if isinstance(recipients, str):
         if recipients.find(','):
@@ -118,7 +249,7 @@ def send_templated_mail(template_name,
 
     msg = EmailMultiAlternatives(subject_part, text_part,
                                  sender or settings.DEFAULT_FROM_EMAIL,
-                                 recipients, bcc=bcc)
+                                 recipients, bcc=bcc, connection=connection)
     msg.attach_alternative(html_part, "text/html")
 
     if files:
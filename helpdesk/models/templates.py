@@ -162,6 +162,24 @@ class EmailTemplate(models.Model):
     def __str__(self):
         return f'{self.get_template_type_display()}: {self.template_name}'
 
+
+def invalidate_compiled_email_template(sender, instance, **kwargs):
+    """Expire compiled copies of an edited template in every worker's send_templated_mail cache"""
+    from helpdesk.lib import invalidate_email_template_cache
+    invalidate_email_template_cache(instance)
+
+models.signals.post_save.connect(invalidate_compiled_email_template, sender=EmailTemplate)
+models.signals.post_delete.connect(invalidate_compiled_email_template, sender=EmailTemplate)
+
+def invalidate_cached_preset_replies(sender, **kwargs):
+    """Drop the per-queue preset reply lists shown on the ticket page"""
+    from helpdesk.lib import invalidate_preset_replies
+    invalidate_preset_replies()
+
+models.signals.post_save.connect(invalidate_cached_preset_replies, sender=PreSetReply)
+models.signals.post_delete.connect(invalidate_cached_preset_replies, sender=PreSetReply)
+models.signals.m2m_changed.connect(invalidate_cached_preset_replies, sender=PreSetReply.queues.through)
+
 class EscalationExclusion(models.Model):
     """
     Enhanced escalation exclusions with recurring patterns
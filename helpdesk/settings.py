@@ -122,6 +122,18 @@ if HELPDESK_EMAIL_SUBJECT_TEMPLATE.find("ticket.ticket") < 0:
 # default fallback locale when queue locale not found
 HELPDESK_EMAIL_FALLBACK_LOCALE = getattr(settings, 'HELPDESK_EMAIL_FALLBACK_LOCALE', 'en')
 
+# number of compiled e-mail templates kept in memory by send_templated_mail;
+# set to 0 to compile on every send
+HELPDESK_EMAIL_TEMPLATE_CACHE_SIZE = getattr(settings, 'HELPDESK_EMAIL_TEMPLATE_CACHE_SIZE', 128)
+
+# e-mails queued by bulk ticket updates are sent from a background thread
+# after the transaction commits, this many messages per SMTP connection
+HELPDESK_BULK_NOTIFICATIONS_ASYNC = getattr(settings, 'HELPDESK_BULK_NOTIFICATIONS_ASYNC', True)
+HELPDESK_BULK_NOTIFICATION_BATCH_SIZE = getattr(settings, 'HELPDESK_BULK_NOTIFICATION_BATCH_SIZE', 100)
+
+# seconds each queue's list of pre-set replies stays cached on the ticket page
+HELPDESK_PRESET_REPLIES_CACHE_TIMEOUT = getattr(settings, 'HELPDESK_PRESET_REPLIES_CACHE_TIMEOUT', 60 * 60)
+
 
 ########################################
 # options for staff.create_ticket view #
@@ -11,36 +11,100 @@ templatetags/ticket_to_link.py - Used in ticket comments to allow wiki-style
                                  ticket would have a strikethrough).
 """
 
+import hashlib
 import re
 
 from django import template
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
 from helpdesk.models import Ticket
 
+TICKET_REFERENCE_RE = re.compile(r"(?:[^&]|\b|^)#(\d+)\b")
 
-def num_to_link(text):
-    if text == '':
-        return text
+# Rendered comments are cached under their text plus the status of every
+# ticket they mention, so a status change naturally selects a new entry.
+LINKED_TEXT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class TicketReferences(object):
+    """
+    Statuses of the tickets mentioned ('#1234') in a set of texts.
+
+    Views build one from every comment on the page so all references are
+    resolved with a single id__in query; the num_to_link filter then takes it
+    as its argument. Numbers it hasn't seen yet are loaded on demand.
+    """
+
+    def __init__(self, texts=()):
+        self.statuses = {}
+        self.load(texts)
+
+    @classmethod
+    def for_ticket(cls, ticket):
+        """References in a ticket's description and all of its follow-ups"""
+        texts = [ticket.description]
+        texts.extend(ticket.followups.values_list('comment', flat=True))
+        return cls(texts)
+
+    def load(self, texts):
+        numbers = set()
+        for text in texts:
+            if text:
+                numbers.update(int(n) for n in TICKET_REFERENCE_RE.findall(text))
+        numbers.difference_update(self.statuses)
+        if numbers:
+            found = dict(Ticket.objects.filter(id__in=numbers).values_list('id', 'status'))
+            for number in numbers:
+                self.statuses[number] = found.get(number)
 
-    matches = []
-    for match in re.finditer(r"(?:[^&]|\b|^)#(\d+)\b", text):
-        matches.append(match)
+    def link(self, text):
+        if text == '':
+            return text
 
-    for match in reversed(matches):
-        number = match.groups()[0]
-        url = reverse('helpdesk:view', args=[number])
-        try:
-            ticket = Ticket.objects.get(id=number)
-        except Ticket.DoesNotExist:
-            ticket = None
+        matches = list(TICKET_REFERENCE_RE.finditer(text))
+        if not matches:
+            return mark_safe(text)
 
-        if ticket:
-            style = ticket.get_status_display()
+        self.load([text])
+        fingerprint = ','.join(
+            '%s:%s' % (number, self.statuses[number])
+            for number in sorted({int(match.group(1)) for match in matches})
+        )
+        key = 'helpdesk_ticket_links:%s' % hashlib.md5(
+            ('%s|%s' % (fingerprint, text)).encode('utf-8')).hexdigest()
+        linked = cache.get(key)
+        if linked is None:
+            linked = self._link(text, matches)
+            cache.set(key, linked, LINKED_TEXT_CACHE_TIMEOUT)
+        return mark_safe(linked)
+
+    def _link(self, text, matches):
+        status_names = dict(Ticket.STATUS_CHOICES)
+        for match in reversed(matches):
+            number = match.groups()[0]
+            status = self.statuses.get(int(number))
+            if status is None:
+                continue
+
+            url = reverse('helpdesk:view', args=[number])
+            style = status_names.get(status, status)
             text = "%s <a href='%s' class='ticket_link_status ticket_link_status_%s'>#%s</a>%s" % (
-                text[:match.start() + 1], url, style, match.groups()[0], text[match.end():])
-    return mark_safe(text)
+                text[:match.start() + 1], url, style, number, text[match.end():])
+        return text
+
+
+def num_to_link(text, references=None):
+    """
+    Link '#1234' mentions in text to the ticket, styled by its status.
+
+    Pass the view's TicketReferences as the argument to share one lookup
+    across the whole page: {{ comment|num_to_link:ticket_references }}
+    """
+    if not isinstance(references, TicketReferences):
+        references = TicketReferences()
+    return references.link(text)
 
 
 register = template.Library()
@@ -0,0 +1,110 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from helpdesk import bulk
+from helpdesk.lib import invalidate_email_template_cache
+from helpdesk.models import EmailTemplate, FollowUp, Queue, Ticket, TicketCC
+
+
+class BulkUpdateTestCase(TestCase):
+
+    def setUp(self):
+        invalidate_email_template_cache()
+        for name in ('closed_submitter', 'closed_owner', 'closed_cc'):
+            EmailTemplate.objects.create(
+                template_name=name,
+                subject='(Closed)',
+                heading='Closed',
+                plain_text='{{ ticket.title }} closed',
+                html='<p>{{ ticket.title }} closed</p>',
+                locale='en',
+            )
+        EmailTemplate.objects.create(
+            template_name='closed_batch',
+            subject='and {{ other_count }} more (Closed)',
+            heading='Closed',
+            plain_text='{% for ticket in tickets %}{{ ticket.title }} closed\n{% endfor %}',
+            html='<p>{{ tickets|length }} closed</p>',
+            locale='en',
+        )
+        self.queue = Queue.objects.create(
+            title='Queue', slug='bulk', escalate_days=1,
+            updated_ticket_cc='queue@example.com')
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email='staff@example.com', password='pass', employee_id='B1')
+        self.owner = User.objects.create_user(
+            email='owner@example.com', password='pass', employee_id='B2')
+        now = timezone.now()
+        self.tickets = [
+            Ticket.objects.create(
+                queue=self.queue, title='Ticket %s' % i, created=now, modified=now,
+                submitter_email='submitter@example.com', assigned_to=self.owner)
+            for i in range(3)
+        ]
+        TicketCC.objects.create(ticket=self.tickets[0], email='SUBMITTER@example.com')
+        TicketCC.objects.create(ticket=self.tickets[0], email='cc@example.com')
+
+    def tearDown(self):
+        invalidate_email_template_cache()
+
+    def selected(self):
+        return Ticket.objects.filter(id__in=[t.id for t in self.tickets])
+
+    def test_assign_only_touches_changed_tickets(self):
+        Ticket.objects.filter(id=self.tickets[0].id).update(assigned_to=self.user)
+
+        ids = bulk.bulk_assign(self.selected(), self.user, self.user)
+
+        self.assertEqual(sorted(ids), sorted(t.id for t in self.tickets[1:]))
+        self.assertEqual(self.selected().filter(assigned_to=self.user).count(), 3)
+        self.assertEqual(FollowUp.objects.filter(public=True).count(), 2)
+
+    def test_close_uses_constant_queries(self):
+        with self.assertNumQueries(5):
+            bulk.bulk_close(self.selected(), self.user)
+        self.assertEqual(self.selected().filter(status=Ticket.CLOSED_STATUS).count(), 3)
+        followup = FollowUp.objects.first()
+        self.assertEqual(followup.new_status, Ticket.CLOSED_STATUS)
+        self.assertFalse(followup.public)
+        self.assertEqual(len(mail.outbox), 0)
+
+    @mock.patch('helpdesk.settings.HELPDESK_BULK_NOTIFICATIONS_ASYNC', False)
+    def test_close_public_sends_each_recipient_one_message(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.bulk_close(self.selected(), self.user, public=True)
+
+        recipients = sorted(tuple(m.to) for m in mail.outbox)
+        self.assertEqual(recipients, [
+            ('cc@example.com',), ('owner@example.com',),
+            ('queue@example.com',), ('submitter@example.com',),
+        ])
+        digest = next(m for m in mail.outbox if m.to == ['submitter@example.com'])
+        self.assertIn('and 2 more (Closed)', digest.subject)
+        for ticket in self.tickets:
+            self.assertIn('%s closed' % ticket.title, digest.body)
+        single = next(m for m in mail.outbox if m.to == ['cc@example.com'])
+        self.assertIn('Ticket 0 closed', single.body)
+
+    @mock.patch('helpdesk.settings.HELPDESK_BULK_NOTIFICATIONS_ASYNC', False)
+    def test_close_without_batch_template_sends_per_ticket(self):
+        EmailTemplate.objects.filter(template_name='closed_batch').delete()
+        with self.assertLogs('helpdesk', level='WARNING'):
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk.bulk_close(self.selected(), self.user, public=True)
+
+        recipients = [tuple(m.to) for m in mail.outbox]
+        self.assertEqual(len(recipients), 10)
+        self.assertEqual(recipients.count(('submitter@example.com',)), 3)
+        self.assertEqual(recipients.count(('cc@example.com',)), 1)
+
+    def test_bulk_update_expires_queue_widgets(self):
+        from home.widgets import tag_version
+
+        before = tag_version(['queue:%s' % self.queue.pk])
+        bulk.bulk_assign(self.selected(), self.user, self.user)
+        self.assertNotEqual(tag_version(['queue:%s' % self.queue.pk]), before)
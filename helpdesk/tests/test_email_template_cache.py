@@ -0,0 +1,74 @@
+from django.core import mail
+from django.test import TestCase
+
+from helpdesk.lib import (get_compiled_email_template,
+                          invalidate_email_template_cache,
+                          send_templated_mail)
+from helpdesk.models import EmailTemplate
+
+
+class EmailTemplateCacheTestCase(TestCase):
+
+    def setUp(self):
+        invalidate_email_template_cache()
+        self.template = EmailTemplate.objects.create(
+            template_name='cache_test',
+            subject='(Cached)',
+            heading='Heading',
+            plain_text='Hello {{ ticket.title }}',
+            html='<p>Hello {{ ticket.title }}</p>',
+            locale='en',
+        )
+        self.context = {
+            'queue': {'locale': 'en', 'title': 'Queue'},
+            'ticket': {'ticket': '[q-1]', 'title': 'Printer on fire'},
+        }
+
+    def tearDown(self):
+        invalidate_email_template_cache()
+
+    def test_repeat_sends_do_not_query(self):
+        send_templated_mail('cache_test', dict(self.context), 'a@example.com')
+        with self.assertNumQueries(0):
+            send_templated_mail('cache_test', dict(self.context), 'b@example.com')
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn('Printer on fire', mail.outbox[1].body)
+        self.assertIn('(Cached)', mail.outbox[1].subject)
+
+    def test_save_invalidates_compiled_template(self):
+        get_compiled_email_template('cache_test', 'en')
+        self.template.plain_text = 'Updated {{ ticket.title }}'
+        self.template.save()
+
+        send_templated_mail('cache_test', dict(self.context), 'a@example.com')
+        self.assertIn('Updated Printer on fire', mail.outbox[0].body)
+
+    def test_missing_template_is_cached_until_created(self):
+        self.assertIsNone(get_compiled_email_template('late_template', 'en'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_compiled_email_template('late_template', 'en'))
+
+        EmailTemplate.objects.create(
+            template_name='late_template',
+            subject='Late',
+            heading='Late',
+            plain_text='Late',
+            html='Late',
+        )
+        self.assertIsNotNone(get_compiled_email_template('late_template', 'en'))
+
+    def test_save_in_another_process_expires_local_copy(self):
+        from django.core.cache import cache
+
+        from helpdesk.lib import EMAIL_TEMPLATE_VERSION_KEY
+
+        get_compiled_email_template('cache_test', 'en')
+        # Another worker saved the template: the row changed and the shared
+        # version moved, but this process's LRU was never touched
+        EmailTemplate.objects.filter(pk=self.template.pk).update(
+            plain_text='Elsewhere {{ ticket.title }}'
+        )
+        cache.incr(EMAIL_TEMPLATE_VERSION_KEY)
+
+        send_templated_mail('cache_test', dict(self.context), 'a@example.com')
+        self.assertIn('Elsewhere Printer on fire', mail.outbox[0].body)
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from helpdesk.models import Queue, Ticket
+from helpdesk.templatetags.ticket_to_link import TicketReferences, num_to_link
+
+
+class TicketReferencesTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        queue = Queue.objects.create(title='Queue', slug='links', escalate_days=1)
+        now = timezone.now()
+        self.tickets = [
+            Ticket.objects.create(queue=queue, title='Ticket %s' % i,
+                                  created=now, modified=now,
+                                  status=Ticket.OPEN_STATUS)
+            for i in range(3)
+        ]
+
+    def test_resolves_all_comments_with_one_query(self):
+        comments = ['see #%s and #%s' % (t.id, t.id + 1000) for t in self.tickets]
+        with self.assertNumQueries(1):
+            references = TicketReferences(comments)
+            rendered = [num_to_link(comment, references) for comment in comments]
+
+        for ticket, html in zip(self.tickets, rendered):
+            self.assertIn("/helpdesk/tickets/%s/" % ticket.id, html)
+            self.assertIn('ticket_link_status_Open', html)
+            # unknown tickets are left as plain text
+            self.assertIn(' #%s' % (ticket.id + 1000), html)
+
+    def test_status_change_invalidates_cached_links(self):
+        ticket = self.tickets[0]
+        text = 'duplicate of #%s' % ticket.id
+        self.assertIn('ticket_link_status_Open', num_to_link(text))
+
+        Ticket.objects.filter(id=ticket.id).update(status=Ticket.CLOSED_STATUS)
+        self.assertIn('ticket_link_status_Closed', num_to_link(text))
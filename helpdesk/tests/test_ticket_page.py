@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from helpdesk.lib import get_preset_replies
+from helpdesk.models import PreSetReply, Queue
+
+
+class OwnerAutocompleteTestCase(TestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user(
+            email='staff@example.com', password='pass', employee_id='T1',
+            first_name='Sam', last_name='Staff', is_staff=True, roles=['employee'])
+        User.objects.create_user(
+            email='ada@example.com', password='pass', employee_id='T2',
+            first_name='Ada', last_name='Lovelace')
+        User.objects.create_user(
+            email='gone@example.com', password='pass', employee_id='T3',
+            first_name='Adam', last_name='Gone', is_active=False)
+        self.client.force_login(self.staff)
+        self.url = reverse('helpdesk:owner_autocomplete')
+
+    def search(self, term):
+        response = self.client.get(self.url, {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return [row['text'] for row in response.json()['results']]
+
+    def test_prefix_search_on_name_and_email(self):
+        self.assertEqual(self.search('ad'), ['Ada Lovelace'])
+        self.assertEqual(self.search('LOVE'), ['Ada Lovelace'])
+        self.assertEqual(self.search('ada@'), ['Ada Lovelace'])
+        self.assertEqual(self.search('ada lov'), ['Ada Lovelace'])
+        self.assertEqual(self.search('velace'), [])
+
+
+class PresetReplyCacheTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.queue = Queue.objects.create(title='Queue', slug='presets', escalate_days=1)
+        other = Queue.objects.create(title='Other', slug='other', escalate_days=1)
+        PreSetReply.objects.create(name='Everywhere', body='x')
+        PreSetReply.objects.create(name='Elsewhere', body='x').queues.add(other)
+
+    def test_cached_until_a_reply_changes(self):
+        self.assertEqual([r['name'] for r in get_preset_replies(self.queue)], ['Everywhere'])
+        with self.assertNumQueries(0):
+            get_preset_replies(self.queue)
+
+        PreSetReply.objects.get(name='Elsewhere').queues.add(self.queue)
+        self.assertEqual(
+            sorted(r['name'] for r in get_preset_replies(self.queue)),
+            ['Elsewhere', 'Everywhere'])
@@ -105,6 +105,10 @@ urlpatterns = [
         staff.attachment_del,
         name='attachment_del'),
 
+    re_path(r'^owners/autocomplete/$',
+        staff.owner_autocomplete,
+        name='owner_autocomplete'),
+
     re_path(r'^raw/(?P<type>\w+)/$',
         staff.raw_details,
         name='raw'),
@@ -24,6 +24,7 @@ from helpdesk.decorators import protect_view
 from helpdesk.forms import PublicTicketForm
 from helpdesk.lib import text_is_spam
 from helpdesk.models import Ticket, Queue, UserSettings, KBCategory
+from helpdesk.templatetags.ticket_to_link import TicketReferences
 
 
 @protect_view
@@ -143,6 +144,7 @@ def view_ticket(request):
 
             return render(request, 'helpdesk/public_view_ticket.html', {
                 'ticket': ticket,
+                'ticket_references': TicketReferences.for_ticket(ticket),
                 'helpdesk_settings': helpdesk_settings,
                 'next': redirect_url,
             })
@@ -16,7 +16,7 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.db.models import Q
-from django.http import HttpResponseRedirect, Http404, HttpResponse
+from django.http import HttpResponseRedirect, Http404, HttpResponse, JsonResponse
 from django.shortcuts import render, get_object_or_404
 from django.utils.dates import MONTHS_3
 from django.utils.translation import gettext as _
@@ -30,15 +30,17 @@ from helpdesk.forms import (
     TicketForm, UserSettingsForm, EmailIgnoreForm, EditTicketForm, TicketCCForm,
     TicketCCEmailForm, TicketCCUserForm, EditFollowUpForm, TicketDependencyForm
 )
+from helpdesk import bulk
 from helpdesk.decorators import staff_member_required, superuser_required
 from helpdesk.lib import (
     send_templated_mail, apply_query, safe_template_context,
-    process_attachments, queue_template_context,
+    process_attachments, queue_template_context, get_preset_replies,
 )
 from helpdesk.models import (
     Ticket, Queue, FollowUp, TicketChange, PreSetReply, Attachment, SavedSearch,
     IgnoreEmail, TicketCC, TicketDependency,
 )
+from helpdesk.templatetags.ticket_to_link import TicketReferences
 from helpdesk import settings as helpdesk_settings
 
 
@@ -280,11 +282,6 @@ def view_ticket(request, ticket_id):
 
         return update_ticket(request, ticket_id)
 
-    if helpdesk_settings.HELPDESK_STAFF_ONLY_TICKET_OWNERS:
-        users = User.objects.filter(is_active=True, is_staff=True).order_by(User.USERNAME_FIELD)
-    else:
-        users = User.objects.filter(is_active=True).order_by(User.USERNAME_FIELD)
-
     # TODO: shouldn't this template get a form to begin with?
     form = TicketForm(initial={'due_date': ticket.due_date})
 
@@ -293,16 +290,48 @@ def view_ticket(request, ticket_id):
 
     return render(request, 'helpdesk/ticket.html', {
         'ticket': ticket,
+        'ticket_references': TicketReferences.for_ticket(ticket),
         'form': form,
-        'active_users': users,
         'priorities': Ticket.PRIORITY_CHOICES,
-        'preset_replies': PreSetReply.objects.filter(
-            Q(queues=ticket.queue) | Q(queues__isnull=True)),
+        'preset_replies': get_preset_replies(ticket.queue),
         'ticketcc_string': ticketcc_string,
         'SHOW_SUBSCRIBE': show_subscribe,
     })
 
 
+OWNER_AUTOCOMPLETE_LIMIT = 20
+
+
+@staff_member_required
+def owner_autocomplete(request):
+    """
+    Return up to OWNER_AUTOCOMPLETE_LIMIT possible ticket owners whose first
+    name, last name or e-mail starts with ?q= (or 'first last'), for the
+    owner picker on the ticket page.
+    """
+    users = User.objects.filter(is_active=True)
+    if helpdesk_settings.HELPDESK_STAFF_ONLY_TICKET_OWNERS:
+        users = users.filter(is_staff=True)
+
+    term = request.GET.get('q', '').strip()
+    if term:
+        match = (Q(first_name__istartswith=term) |
+                 Q(last_name__istartswith=term) |
+                 Q(email__istartswith=term))
+        if ' ' in term:
+            first, last = term.split(None, 1)
+            match |= Q(first_name__istartswith=first, last_name__istartswith=last)
+        users = users.filter(match)
+
+    users = users.only('id', 'first_name', 'last_name', 'email')
+    return JsonResponse({
+        'results': [
+            {'id': u.pk, 'text': str(u)}
+            for u in users.order_by(User.USERNAME_FIELD)[:OWNER_AUTOCOMPLETE_LIMIT]
+        ]
+    })
+
+
 def return_ticketccstring_and_show_subscribe(user, ticket):
     """used in view_ticket() and followup_edit()"""
     # create the ticketcc_string and check whether current user is already
@@ -314,15 +343,16 @@ def return_ticketccstring_and_show_subscribe(user, ticket):
     strings_to_check.append(useremail)
 
     ticketcc_string = ''
-    all_ticketcc = ticket.ticketcc_set.all()
+    all_ticketcc = list(ticket.cc_list.select_related('user'))
     counter_all_ticketcc = len(all_ticketcc) - 1
     show_subscribe = True
     for i, ticketcc in enumerate(all_ticketcc):
-        ticketcc_this_entry = str(ticketcc.display)
+        ticketcc_this_entry = str(ticketcc.recipient_name)
         ticketcc_string += ticketcc_this_entry
         if i < counter_all_ticketcc:
             ticketcc_string += ', '
-        if strings_to_check.__contains__(ticketcc_this_entry.upper()):
+        if strings_to_check.__contains__(ticketcc_this_entry.upper()) or \
+                strings_to_check.__contains__((ticketcc.recipient_email or '').upper()):
             show_subscribe = False
 
     # check whether current user is a submitter or assigned to ticket
@@ -658,103 +688,20 @@ def mass_update(request):
         user = request.user
         action = 'assign'
 
-    for t in Ticket.objects.filter(id__in=tickets):
-        if not _has_access_to_queue(request.user, t.queue):
-            continue
-
-        if action == 'assign' and t.assigned_to != user:
-            t.assigned_to = user
-            t.save()
-            f = FollowUp(ticket=t,
-                         date=timezone.now(),
-                         title=_('Assigned to %(username)s in bulk update' % {
-                             'username': user.get_username()
-                         }),
-                         public=True,
-                         user=request.user)
-            f.save()
-        elif action == 'unassign' and t.assigned_to is not None:
-            t.assigned_to = None
-            t.save()
-            f = FollowUp(ticket=t,
-                         date=timezone.now(),
-                         title=_('Unassigned in bulk update'),
-                         public=True,
-                         user=request.user)
-            f.save()
-        elif action == 'close' and t.status != Ticket.CLOSED_STATUS:
-            t.status = Ticket.CLOSED_STATUS
-            t.save()
-            f = FollowUp(ticket=t,
-                         date=timezone.now(),
-                         title=_('Closed in bulk update'),
-                         public=False,
-                         user=request.user,
-                         new_status=Ticket.CLOSED_STATUS)
-            f.save()
-        elif action == 'close_public' and t.status != Ticket.CLOSED_STATUS:
-            t.status = Ticket.CLOSED_STATUS
-            t.save()
-            f = FollowUp(ticket=t,
-                         date=timezone.now(),
-                         title=_('Closed in bulk update'),
-                         public=True,
-                         user=request.user,
-                         new_status=Ticket.CLOSED_STATUS)
-            f.save()
-            # Send email to Submitter, Owner, Queue CC
-            context = safe_template_context(t)
-            context.update(resolution=t.resolution,
-                           queue=queue_template_context(t.queue))
-
-            messages_sent_to = []
-
-            if t.submitter_email:
-                send_templated_mail(
-                    'closed_submitter',
-                    context,
-                    recipients=t.submitter_email,
-                    sender=t.queue.from_address,
-                    fail_silently=True,
-                )
-                messages_sent_to.append(t.submitter_email)
-
-            for cc in t.ticketcc_set.all():
-                if cc.email_address not in messages_sent_to:
-                    send_templated_mail(
-                        'closed_submitter',
-                        context,
-                        recipients=cc.email_address,
-                        sender=t.queue.from_address,
-                        fail_silently=True,
-                    )
-                    messages_sent_to.append(cc.email_address)
-
-            if t.assigned_to and \
-                    request.user != t.assigned_to and \
-                    t.assigned_to.email and \
-                    t.assigned_to.email not in messages_sent_to:
-                send_templated_mail(
-                    'closed_owner',
-                    context,
-                    recipients=t.assigned_to.email,
-                    sender=t.queue.from_address,
-                    fail_silently=True,
-                )
-                messages_sent_to.append(t.assigned_to.email)
-
-            if t.queue.updated_ticket_cc and \
-                    t.queue.updated_ticket_cc not in messages_sent_to:
-                send_templated_mail(
-                    'closed_cc',
-                    context,
-                    recipients=t.queue.updated_ticket_cc,
-                    sender=t.queue.from_address,
-                    fail_silently=True,
-                )
-
-        elif action == 'delete':
-            t.delete()
+    # Only touch tickets in queues the user may access
+    selected = Ticket.objects.filter(
+        id__in=tickets, queue__in=_get_user_queues(request.user))
+
+    if action == 'assign':
+        bulk.bulk_assign(selected, user, request.user)
+    elif action == 'unassign':
+        bulk.bulk_unassign(selected, request.user)
+    elif action == 'close':
+        bulk.bulk_close(selected, request.user)
+    elif action == 'close_public':
+        bulk.bulk_close(selected, request.user, public=True)
+    elif action == 'delete':
+        bulk.bulk_delete(selected)
 
     return HttpResponseRedirect(reverse('helpdesk:list'))
 
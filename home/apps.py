@@ -25,3 +25,6 @@ class HomeConfig(AppConfig):
             from . import models  # This imports the signal receivers
         except ImportError:
             pass
+
+        from .signals import connect_widget_invalidation
+        connect_widget_invalidation()
@@ -0,0 +1,198 @@
+# home/caching.py
+"""
+Two-tier cache with tag invalidation and a stampede guard.
+
+``tiered_cache.get_or_compute(key, compute, tags=...)`` looks in a bounded,
+in-process LRU (L1) first and only then in the configured Django cache (L2).
+L2 keys embed the current version of every tag (the same version counters the
+dashboard widgets use), so ``invalidate_tags("project:12")`` expires every
+entry that depends on that tag on every worker at once. L1 entries are purged
+by tag in the invalidating process and otherwise live for at most
+``TIERED_CACHE_L1_TTL`` seconds, which bounds how stale another worker's L1
+can be.
+
+L2 entries carry a soft expiry ahead of the backend TTL. When an entry goes
+stale, the first worker to take its lock (``cache.add``) recomputes it while
+the others keep serving the stale value; on a cold miss the others wait
+briefly for the winner instead of all hitting the database.
+
+Tags follow ``<kind>:<id>`` (``project:12``, ``user:3``, ``queue:5``) for
+single records and plain names (``projects``) for whole tables; the handlers
+in ``home.signals`` fire both. Cached values are shared between requests of
+the same process, so callers must treat them as read-only and should cache
+plain data (lists, dicts, model instances) rather than lazy querysets.
+
+Settings (all optional): ``TIERED_CACHE_L1_SIZE`` (default 1000 entries),
+``TIERED_CACHE_L1_TTL`` (default 5 seconds), ``TIERED_CACHE_LOCK_TIMEOUT``
+(default 30 seconds).
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .widgets import invalidate_dashboard_widgets, tag_version
+
+LOCK_KEY = "tiered_lock:{key}"
+STALE_GRACE = 60  # seconds a stale L2 entry may still be served while recomputing
+WAIT_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+def make_key(name, *parts, **params):
+    """``name:part:...`` plus a digest of ``params`` (if any)"""
+    key = ":".join(str(part) for part in (name, *parts))
+    if params:
+        digest = hashlib.md5(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key = f"{key}:{digest}"
+    return key
+
+
+class LocalCache:
+    """Thread-safe bounded LRU with per-entry expiry and tag purging."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires, _tags = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return _MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, tags=()):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + ttl, frozenset(tags))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def discard_tags(self, tags):
+        tags = set(tags)
+        with self.lock:
+            for key in [key for key, (_v, _e, entry_tags) in self.entries.items()
+                        if entry_tags & tags]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TieredCache:
+    """L1 ``LocalCache`` in front of the default Django cache."""
+
+    def __init__(self, max_entries=None, l1_ttl=None, lock_timeout=None):
+        self.local = LocalCache(
+            max_entries or getattr(settings, "TIERED_CACHE_L1_SIZE", 1000)
+        )
+        self.l1_ttl = l1_ttl if l1_ttl is not None else getattr(
+            settings, "TIERED_CACHE_L1_TTL", 5
+        )
+        self.lock_timeout = lock_timeout or getattr(
+            settings, "TIERED_CACHE_LOCK_TIMEOUT", 30
+        )
+        # Approximate per-process counters for the system status page
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    def _l2_key(self, key, tags):
+        return f"tiered:{key}:{tag_version(tags)}" if tags else f"tiered:{key}"
+
+    def get_or_compute(self, key, compute, ttl=300, tags=()):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss"""
+        tags = tuple(tags)
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self.stats["l1_hits"] += 1
+            return value
+
+        l2_key = self._l2_key(key, tags)
+        envelope = cache.get(l2_key)
+        if envelope is not None and envelope["expires"] > time.time():
+            self.stats["l2_hits"] += 1
+            value = envelope["value"]
+        elif envelope is not None:
+            self.stats["misses"] += 1
+            # Stale: one worker refreshes, everyone else serves the old value
+            value = self._refresh(l2_key, compute, ttl, fallback=envelope["value"])
+        else:
+            self.stats["misses"] += 1
+            value = self._refresh(l2_key, compute, ttl)
+
+        self.local.set(key, value, min(self.l1_ttl, ttl), tags)
+        return value
+
+    def _store(self, l2_key, value, ttl):
+        cache.set(l2_key, {"value": value, "expires": time.time() + ttl}, ttl + STALE_GRACE)
+
+    def _refresh(self, l2_key, compute, ttl, fallback=_MISSING):
+        lock_key = LOCK_KEY.format(key=l2_key)
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, self.lock_timeout):
+            try:
+                value = compute()
+                self._store(l2_key, value, ttl)
+                return value
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        if fallback is not _MISSING:
+            return fallback
+
+        # Cold miss being computed elsewhere: wait for it, then give up and compute
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            envelope = cache.get(l2_key)
+            if envelope is not None:
+                return envelope["value"]
+            if cache.get(lock_key) is None:
+                break
+        value = compute()
+        self._store(l2_key, value, ttl)
+        return value
+
+    def delete(self, key, tags=()):
+        self.local.delete(key)
+        cache.delete(self._l2_key(key, tuple(tags)))
+
+    def clear_local(self):
+        self.local.clear()
+
+
+tiered_cache = TieredCache()
+
+
+def cached(key, compute, ttl=300, tags=()):
+    """Shortcut for ``tiered_cache.get_or_compute``"""
+    return tiered_cache.get_or_compute(key, compute, ttl=ttl, tags=tags)
+
+
+def invalidate_tags(*tags):
+    """Expire every L1 and L2 entry (and dashboard widget) tagged with ``tags``"""
+    invalidate_dashboard_widgets(*tags)
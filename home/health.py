@@ -0,0 +1,215 @@
+# home/health.py
+"""
+Liveness, readiness and deep-status checks.
+
+Liveness does no I/O: a process that can run the view is alive. Readiness
+pings each database with ``SELECT 1`` and the cache with one ``get``; the
+checks run on a single background thread and are waited for at most
+``HEALTH_CHECK_TIMEOUT`` seconds. The result is reused for
+``HEALTH_READINESS_INTERVAL`` seconds, so a load balancer probing several
+times a second costs one ping per interval per process. If the previous
+check is still running (a saturated database), the probe answers "not ready"
+at once instead of queueing more work behind it.
+
+The deep status (table sizes, unapplied migrations, cache backend hit rate)
+is expensive, so it is kept in ``home.caching`` for ``HEALTH_STATUS_TTL``
+seconds. Only one worker rebuilds it when it expires, and the
+``refresh_system_status`` command can rebuild it from cron instead. The
+``home.caching`` hit counters are per process, so they are left out of the
+shared snapshot and ``system_status()`` adds the serving worker's own
+figures under ``worker_cache``.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from .caching import cached, tiered_cache
+
+PING_KEY = "health:ping"
+DEEP_STATUS_KEY = "health:deep_status"
+TABLE_LIMIT = 15
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+_lock = threading.Lock()
+_state = {"checked": 0.0, "result": None, "future": None}
+
+
+def liveness():
+    return {"status": "alive"}
+
+
+def _timed(check):
+    start = time.perf_counter()
+    try:
+        check()
+        ok, message = True, "ok"
+    except Exception as exc:  # Any failure means "not ready"
+        ok, message = False, str(exc)
+    return {"status": ok, "message": message,
+            "ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+def _ping_database(alias):
+    def check():
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        finally:
+            connection.close_if_unusable_or_obsolete()
+    return check
+
+
+def _ping_cache():
+    cache.get(PING_KEY)
+
+
+def run_checks():
+    """Ping every database and the cache; ``{name: {status, message, ms}}``"""
+    checks = {f"database:{alias}": _timed(_ping_database(alias)) for alias in connections}
+    checks["cache"] = _timed(_ping_cache)
+    return checks
+
+
+def _result(checks):
+    return {
+        "status": "ready" if all(check["status"] for check in checks.values()) else "not_ready",
+        "checks": checks,
+        "checked_at": timezone.now().isoformat(),
+    }
+
+
+def readiness():
+    """The latest readiness result, re-checking at most once per interval"""
+    interval = getattr(settings, "HEALTH_READINESS_INTERVAL", 1.0)
+    timeout = getattr(settings, "HEALTH_CHECK_TIMEOUT", 0.5)
+    with _lock:
+        result = _state["result"]
+        if result is not None and time.monotonic() - _state["checked"] < interval:
+            return result
+        future = _state["future"]
+        if future is None or future.done():
+            future = _state["future"] = _executor.submit(run_checks)
+        elif result is not None:
+            # The previous check is still stuck; don't stack another behind it
+            return _result({"readiness": {"status": False, "message": "check still running"}})
+
+    try:
+        result = _result(future.result(timeout=timeout))
+    except TimeoutError:
+        return _result({"readiness": {"status": False, "message": f"timed out after {timeout}s"}})
+    with _lock:
+        _state["result"], _state["checked"] = result, time.monotonic()
+    return result
+
+
+def reset_readiness():
+    with _lock:
+        _state.update(checked=0.0, result=None)
+
+
+def _table_sizes(connection):
+    """``[{table, rows, bytes}]`` for the largest tables, from catalog estimates"""
+    if connection.vendor != "postgresql":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid)
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind = 'r' AND n.nspname = current_schema()
+            ORDER BY pg_total_relation_size(c.oid) DESC
+            LIMIT %s
+            """,
+            [TABLE_LIMIT],
+        )
+        return [{"table": name, "rows": max(rows, 0), "bytes": size}
+                for name, rows, size in cursor.fetchall()]
+
+
+def _database_size(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT pg_database_size(current_database())")
+            return cursor.fetchone()[0]
+        if connection.vendor == "sqlite":
+            cursor.execute("PRAGMA page_count")
+            pages = cursor.fetchone()[0]
+            cursor.execute("PRAGMA page_size")
+            return pages * cursor.fetchone()[0]
+    return None
+
+
+def _unapplied_migrations(connection):
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f"{migration.app_label}.{migration.name}" for migration, _backwards in plan]
+
+
+def worker_cache_stats():
+    """This process's ``home.caching`` counters; other workers keep their own"""
+    stats = dict(tiered_cache.stats)
+    lookups = sum(stats.values())
+    stats["hit_rate"] = (
+        round((stats["l1_hits"] + stats["l2_hits"]) * 100 / lookups, 1)
+        if lookups else None
+    )
+    stats["process"] = os.getpid()
+    return stats
+
+
+def _cache_stats():
+    try:
+        info = cache._cache.get_client().info("stats")
+    except Exception:  # Not Redis, or Redis unavailable
+        return {}
+    hits, misses = info.get("keyspace_hits", 0), info.get("keyspace_misses", 0)
+    return {
+        "backend": {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits * 100 / (hits + misses), 1) if hits + misses else None,
+        }
+    }
+
+
+def build_deep_status():
+    connection = connections["default"]
+    pending = _unapplied_migrations(connection)
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "database": {
+            "vendor": connection.vendor,
+            "size_bytes": _database_size(connection),
+            "tables": _table_sizes(connection),
+        },
+        "migrations": {"unapplied": len(pending), "pending": pending[:20]},
+        "cache": _cache_stats(),
+    }
+
+
+def deep_status():
+    """The cached deep-status snapshot, rebuilt by one worker when it expires"""
+    return cached(
+        DEEP_STATUS_KEY, build_deep_status,
+        ttl=getattr(settings, "HEALTH_STATUS_TTL", 300),
+    )
+
+
+def system_status():
+    """The shared deep-status snapshot plus the serving worker's cache counters"""
+    return {**deep_status(), "worker_cache": worker_cache_stats()}
+
+
+def refresh_deep_status():
+    tiered_cache.delete(DEEP_STATUS_KEY)
+    return deep_status()
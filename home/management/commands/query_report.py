@@ -0,0 +1,56 @@
+"""
+query_report.py - Print per-view query counts and timings collected by
+home.profiling.QueryProfilingMiddleware across all worker processes.
+"""
+
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from home.profiling import SNAPSHOT_INDEX_KEY, collected_snapshots, summarize
+
+SORT_KEYS = ('avg_queries', 'max_queries', 'avg_duplicates', 'avg_ms', 'p95_ms', 'requests')
+
+
+class Command(BaseCommand):
+    help = 'Show per-view SQL counts, duplicate queries and response times.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', choices=SORT_KEYS, default='avg_queries')
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument('--json', action='store_true', help='Print the rows as JSON.')
+        parser.add_argument('--clear', action='store_true',
+                            help='Forget the published snapshots after reporting.')
+
+    def handle(self, *args, **options):
+        rows = [summarize(view, entry) for view, entry in collected_snapshots().items()]
+        rows.sort(key=lambda row: row[options['sort']], reverse=True)
+        rows = rows[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2, default=str))
+        elif not rows:
+            self.stdout.write('No profiled requests yet.')
+        else:
+            self.stdout.write(
+                f"{'view':<45} {'reqs':>6} {'avg q':>7} {'max q':>6} {'p95 q':>6} "
+                f"{'dup':>6} {'db ms':>8} {'avg ms':>8} {'p95 ms':>7} {'over':>5}"
+            )
+            for row in rows:
+                self.stdout.write(
+                    f"{row['view'][:45]:<45} {row['requests']:>6} {row['avg_queries']:>7.1f} "
+                    f"{row['max_queries']:>6} {row['p95_queries']:>6} "
+                    f"{row['avg_duplicates']:>6.1f} {row['avg_db_ms']:>8.1f} "
+                    f"{row['avg_ms']:>8.1f} {row['p95_ms']:>7} {row['over_budget']:>5}"
+                )
+            for row in rows:
+                if row['top_duplicate_times'] > 1:
+                    self.stdout.write(
+                        f"\n{row['view']}: x{row['top_duplicate_times']} "
+                        f"{row['top_duplicate'][:300]}"
+                    )
+
+        if options['clear']:
+            cache.delete_many(cache.get(SNAPSHOT_INDEX_KEY) or [])
+            cache.delete(SNAPSHOT_INDEX_KEY)
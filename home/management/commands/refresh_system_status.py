@@ -0,0 +1,20 @@
+"""
+refresh_system_status.py - Rebuild the cached deep-status snapshot served by
+the system status endpoints. Run every few minutes from cron so no request
+ever has to build it.
+"""
+
+from django.core.management.base import BaseCommand
+
+from home.health import refresh_deep_status
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cached system status snapshot (table sizes, migrations, cache backend hit rate).'
+
+    def handle(self, *args, **options):
+        status = refresh_deep_status()
+        self.stdout.write(
+            f"System status refreshed: {status['migrations']['unapplied']} unapplied "
+            f"migrations, database size {status['database']['size_bytes']} bytes."
+        )
@@ -174,6 +174,20 @@ class DashboardMetric(UUIDModel, TimeStampedModel):
         return self.format_string.format(value=self.value)
 
 
+class NumberSequence(models.Model):
+    """Last number handed out for a named scope (see ``home.sequences``)."""
+
+    scope = models.CharField(max_length=100, unique=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['scope']
+
+    def __str__(self):
+        return f"{self.scope}: {self.last_value}"
+
+
 # Signal to create user preferences automatically
 from django.db.models.signals import post_save
 from django.dispatch import receiver
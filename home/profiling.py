@@ -0,0 +1,322 @@
+# home/profiling.py
+"""
+Per-view query and timing instrumentation.
+
+``QueryProfile`` hooks every database connection with
+``connection.execute_wrapper`` and records the number of queries, total
+database time and how often each SQL statement repeated (N+1 loops issue the
+same parameterized SQL over and over, so the statement text is its own
+fingerprint). ``QueryProfilingMiddleware`` wraps each request in a profile and
+folds the result into an in-process ``ViewStats`` registry keyed by resolved
+view name: fixed-bucket histograms for response time and query count plus
+running totals. The registry rolls over every ``QUERY_PROFILING_WINDOW``
+seconds and publishes its last window to the cache, where the
+``query_report`` management command merges the snapshots of every worker
+process. Windows roll over on the next request, or from a background thread
+once the window has ended, so a worker that goes idle still publishes its
+last window.
+
+Settings (all optional):
+
+``QUERY_PROFILING_ENABLED``      default ``True``
+``QUERY_PROFILING_SAMPLE_RATE``  fraction of requests profiled, default ``1.0``
+``QUERY_PROFILING_WINDOW``       rollover interval in seconds, default ``300``
+``QUERY_BUDGETS``                ``{view_name: max queries}``; overruns are logged
+``QUERY_BUDGET_DEFAULT``         budget for views not listed, default ``None``
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger("wbee.profiling")
+
+# Upper bounds of the histogram buckets; the last bucket is open ended
+TIME_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+SNAPSHOT_KEY = "query_profile:{process}"
+SNAPSHOT_INDEX_KEY = "query_profile:processes"
+
+
+class QueryProfile:
+    """Count and time the SQL run on every connection inside the block.
+
+    ``profile.duplicates()`` returns ``[(sql, times)]`` for statements that
+    ran more than once, most repeated first.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    def duplicates(self):
+        return [(sql, times) for sql, times in self.statements.most_common() if times > 1]
+
+    @property
+    def duplicate_count(self):
+        """Queries that repeated an earlier statement"""
+        return sum(times - 1 for times in self.statements.values() if times > 1)
+
+
+def _histogram(bounds):
+    return [0] * (len(bounds) + 1)
+
+
+def _percentile(histogram, bounds, fraction):
+    """Upper bound of the bucket holding the ``fraction`` percentile"""
+    total = sum(histogram)
+    if not total:
+        return 0
+    threshold, running = total * fraction, 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= threshold:
+            return bounds[index] if index < len(bounds) else float("inf")
+    return float("inf")
+
+
+def new_view_entry():
+    return {
+        "requests": 0,
+        "queries": 0,
+        "max_queries": 0,
+        "duplicates": 0,
+        "db_ms": 0.0,
+        "total_ms": 0.0,
+        "render_ms": 0.0,
+        "over_budget": 0,
+        "time_histogram": _histogram(TIME_BUCKETS_MS),
+        "query_histogram": _histogram(QUERY_BUCKETS),
+        "top_duplicate": ("", 0),
+    }
+
+
+def merge_entries(target, entry):
+    """Add ``entry`` (a view's stats) into ``target`` in place"""
+    for key in ("requests", "queries", "duplicates", "db_ms", "total_ms",
+                "render_ms", "over_budget"):
+        target[key] += entry[key]
+    target["max_queries"] = max(target["max_queries"], entry["max_queries"])
+    for key in ("time_histogram", "query_histogram"):
+        target[key] = [a + b for a, b in zip(target[key], entry[key])]
+    if entry["top_duplicate"][1] > target["top_duplicate"][1]:
+        target["top_duplicate"] = tuple(entry["top_duplicate"])
+    return target
+
+
+def summarize(view_name, entry):
+    """Flat report row for one view"""
+    requests = entry["requests"] or 1
+    return {
+        "view": view_name,
+        "requests": entry["requests"],
+        "avg_queries": entry["queries"] / requests,
+        "max_queries": entry["max_queries"],
+        "p95_queries": _percentile(entry["query_histogram"], QUERY_BUCKETS, 0.95),
+        "avg_duplicates": entry["duplicates"] / requests,
+        "avg_db_ms": entry["db_ms"] / requests,
+        "avg_render_ms": entry["render_ms"] / requests,
+        "avg_ms": entry["total_ms"] / requests,
+        "p95_ms": _percentile(entry["time_histogram"], TIME_BUCKETS_MS, 0.95),
+        "over_budget": entry["over_budget"],
+        "top_duplicate": entry["top_duplicate"][0],
+        "top_duplicate_times": entry["top_duplicate"][1],
+    }
+
+
+class ViewStats:
+    """Rolling per-view statistics for this process."""
+
+    def __init__(self, window=300):
+        self.window = window
+        self.lock = threading.Lock()
+        self.process = f"{socket.gethostname()}:{os.getpid()}"
+        self._flusher = None
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.current = {}
+            self.previous = {}
+            self.window_started = time.time()
+
+    def record(self, view_name, profile, total_ms, render_ms=0.0, over_budget=False):
+        sql, times = profile.statements.most_common(1)[0] if profile.statements else ("", 0)
+        with self.lock:
+            finished = self._swap() if self._window_ended() else None
+            entry = self.current.get(view_name)
+            if entry is None:
+                entry = self.current[view_name] = new_view_entry()
+            entry["requests"] += 1
+            entry["queries"] += profile.count
+            entry["max_queries"] = max(entry["max_queries"], profile.count)
+            entry["duplicates"] += profile.duplicate_count
+            entry["db_ms"] += profile.db_time * 1000
+            entry["total_ms"] += total_ms
+            entry["render_ms"] += render_ms
+            entry["over_budget"] += bool(over_budget)
+            entry["time_histogram"][bisect_left(TIME_BUCKETS_MS, total_ms)] += 1
+            entry["query_histogram"][bisect_left(QUERY_BUCKETS, profile.count)] += 1
+            if times > 1 and times > entry["top_duplicate"][1]:
+                entry["top_duplicate"] = (sql, times)
+        # Publish outside the lock so a slow cache never stalls other requests
+        if finished is not None:
+            self.publish(finished)
+        if self._flusher is None:
+            self._start_flusher()
+
+    def _window_ended(self):
+        return time.time() - self.window_started >= self.window
+
+    def _swap(self):
+        """Start a new window and return the finished one; caller holds the lock"""
+        self.previous, self.current = self.current, {}
+        self.window_started = time.time()
+        return self.previous
+
+    def flush(self):
+        """Roll over and publish the current window if it has ended with data"""
+        with self.lock:
+            finished = self._swap() if self.current and self._window_ended() else None
+        if finished is not None:
+            self.publish(finished)
+
+    def _start_flusher(self):
+        with self.lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="query-profile-flush", daemon=True
+            )
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(max(self.window_started + self.window - time.time(), 1))
+            self.flush()
+
+    def publish(self, views):
+        """Store a window's stats in the cache for ``query_report``"""
+        key = SNAPSHOT_KEY.format(process=self.process)
+        try:
+            cache.set(key, {"time": time.time(), "views": views}, self.window * 3)
+            processes = set(cache.get(SNAPSHOT_INDEX_KEY) or ())
+            if key not in processes:
+                processes.add(key)
+                cache.set(SNAPSHOT_INDEX_KEY, sorted(processes), None)
+        except Exception:  # Profiling must never break a request
+            logger.exception("Could not publish query profile")
+
+    def snapshot(self):
+        """This process's stats for the current and previous window, merged"""
+        with self.lock:
+            merged = {}
+            for views in (self.previous, self.current):
+                for view_name, entry in views.items():
+                    merge_entries(merged.setdefault(view_name, new_view_entry()), entry)
+            return merged
+
+
+view_stats = ViewStats(getattr(settings, "QUERY_PROFILING_WINDOW", 300))
+
+
+def collected_snapshots(include_local=True):
+    """Merge the published snapshots of every process (and this one)"""
+    merged = {}
+    keys = cache.get(SNAPSHOT_INDEX_KEY) or []
+    snapshots = cache.get_many(keys) if keys else {}
+    sources = [snapshot["views"] for snapshot in snapshots.values()]
+    if include_local:
+        sources.append(view_stats.snapshot())
+    for views in sources:
+        for view_name, entry in views.items():
+            merge_entries(merged.setdefault(view_name, new_view_entry()), entry)
+    return merged
+
+
+def query_budget_for(view_name):
+    budgets = getattr(settings, "QUERY_BUDGETS", {})
+    return budgets.get(view_name, getattr(settings, "QUERY_BUDGET_DEFAULT", None))
+
+
+class QueryProfilingMiddleware:
+    """Profile each request and record it under its resolved view name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_PROFILING_ENABLED", True)
+        self.sample_rate = getattr(settings, "QUERY_PROFILING_SAMPLE_RATE", 1.0)
+
+    def __call__(self, request):
+        if not self.enabled or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        request._profiling_render_started = None
+        with QueryProfile() as profile:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        render_ms = 0.0
+        render_started = getattr(request, "_profiling_render_started", None)
+        render_finished = getattr(request, "_profiling_render_finished", None)
+        if render_started and render_finished:
+            render_ms = (render_finished - render_started) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view_name = (match.view_name or match._func_path) if match else "<unresolved>"
+        budget = query_budget_for(view_name)
+        over_budget = budget is not None and profile.count > budget
+        if over_budget:
+            duplicates = profile.duplicates()[:1]
+            logger.warning(
+                "%s ran %d queries (budget %d, %d duplicated)%s",
+                view_name, profile.count, budget, profile.duplicate_count,
+                f"; most repeated x{duplicates[0][1]}: {duplicates[0][0][:200]}"
+                if duplicates else "",
+            )
+        view_stats.record(view_name, profile, total_ms, render_ms, over_budget)
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the template render that follows the middleware chain"""
+        request._profiling_render_started = time.perf_counter()
+
+        def finished(response):
+            request._profiling_render_finished = time.perf_counter()
+
+        response.add_post_render_callback(finished)
+        return response
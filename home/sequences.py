@@ -0,0 +1,72 @@
+# home/sequences.py
+"""
+Counter-table number sequences.
+
+Each scope (for example ``project.job_number`` or ``asset.asset_number:VEH``)
+is one ``NumberSequence`` row. Allocation locks just that row with
+``SELECT ... FOR UPDATE`` and bumps it, so it costs one indexed read and one
+write however large the numbered table is, and concurrent callers queue on
+the counter instead of racing on ``MAX()``. Call ``allocate`` inside the
+transaction that saves the numbered record: if that transaction rolls back,
+so does the counter, and no number is skipped.
+"""
+
+from django.db import IntegrityError, transaction
+
+from .models import NumberSequence
+
+
+def _locked(scope, seed):
+    sequence = NumberSequence.objects.select_for_update().filter(scope=scope).first()
+    if sequence is None:
+        try:
+            with transaction.atomic():
+                NumberSequence.objects.create(scope=scope, last_value=seed() if seed else 0)
+        except IntegrityError:
+            pass  # Another transaction created the counter first
+        sequence = NumberSequence.objects.select_for_update().get(scope=scope)
+    return sequence
+
+
+def allocate(scope, count=1, seed=None):
+    """Reserve the next ``count`` numbers of ``scope`` and return them as a range
+
+    ``seed`` is called once, when the scope is first used, and returns the
+    highest number already in use (e.g. from existing records).
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    with transaction.atomic():
+        sequence = _locked(scope, seed)
+        first = sequence.last_value + 1
+        sequence.last_value += count
+        sequence.save(update_fields=["last_value", "updated_at"])
+    return range(first, first + count)
+
+
+def peek(scope, seed=None):
+    """The number ``allocate`` would hand out next, without reserving it"""
+    last_value = (
+        NumberSequence.objects.filter(scope=scope)
+        .values_list("last_value", flat=True)
+        .first()
+    )
+    if last_value is None:
+        last_value = seed() if seed else 0
+    return last_value + 1
+
+
+def allocate_numbers(scope, count, formatter, taken=None, seed=None):
+    """Allocate ``count`` formatted numbers, skipping any already in use
+
+    ``taken(numbers)`` returns the subset of ``numbers`` that already exist,
+    e.g. because they were entered by hand; those are passed over and more
+    are allocated in their place.
+    """
+    numbers = []
+    with transaction.atomic():
+        while len(numbers) < count:
+            block = [formatter(value) for value in allocate(scope, count - len(numbers), seed)]
+            used = set(taken(block)) if taken else set()
+            numbers.extend(number for number in block if number not in used)
+    return numbers
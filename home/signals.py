@@ -0,0 +1,90 @@
+# home/signals.py
+"""
+Expire cached dashboard widgets, statistics and ``home.caching`` entries when
+the data behind them changes.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .widgets import invalidate_dashboard_widgets
+
+# Model (lazy "app_label.Model" reference) -> widget tags it feeds
+WIDGET_TAG_SOURCES = {
+    'project.Project': ('projects',),
+    'todo.Task': ('tasks',),
+    'todo.TaskList': ('tasks',),
+    'project.ProjectMilestone': ('milestones',),
+    'schedule.Event': ('events',),
+    'asset.Asset': ('assets',),
+    'asset.AssetAssignment': ('assets',),
+    'client.Client': ('clients',),
+    'hr.Worker': ('workers',),
+    'hr.TimeOffRequest': ('time_off',),
+    'hr.WorkerClearance': ('clearances',),
+}
+
+# Model -> per-record tags, as "<kind>:{field}" formatted with the instance
+INSTANCE_TAG_SOURCES = {
+    'project.Project': ('project:{pk}',),
+    'project.ProjectMilestone': ('project:{project_id}',),
+    'project.ProjectChange': ('project:{project_id}',),
+    'todo.TaskList': ('project:{project_id}',),
+    'hr.Worker': ('user:{pk}',),
+    'helpdesk.Queue': ('queue:{pk}',),
+    'helpdesk.Ticket': ('queue:{queue_id}',),
+}
+
+# Many-to-many through models that change who sees what
+WIDGET_TAG_M2M_SOURCES = {
+    'project.Project_team_members': ('projects',),
+    'project.Project_team_leads': ('projects',),
+}
+
+
+def _instance_tags(model, instance):
+    tags = []
+    for pattern in INSTANCE_TAG_SOURCES.get(model, ()):
+        field = pattern[pattern.index('{') + 1:-1]
+        value = getattr(instance, field, None)
+        if value is not None:
+            tags.append(pattern.format(**{field: value}))
+    return tags
+
+
+def _make_handler(tags, model=None):
+    def handler(sender, instance=None, **kwargs):
+        if kwargs.get('raw'):
+            return
+        action = kwargs.get('action')
+        if action is not None and not action.startswith('post_'):
+            return
+        record_tags = _instance_tags(model, instance) if model else []
+        invalidate_dashboard_widgets(*tags, *record_tags)
+    return handler
+
+
+def _make_m2m_handler(tags):
+    def handler(sender, instance, action, pk_set=None, **kwargs):
+        if not action.startswith('post_'):
+            return
+        record_tags = _instance_tags(instance._meta.label, instance)
+        related = kwargs.get('model')
+        for pk in pk_set or ():
+            record_tags += _instance_tags(related._meta.label, related(pk=pk))
+        invalidate_dashboard_widgets(*tags, *record_tags)
+    return handler
+
+
+def connect_widget_invalidation():
+    """Connect cache invalidation for every widget data source."""
+    for model in WIDGET_TAG_SOURCES.keys() | INSTANCE_TAG_SOURCES.keys():
+        handler = _make_handler(WIDGET_TAG_SOURCES.get(model, ()), model)
+        uid = f'home_widgets:{model}'
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+
+    for through, tags in WIDGET_TAG_M2M_SOURCES.items():
+        m2m_changed.connect(
+            _make_m2m_handler(tags), sender=through, weak=False,
+            dispatch_uid=f'home_widgets:{through}',
+        )
@@ -0,0 +1,71 @@
+# home/stats.py
+"""
+Cached single-pass dashboard statistics.
+
+A ``StatsQuery`` collects the counters a dashboard shows for one table and
+evaluates them as a single conditional aggregate (``Count(filter=Q(...))``).
+Results are cached under the same invalidation tags as the dashboard widgets,
+so the signal handlers in ``home.signals`` expire them when the table changes.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .widgets import tag_version
+
+
+class StatsQuery:
+    """Counters over one queryset, computed in one round trip."""
+
+    def __init__(self, name, queryset, tags=(), ttl=300):
+        self.name = name
+        self.queryset = queryset
+        self.tags = tuple(tags)
+        self.ttl = ttl
+        self.metrics = {}
+        self.breakdowns = {}
+
+    def __repr__(self):
+        return f"<StatsQuery {self.name}>"
+
+    def count(self, name, *args, **lookups):
+        """Count rows matching ``Q(*args, **lookups)`` (all rows if empty)"""
+        condition = Q(*args, **lookups)
+        self.metrics[name] = Count("pk", filter=condition) if condition else Count("pk")
+        return self
+
+    def count_each(self, field, values, exclude=()):
+        """Count rows per value of ``field``; reported as ``[{field, 'count'}]``"""
+        values = [value for value in values if value not in exclude]
+        self.breakdowns[field] = values
+        for value in values:
+            self.metrics[f"{field}:{value}"] = Count("pk", filter=Q(**{field: value}))
+        return self
+
+    def count_each_choice(self, field, **kwargs):
+        """``count_each`` over the choices declared on the model field"""
+        choices = self.queryset.model._meta.get_field(field).choices
+        return self.count_each(field, [value for value, _label in choices], **kwargs)
+
+    def cache_key(self):
+        return f"home_stats:{self.name}:{tag_version(self.tags)}"
+
+    def compute(self):
+        result = self.queryset.order_by().aggregate(**self.metrics)
+        stats = {name: value for name, value in result.items() if ":" not in name}
+        for field, values in self.breakdowns.items():
+            stats[field] = [
+                {field: value, "count": result[f"{field}:{value}"]}
+                for value in sorted(values)
+                if result[f"{field}:{value}"]
+            ]
+        return stats
+
+    def get(self):
+        """Return the statistics, from the cache when they are still current"""
+        key = self.cache_key()
+        stats = cache.get(key)
+        if stats is None:
+            stats = self.compute()
+            cache.set(key, stats, self.ttl)
+        return stats
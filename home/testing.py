@@ -0,0 +1,56 @@
+# home/testing.py
+"""
+Test helpers for keeping views inside their query budgets.
+
+    from home.testing import QueryBudgetMixin
+
+    class ProjectViewTests(QueryBudgetMixin, TestCase):
+        def test_list_budget(self):
+            self.assertViewQueryBudget(reverse("project:project-list"))
+
+The budget defaults to the view's entry in ``settings.QUERY_BUDGETS``, so
+the production warning threshold and the test agree.
+"""
+
+from contextlib import contextmanager
+
+from django.urls import resolve
+
+from .profiling import QueryProfile, query_budget_for
+
+
+def _report(profile):
+    lines = [f"{times}x {sql}" for sql, times in profile.duplicates()[:5]]
+    return "\n".join(lines) or "no duplicated statements"
+
+
+@contextmanager
+def query_budget(max_queries, max_duplicates=None, label="block"):
+    """Fail if the block runs more than ``max_queries`` (or duplicate) queries"""
+    with QueryProfile() as profile:
+        yield profile
+    if profile.count > max_queries:
+        raise AssertionError(
+            f"{label} ran {profile.count} queries, budget is {max_queries}\n{_report(profile)}"
+        )
+    if max_duplicates is not None and profile.duplicate_count > max_duplicates:
+        raise AssertionError(
+            f"{label} repeated {profile.duplicate_count} queries, "
+            f"allowed {max_duplicates}\n{_report(profile)}"
+        )
+
+
+class QueryBudgetMixin:
+    """``TestCase`` mixin adding ``assertViewQueryBudget``"""
+
+    def assertViewQueryBudget(self, url, budget=None, max_duplicates=None, method="get",
+                              data=None, status_code=200):
+        view_name = resolve(url.split("?", 1)[0]).view_name
+        if budget is None:
+            budget = query_budget_for(view_name)
+        if budget is None:
+            self.fail(f"No query budget set for {view_name}")
+        with query_budget(budget, max_duplicates, label=view_name):
+            response = getattr(self.client, method)(url, data or {})
+        self.assertEqual(response.status_code, status_code)
+        return response
@@ -1,3 +1,360 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from .testing import QueryBudgetMixin
+from .views import DASHBOARD_WIDGETS
+from .widgets import get_cached_widgets, load_widget
+
+
+class DashboardWidgetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="dash@example.com", password="pass", employee_id="E1",
+            roles=["employee"],
+        )
+        self.client.force_login(self.user)
+
+    def test_shell_lazy_loads_uncached_widgets(self):
+        response = self.client.get(reverse("home:index"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse("home:widget", args=["stats"]))
+        self.assertContains(response, 'hx-trigger="load"')
+
+    def test_widget_fragment_is_cached_and_inlined(self):
+        response = self.client.get(reverse("home:widget", args=["stats"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "stats-row")
+
+        response = self.client.get(reverse("home:index"))
+        self.assertNotContains(response, reverse("home:widget", args=["stats"]))
+        self.assertContains(response, reverse("home:widget", args=["tools"]))
+
+    def test_unknown_widget_404(self):
+        response = self.client.get(reverse("home:widget", args=["nope"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_project_change_invalidates_project_widgets(self):
+        from project.models import Project
+
+        widgets = [DASHBOARD_WIDGETS["projects"], DASHBOARD_WIDGETS["tools"]]
+        for widget in widgets:
+            load_widget(widget, self.user)
+        self.assertEqual(set(get_cached_widgets(widgets, self.user)), {"projects", "tools"})
+
+        Project.objects.create(job_number="P1", name="Proj")
+        self.assertEqual(set(get_cached_widgets(widgets, self.user)), {"tools"})
+
+
+class StatsQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_counters_are_one_cached_query(self):
+        from client.models import Client
+        from client.views import CLIENT_DASHBOARD_STATS
+
+        Client.objects.create(company_name="A", status="active", business_type="llc")
+        Client.objects.create(company_name="B", status="active")
+        Client.objects.create(company_name="C", status="inactive")
+
+        with self.assertNumQueries(1):
+            stats = CLIENT_DASHBOARD_STATS.get()
+        self.assertEqual(stats["total_clients"], 3)
+        self.assertEqual(stats["active_clients"], 2)
+        self.assertEqual(stats["prospect_clients"], 0)
+        self.assertEqual(
+            stats["status"],
+            [{"status": "active", "count": 2}, {"status": "inactive", "count": 1}],
+        )
+        self.assertEqual(stats["business_type"], [{"business_type": "llc", "count": 1}])
+
+        with self.assertNumQueries(0):
+            CLIENT_DASHBOARD_STATS.get()
+
+        Client.objects.create(company_name="D", status="prospect")
+        self.assertEqual(CLIENT_DASHBOARD_STATS.get()["prospect_clients"], 1)
+
+
+class NumberSequenceTests(TestCase):
+    def test_allocate_is_consecutive_and_seeded_once(self):
+        from .sequences import allocate, peek
+
+        seeds = []
+
+        def seed():
+            seeds.append(1)
+            return 41
+
+        self.assertEqual(peek("test", seed=seed), 42)
+        self.assertEqual(list(allocate("test", seed=seed)), [42])
+        self.assertEqual(list(allocate("test", count=3, seed=seed)), [43, 44, 45])
+        self.assertEqual(peek("test", seed=seed), 46)
+        self.assertEqual(len(seeds), 2)  # the peek and the first allocation
+        self.assertEqual(list(allocate("other")), [1])
+
+    def test_rolled_back_allocation_leaves_no_gap(self):
+        from django.db import transaction
+
+        from .sequences import allocate
+
+        allocate("test")
+        try:
+            with transaction.atomic():
+                allocate("test")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(list(allocate("test")), [2])
+
+    def test_allocate_numbers_skips_taken(self):
+        from .sequences import allocate_numbers
+
+        numbers = allocate_numbers(
+            "test", 3, lambda value: f"N{value}", taken=lambda block: {"N2"} & set(block)
+        )
+        self.assertEqual(numbers, ["N1", "N3", "N4"])
+
+
+class QueryProfilingTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        from .profiling import view_stats
+
+        cache.clear()
+        view_stats.reset()
+        self.user = get_user_model().objects.create_user(
+            email="prof@example.com", password="pass", employee_id="E3",
+            roles=["employee"],
+        )
+        self.client.force_login(self.user)
+
+    def test_profile_counts_duplicate_statements(self):
+        from .profiling import QueryProfile
+
+        User = get_user_model()
+        with QueryProfile() as profile:
+            for _ in range(3):
+                User.objects.filter(pk=self.user.pk).exists()
+            User.objects.count()
+        self.assertEqual(profile.count, 4)
+        self.assertEqual(profile.duplicate_count, 2)
+        self.assertEqual(profile.duplicates()[0][1], 3)
+
+    def test_middleware_records_stats_per_view(self):
+        from .profiling import collected_snapshots, summarize
+
+        self.client.get(reverse("home:index"))
+        self.client.get(reverse("home:index"))
+        stats = collected_snapshots()
+        self.assertIn("home:index", stats)
+        row = summarize("home:index", stats["home:index"])
+        self.assertEqual(row["requests"], 2)
+        self.assertGreater(row["avg_queries"], 0)
+
+    def test_over_budget_requests_are_logged(self):
+        from .profiling import view_stats
+
+        with self.settings(QUERY_BUDGETS={"home:index": 0}):
+            with self.assertLogs("wbee.profiling", level="WARNING"):
+                self.client.get(reverse("home:index"))
+        self.assertEqual(view_stats.snapshot()["home:index"]["over_budget"], 1)
+
+    def test_published_snapshots_are_reported(self):
+        import json
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from .profiling import view_stats
+
+        self.client.get(reverse("home:index"))
+        view_stats.window_started -= view_stats.window
+        view_stats.flush()
+        view_stats.reset()
+        out = StringIO()
+        call_command("query_report", "--json", stdout=out)
+        rows = json.loads(out.getvalue())
+        self.assertEqual([row["view"] for row in rows], ["home:index"])
+
+    def test_idle_window_is_published_by_flush(self):
+        from .profiling import SNAPSHOT_KEY, view_stats
+
+        self.client.get(reverse("home:index"))
+        key = SNAPSHOT_KEY.format(process=view_stats.process)
+        view_stats.flush()
+        self.assertIsNone(cache.get(key))
+        view_stats.window_started -= view_stats.window
+        view_stats.flush()
+        self.assertIn("home:index", cache.get(key)["views"])
+        self.assertEqual(view_stats.current, {})
+
+    def test_dashboard_budget(self):
+        self.assertViewQueryBudget(reverse("home:index"))
+
+    def test_query_budget_helper(self):
+        from .testing import query_budget
+
+        with query_budget(1):
+            get_user_model().objects.count()
+        with self.assertRaises(AssertionError):
+            with query_budget(1, label="two queries"):
+                get_user_model().objects.count()
+                get_user_model().objects.count()
+        with self.assertRaises(AssertionError):
+            with query_budget(5, max_duplicates=0):
+                get_user_model().objects.count()
+                get_user_model().objects.count()
+
+
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        from .caching import TieredCache
+
+        cache.clear()
+        self.tiered = TieredCache(max_entries=2, l1_ttl=60, lock_timeout=1)
+        self.calls = []
+
+    def compute(self, value="v"):
+        def build():
+            self.calls.append(value)
+            return value
+        return build
+
+    def test_l1_serves_without_backend_and_is_bounded(self):
+        self.tiered.get_or_compute("a", self.compute("a"))
+        cache.clear()
+        self.assertEqual(self.tiered.get_or_compute("a", self.compute("x")), "a")
+        self.tiered.get_or_compute("b", self.compute("b"))
+        self.tiered.get_or_compute("c", self.compute("c"))
+        self.assertEqual(len(self.tiered.local), 2)
+        self.assertEqual(self.tiered.get_or_compute("a", self.compute("a2")), "a2")
+
+    def test_l2_is_shared_between_processes(self):
+        from .caching import TieredCache
+
+        self.tiered.get_or_compute("a", self.compute("a"), tags=["project:1"])
+        other = TieredCache(l1_ttl=60)
+        self.assertEqual(other.get_or_compute("a", self.compute("x"), tags=["project:1"]), "a")
+        self.assertEqual(self.calls, ["a"])
+
+    def test_tag_invalidation_expires_both_tiers(self):
+        from project.models import Project
+
+        from .caching import tiered_cache
+
+        tiered_cache.get_or_compute("p", self.compute("old"), tags=["projects"])
+        Project.objects.create(job_number="T1", name="Tiered")
+        self.assertEqual(
+            tiered_cache.get_or_compute("p", self.compute("new"), tags=["projects"]), "new"
+        )
+
+        project = Project.objects.get(job_number="T1")
+        tags = [f"project:{project.pk}"]
+        tiered_cache.get_or_compute("one", self.compute("old"), tags=tags)
+        project.name = "Renamed"
+        project.save()
+        self.assertEqual(tiered_cache.get_or_compute("one", self.compute("new"), tags=tags), "new")
+
+    def test_stale_entry_is_served_while_another_worker_recomputes(self):
+        import time
+
+        from .caching import LOCK_KEY
+
+        cache.set("tiered:s", {"value": "old", "expires": time.time() - 1}, 60)
+        cache.add(LOCK_KEY.format(key="tiered:s"), "other-worker", 30)
+        self.assertEqual(self.tiered.get_or_compute("s", self.compute("new"), ttl=10), "old")
+
+        cache.delete(LOCK_KEY.format(key="tiered:s"))
+        self.tiered.clear_local()
+        self.assertEqual(self.tiered.get_or_compute("s", self.compute("new"), ttl=10), "new")
+        self.assertEqual(self.calls, ["new"])
+
+    def test_cold_miss_waits_for_the_lock_holder(self):
+        from unittest import mock
+
+        from .caching import LOCK_KEY
+
+        cache.add(LOCK_KEY.format(key="tiered:w"), "other-worker", 30)
+
+        def finish(_seconds):
+            self.tiered._store("tiered:w", "theirs", 60)
+
+        with mock.patch("home.caching.time.sleep", side_effect=finish):
+            value = self.tiered.get_or_compute("w", self.compute("mine"))
+        self.assertEqual(value, "theirs")
+        self.assertEqual(self.calls, [])
+
+
+class HealthProbeTests(TestCase):
+    def setUp(self):
+        from . import health
+
+        cache.clear()
+        health.reset_readiness()
+        self.addCleanup(health.reset_readiness)
+
+    def test_liveness_touches_nothing(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home:liveness"))
+        self.assertEqual(response.json(), {"status": "alive"})
+
+    def test_readiness_is_rechecked_at_most_once_per_interval(self):
+        from unittest import mock
+
+        from . import health
+
+        with mock.patch("home.health.run_checks", wraps=health.run_checks) as run_checks:
+            for _ in range(3):
+                response = self.client.get(reverse("home:readiness"))
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(run_checks.call_count, 1)
+        self.assertTrue(response.json()["checks"]["database:default"]["status"])
+
+    def test_failed_ping_is_not_ready(self):
+        from unittest import mock
+
+        with mock.patch("home.health._ping_cache", side_effect=ConnectionError("down")):
+            response = self.client.get(reverse("home:readiness"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["checks"]["cache"]["message"], "down")
+
+    def test_slow_check_times_out(self):
+        import threading
+        from unittest import mock
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with self.settings(HEALTH_CHECK_TIMEOUT=0.05), \
+                mock.patch("home.health._ping_cache", side_effect=lambda: release.wait(5)):
+            response = self.client.get(reverse("home:readiness"))
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("timed out", response.json()["checks"]["readiness"]["message"])
+
+    def test_system_status_is_staff_only_and_cached(self):
+        from unittest import mock
+
+        from .caching import tiered_cache
+
+        tiered_cache.clear_local()
+        response = self.client.get(reverse("home:system-status"))
+        self.assertEqual(response.status_code, 302)
+
+        staff = get_user_model().objects.create_user(
+            email="ops@example.com", password="pass", employee_id="E4",
+            roles=["employee"], is_staff=True,
+        )
+        self.client.force_login(staff)
+        status = self.client.get(reverse("home:system-status")).json()
+        self.assertEqual(status["migrations"]["unapplied"], 0)
+        self.assertIsNotNone(status["database"]["size_bytes"])
+        # Per-process counters are reported live, never baked into the snapshot
+        self.assertNotIn("tiered", status["cache"])
+        self.assertEqual(status["worker_cache"]["process"], os.getpid())
 
-# Create your tests here.
+        with mock.patch("home.health.build_deep_status") as build:
+            self.client.get(reverse("home:system-status"))
+        build.assert_not_called()
@@ -12,8 +12,14 @@ app_name = 'home'
 urlpatterns = [
     # Main dashboard
     path('', views.index, name='index'),
+    path('widgets/<slug:name>/', views.dashboard_widget, name='widget'),
     path('schedule-demo/', views.schedule_demo, name='schedule-demo'),
     
+    # Health probes
+    path('health/live/', views.liveness, name='liveness'),
+    path('health/ready/', views.readiness, name='readiness'),
+    path('health/status/', views.system_status, name='system-status'),
+
     # Contact functionality
     path('contact/', views.contactView, name='contact'),
     path('success/', views.successView, name='success'),
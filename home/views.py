@@ -4,8 +4,13 @@ Improved dashboard views to match the original app layout.
 """
 
 from django.shortcuts import render, redirect
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.views.decorators.cache import never_cache
 from django.core.mail import send_mail
 from django.conf import settings
 from django.core.exceptions import FieldError
@@ -15,6 +20,9 @@ from django.db.models import Q
 from datetime import date, timedelta
 import logging
 
+from . import health
+from .widgets import DashboardWidget, get_cached_widgets, load_widget
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +31,8 @@ ACTIVE_PROJECT_STATUSES = ["active", "installing"]
 ACTIVE_TASK_STATUSES = ["todo", "in_progress", "review", "blocked"]
 ACTIVE_EVENT_STATUSES = ["confirmed", "tentative", "draft", "rescheduled"]
 ACTIVE_ASSET_STATUSES = ["available", "in_use", "assigned", "active"]
+# ProjectAccess levels that put a project on a user's dashboard
+DASHBOARD_PROJECT_ACCESS_LEVELS = ["team_member", "team_lead", "project_manager"]
 
 
 def _user_can_view_company_data(user):
@@ -79,70 +89,52 @@ class ContactForm(forms.Form):
 @login_required
 def index(request):
     """
-    Enhanced dashboard view matching the original app layout.
+    Dashboard shell.
+
+    Widgets already cached for the user are rendered inline; the rest are
+    fetched by htmx from ``dashboard_widget`` so the first byte never waits
+    on the slowest loader.
     """
-    
-    # Initialize all context variables
-    context = {
-        'user': request.user,
-        'scheduled_events': [],
-        'priority_tasks': [],
-        'tools_assigned': [],
-        'recent_projects': [],
-        'upcoming_deadlines': [],
-        'calendar_events': [],
-        'dashboard_stats': {},
-        
-        # Keep backward compatibility
-        'worker_detail': [],
-        'worker_project_list': [],
-        'project_event_list': [],
-        'ladder_list': [],
-        'vehicle_list': [],
-        'tool_list': [],
-        'power_tool_list': [],
-        'fiber_list': [],
-        'tester_list': [],
-        'asset_groups': [],
-    }
-    
-    # Load dashboard data
+    widgets = [DASHBOARD_WIDGETS[name] for name in DASHBOARD_PAGE_WIDGETS]
+
     try:
-        context.update(load_enhanced_dashboard_data(request.user))
+        cached = get_cached_widgets(widgets, request.user)
     except Exception as e:
         logger.error(f"Error loading dashboard data: {e}")
-    
+        cached = {}
+
+    slots = {}
+    for widget in widgets:
+        html = None
+        if widget.name in cached:
+            html = render_to_string(widget.template, cached[widget.name], request=request)
+        slots[widget.name] = {
+            'name': widget.name,
+            'html': html,
+            'url': reverse('home:widget', args=[widget.name]),
+        }
+
+    context = {
+        'user': request.user,
+        'dashboard_widgets': slots,
+    }
     return render(request, 'home/home.html', context)
 
 
-def load_enhanced_dashboard_data(user):
-    """
-    Load enhanced dashboard data matching the original app structure.
-    """
-    data = {}
-    
-    # Load scheduled events (like the original screenshot)
-    data['scheduled_events'] = load_scheduled_events(user)
-    
-    # Load tools/assets (right sidebar)
-    data['tools_assigned'] = load_user_tools(user)
-    
-    # Load projects
-    data['recent_projects'] = load_recent_projects(user)
-    
-    # Load calendar events for mini calendar
-    data['calendar_events'] = load_calendar_events(user)
-    
-    # Load priority tasks/todo items
-    data['priority_tasks'] = load_priority_tasks(user)
-    
-    # Dashboard statistics
-    data['dashboard_stats'] = load_dashboard_stats(user)
-    
-    # Keep backward compatibility
-    data.update(load_backward_compatibility_data(user))
-    
-    return data
+@login_required
+def dashboard_widget(request, name):
+    """Render a single dashboard widget fragment (htmx target)."""
+    widget = DASHBOARD_WIDGETS.get(name)
+    if widget is None or not widget.template:
+        raise Http404("Unknown dashboard widget")
+
+    try:
+        context = load_widget(widget, request.user)
+    except Exception as e:
+        logger.error(f"Error loading dashboard widget {name}: {e}")
+        return HttpResponse('')
+
+    return render(request, widget.template, context)
 
 
 def load_scheduled_events(user):
@@ -248,6 +240,15 @@ def load_user_tools(user):
     return tools
 
 
+def load_tools_widget(user):
+    """Context for the tools sidebar widget."""
+    tools = load_user_tools(user)
+    return {
+        'tools_assigned': tools,
+        'tools_count': sum(len(group['items']) for group in tools),
+    }
+
+
 def load_recent_projects(user):
     """Load recent projects for the user."""
     projects = []
@@ -255,12 +256,9 @@ def load_recent_projects(user):
     try:
         from project.models import Project
         
-        user_projects = Project.objects.filter(
-            Q(team_members=user) |
-            Q(team_leads=user) |
-            Q(project_manager=user),
-            status__in=ACTIVE_PROJECT_STATUSES,
-        ).distinct()
+        user_projects = Project.objects.for_member(
+            user, DASHBOARD_PROJECT_ACCESS_LEVELS
+        ).filter(status__in=ACTIVE_PROJECT_STATUSES)
 
         user_projects = _filter_for_company(user_projects, user).order_by('-updated_at')[:5]
         
@@ -281,48 +279,6 @@ def load_recent_projects(user):
     return projects
 
 
-def load_calendar_events(user):
-    """Load calendar events for mini calendar widget."""
-    events = []
-    
-    try:
-        from schedule.models import Event
-        
-        # Get events for current month
-        today = timezone.now().date()
-        start_of_month = today.replace(day=1)
-        end_of_month = (start_of_month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        monthly_events = Event.objects.filter(
-            Q(workers=user) |
-            Q(lead=user) |
-            Q(creator=user) |
-            Q(project__team_members=user) |
-            Q(project__team_leads=user) |
-            Q(project__project_manager=user),
-            start__date__gte=start_of_month,
-            start__date__lte=end_of_month,
-            status__in=ACTIVE_EVENT_STATUSES,
-        ).distinct()
-
-        monthly_events = _filter_for_company(
-            monthly_events, user, field_name='project__company'
-        ).order_by('start')
-        
-        for event in monthly_events:
-            events.append({
-                'date': event.start.date(),
-                'title': getattr(event, 'title', str(event)),
-                'time': event.start.time(),
-                'type': getattr(event, 'event_type', 'general'),
-            })
-            
-    except (ImportError, AttributeError):
-        pass
-    
-    return events
-
-
 def load_priority_tasks(user):
     """Load priority tasks/todo items."""
     tasks = []
@@ -423,11 +379,9 @@ def load_dashboard_stats(user):
         project_qs = _filter_for_company(project_qs, user)
 
         if not can_view_company:
-            project_qs = project_qs.filter(
-                Q(team_members=user) | Q(team_leads=user) | Q(project_manager=user)
-            )
+            project_qs = project_qs.for_member(user, DASHBOARD_PROJECT_ACCESS_LEVELS)
 
-        stats['active_projects'] = project_qs.distinct().count()
+        stats['active_projects'] = project_qs.count()
     except (ImportError, AttributeError, FieldError) as exc:
         if isinstance(exc, FieldError):
             logger.debug(f"Project filtering failed: {exc}")
@@ -467,86 +421,37 @@ def load_dashboard_stats(user):
     return stats
 
 
-def load_backward_compatibility_data(user):
-    """Load data for backward compatibility with original templates."""
-    data = {
-        'worker_project_list': [],
-        'project_event_list': [],
-        'ladder_list': [],
-        'vehicle_list': [],
-        'tool_list': [],
-        'power_tool_list': [],
-        'fiber_list': [],
-        'tester_list': [],
-        'asset_groups': [],
-    }
-    
-    try:
-        from asset.models import Asset
-        user_assets = Asset.objects.filter(
-            Q(assigned_worker=user) |
-            Q(assignments__assigned_to_worker=user, assignments__is_active=True),
-            is_active=True,
-            status__in=ACTIVE_ASSET_STATUSES,
-        ).distinct()
-
-        user_assets = _filter_for_company(user_assets, user)
-        
-        # Original template variables
-        data['ladder_list'] = user_assets.filter(asset_type__icontains='ladder')[:10]
-        data['vehicle_list'] = user_assets.filter(asset_type__icontains='vehicle')[:10]
-        data['tool_list'] = user_assets.filter(asset_type__icontains='tool')[:10]
-        data['power_tool_list'] = user_assets.filter(asset_type__icontains='power')[:10]
-        data['fiber_list'] = user_assets.filter(asset_type__icontains='fiber')[:10]
-        data['tester_list'] = user_assets.filter(asset_type__icontains='test')[:10]
-        
-        # Asset groups
-        asset_categories = {}
-        for asset in user_assets:
-            category = getattr(asset.category, 'name', getattr(asset, 'asset_type', 'Other'))
-            if category not in asset_categories:
-                asset_categories[category] = []
-            asset_categories[category].append(asset)
-        
-        data['asset_groups'] = [
-            {'title': cat, 'items': items} 
-            for cat, items in asset_categories.items()
-        ]
-        
-    except (ImportError, AttributeError):
-        pass
-    
-    try:
-        from project.models import Project
-        project_qs = Project.objects.filter(
-            Q(team_members=user) | Q(team_leads=user) | Q(project_manager=user),
-            status__in=ACTIVE_PROJECT_STATUSES,
-        ).distinct()
-
-        data['worker_project_list'] = _filter_for_company(project_qs, user)[:10]
-    except (ImportError, AttributeError):
-        pass
-    
-    try:
-        from schedule.models import Event
-        event_qs = Event.objects.filter(
-            Q(workers=user) |
-            Q(lead=user) |
-            Q(creator=user) |
-            Q(project__team_members=user) |
-            Q(project__team_leads=user) |
-            Q(project__project_manager=user),
-            start__gte=timezone.now(),
-            status__in=ACTIVE_EVENT_STATUSES,
-        ).distinct()
+# Dashboard widgets: loader, template fragment, cache TTL and the
+# invalidation tags bumped by home.signals when the underlying data changes.
+DASHBOARD_WIDGETS = {
+    widget.name: widget
+    for widget in [
+        DashboardWidget(
+            'stats', load_dashboard_stats, 'dashboard_stats',
+            template='home/widgets/stats.html', ttl=300,
+            tags=('projects', 'tasks', 'events', 'assets'),
+        ),
+        DashboardWidget(
+            'events', load_scheduled_events, 'scheduled_events',
+            template='home/widgets/events.html', ttl=300, tags=('events', 'projects'),
+        ),
+        DashboardWidget(
+            'tasks', load_priority_tasks, 'priority_tasks',
+            template='home/widgets/tasks.html', ttl=120, tags=('tasks',),
+        ),
+        DashboardWidget(
+            'projects', load_recent_projects, 'recent_projects',
+            template='home/widgets/projects.html', ttl=300, tags=('projects',),
+        ),
+        DashboardWidget(
+            'tools', load_tools_widget, None,
+            template='home/widgets/tools.html', ttl=600, tags=('assets',),
+        ),
+    ]
+}
 
-        data['project_event_list'] = _filter_for_company(
-            event_qs, user, field_name='project__company'
-        ).order_by('start')[:10]
-    except (ImportError, AttributeError):
-        pass
-    
-    return data
+# Widgets shown on the dashboard page, in render order
+DASHBOARD_PAGE_WIDGETS = ['stats', 'events', 'tasks', 'projects', 'tools']
 
 
 # Utility functions
@@ -709,6 +614,26 @@ def schedule_demo(request):
     return render(request, "home/schedule_example.html")
 
 
+@never_cache
+def liveness(request):
+    """Liveness probe: no database or cache access."""
+    return JsonResponse(health.liveness())
+
+
+@never_cache
+def readiness(request):
+    """Readiness probe: 503 until the database and cache answer."""
+    result = health.readiness()
+    return JsonResponse(result, status=200 if result["status"] == "ready" else 503)
+
+
+@never_cache
+@staff_member_required
+def system_status(request):
+    """Cached deep status plus this worker's cache hit rate."""
+    return JsonResponse(health.system_status())
+
+
 def permission_denied_view(request, exception=None):
     """Render custom 403 page."""
     return render(request, "403.html", status=403)
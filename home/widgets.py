@@ -0,0 +1,97 @@
+# home/widgets.py
+"""
+Independently cached dashboard widgets.
+
+Each widget wraps one of the ``load_*`` functions in ``home.views`` with its
+own cache TTL and invalidation tags. The dashboard shell renders widgets that
+are already cached inline and lazy-loads the rest through htmx, so the page
+no longer waits for the slowest loader.
+"""
+
+from django.core.cache import cache
+
+WIDGET_VERSION_KEY = "home_widget_version:{tag}"
+
+
+class DashboardWidget:
+    """A dashboard fragment backed by a per-user loader function."""
+
+    def __init__(self, name, loader, context_name, template=None, ttl=300, tags=()):
+        self.name = name
+        self.loader = loader
+        self.context_name = context_name
+        self.template = template
+        self.ttl = ttl
+        self.tags = tuple(tags)
+
+    def __repr__(self):
+        return f"<DashboardWidget {self.name}>"
+
+    def cache_key(self, user, versions):
+        version = ".".join(str(versions.get(tag, 0)) for tag in self.tags)
+        return f"home_widget:{self.name}:{user.pk}:{version}"
+
+    def load(self, user):
+        """Run the loader and return the widget's template context.
+
+        Loaders without a ``context_name`` return the whole context dict.
+        """
+        if self.context_name is None:
+            return self.loader(user)
+        return {self.context_name: self.loader(user)}
+
+
+def _tag_versions(tags):
+    keys = {WIDGET_VERSION_KEY.format(tag=tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    return {tag: found.get(key, 0) for key, tag in keys.items()}
+
+
+def tag_version(tags):
+    """Return a string that changes whenever any of ``tags`` is invalidated"""
+    versions = _tag_versions(tags)
+    return ".".join(str(versions[tag]) for tag in tags)
+
+
+def invalidate_dashboard_widgets(*tags):
+    """Expire every cached widget that depends on any of ``tags``
+
+    Also purges this process's ``home.caching`` L1 entries for the tags.
+    """
+    from .caching import tiered_cache
+
+    tiered_cache.local.discard_tags(tags)
+    for tag in tags:
+        key = WIDGET_VERSION_KEY.format(tag=tag)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr(); any new value invalidates.
+            cache.set(key, 1, None)
+
+
+def get_cached_widgets(widgets, user):
+    """Return ``{name: context}`` for the widgets already cached for ``user``"""
+    versions = _tag_versions({tag for widget in widgets for tag in widget.tags})
+    keys = {widget.cache_key(user, versions): widget for widget in widgets}
+    found = cache.get_many(list(keys))
+    return {keys[key].name: context for key, context in found.items()}
+
+
+def load_widgets(widgets, user):
+    """Return ``{name: context}`` for ``widgets``, computing and caching misses"""
+    widgets = list(widgets)
+    versions = _tag_versions({tag for widget in widgets for tag in widget.tags})
+    results = get_cached_widgets(widgets, user)
+    for widget in widgets:
+        if widget.name not in results:
+            context = widget.load(user)
+            cache.set(widget.cache_key(user, versions), context, widget.ttl)
+            results[widget.name] = context
+    return results
+
+
+def load_widget(widget, user):
+    """Return the context for a single widget, using the cache when possible"""
+    return load_widgets([widget], user)[widget.name]
@@ -37,7 +37,7 @@ class RoleFilter(admin.SimpleListFilter):
 
     def queryset(self, request, queryset):
         if self.value():
-            return queryset.filter(roles__contains=[self.value()])
+            return queryset.filter(role_entries__role=self.value())
         return queryset
 
 # Custom forms for Worker
@@ -0,0 +1,227 @@
+"""Per-worker weekly workload and capacity engine.
+
+Hours come from three sources: open tasks assigned to a worker (the
+remaining ``allotted_time``, which is already per person, spread over the
+weekdays between the task's start and due dates), schedule events the worker leads or
+is assigned to, and logged timecards. Intervals are bucketed into weeks
+arithmetically (one step per week rather than per day), and the resulting
+matrix is stored in ``WorkerWeeklyLoad`` by a nightly rebuild so reports only
+read precomputed rows.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Worker, WorkerWeeklyLoad
+
+WEEKLY_CAPACITY_HOURS = Decimal('40')
+UNDERUTILIZED_HOURS = Decimal('20')
+WORKDAY_HOURS = Decimal('8')
+
+TASK, SCHEDULED, LOGGED = range(3)
+
+
+def week_start(day):
+    """Monday of the week containing ``day``"""
+    return day - timedelta(days=day.weekday())
+
+
+def workdays_by_week(start, end):
+    """Return ``{monday: weekdays}`` for the inclusive range ``start``-``end``"""
+    result = {}
+    monday = week_start(start)
+    while monday <= end:
+        first = max(start, monday)
+        last = min(end, monday + timedelta(days=4))
+        if first <= last:
+            result[monday] = (last - first).days + 1
+        monday += timedelta(weeks=1)
+    return result
+
+
+def spread_hours(hours, start, end):
+    """Spread ``hours`` evenly over the weekdays of ``start``-``end`` by week"""
+    if end < start:
+        start, end = end, start
+    days = workdays_by_week(start, end)
+    total = sum(days.values())
+    if not total:
+        return {week_start(start): hours}
+    return {monday: hours * count / total for monday, count in days.items()}
+
+
+def _add(matrix, worker_id, buckets, source, first_week, last_week):
+    for monday, hours in buckets.items():
+        if first_week <= monday <= last_week:
+            matrix[worker_id, monday][source] += hours
+
+
+def _task_hours(matrix, first_week, last_week):
+    from todo.models import Task
+
+    tasks = Task.objects.filter(
+        completed=False,
+        assigned_to__isnull=False,
+        due_date__gte=first_week,
+    ).values_list(
+        'assigned_to_id', 'allotted_time', 'completion_percentage',
+        'start_date', 'created_date', 'due_date',
+    )
+    for worker_id, allotted, percent, start, created, due in tasks.iterator():
+        remaining = Decimal(100 - min(percent or 0, 100)) / 100
+        hours = (allotted or 0) * remaining
+        if not hours:
+            continue
+        begin = start or timezone.localdate(created)
+        _add(matrix, worker_id, spread_hours(hours, min(begin, due), due),
+             TASK, first_week, last_week)
+
+
+def _event_hours(matrix, first_week, last_week):
+    from schedule.models import Event
+
+    window_start = timezone.make_aware(datetime.combine(first_week, time.min))
+    window_end = window_start + timedelta(days=(last_week - first_week).days + 7)
+    events = Event.objects.filter(start__lt=window_end, end__gt=window_start)
+
+    staff = defaultdict(set)
+    for event_id, worker_id in Event.workers.through.objects.filter(
+        event__in=events
+    ).values_list('event_id', 'worker_id'):
+        staff[event_id].add(worker_id)
+
+    for event_id, start, end, all_day, lead_id in events.values_list(
+        'id', 'start', 'end', 'all_day', 'lead_id'
+    ).iterator():
+        workers = staff[event_id] | ({lead_id} if lead_id else set())
+        if not workers:
+            continue
+        start, end = timezone.localtime(start), timezone.localtime(end)
+        if all_day or end - start >= timedelta(hours=24):
+            days = workdays_by_week(start.date(), end.date())
+            buckets = {monday: WORKDAY_HOURS * count for monday, count in days.items()}
+        else:
+            hours = Decimal((end - start).total_seconds()) / 3600
+            buckets = {week_start(start.date()): hours}
+        for worker_id in workers:
+            _add(matrix, worker_id, buckets, SCHEDULED, first_week, last_week)
+
+
+def _logged_hours(matrix, first_week, last_week):
+    from timecard.models import TimeCard
+
+    fields = ['worker_id', 'date', 'start_time', 'end_time',
+              'lunch_start', 'lunch_end', 'break_minutes']
+    rows = TimeCard.objects.filter(
+        date__gte=first_week, date__lt=last_week + timedelta(days=7),
+    ).exclude(status='rejected').values(*fields)
+    for row in rows.iterator():
+        hours = TimeCard(**row).total_hours
+        matrix[row['worker_id'], week_start(row['date'])][LOGGED] += hours
+
+
+def build_load_matrix(first_week, last_week):
+    """Return ``{(worker_id, monday): [task, scheduled, logged]}`` hours"""
+    matrix = defaultdict(lambda: [Decimal('0')] * 3)
+    _task_hours(matrix, first_week, last_week)
+    _event_hours(matrix, first_week, last_week)
+    _logged_hours(matrix, first_week, last_week)
+    return matrix
+
+
+def rebuild_weekly_loads(weeks_back=4, weeks_ahead=52, today=None):
+    """Recompute ``WorkerWeeklyLoad`` for the window around ``today``
+
+    Rows in the window are replaced; rows outside it are left alone.
+    Returns the number of rows written.
+    """
+    current = week_start(today or timezone.localdate())
+    first_week = current - timedelta(weeks=weeks_back)
+    last_week = current + timedelta(weeks=weeks_ahead)
+    matrix = build_load_matrix(first_week, last_week)
+
+    quantum = Decimal('0.01')
+    rows = [
+        WorkerWeeklyLoad(
+            worker_id=worker_id,
+            week_start=monday,
+            task_hours=hours[TASK].quantize(quantum),
+            scheduled_hours=hours[SCHEDULED].quantize(quantum),
+            logged_hours=hours[LOGGED].quantize(quantum),
+        )
+        for (worker_id, monday), hours in matrix.items()
+        if any(hours)
+    ]
+    with transaction.atomic():
+        WorkerWeeklyLoad.objects.filter(
+            week_start__gte=first_week, week_start__lte=last_week,
+        ).delete()
+        WorkerWeeklyLoad.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def load_bucket(hours):
+    if hours > WEEKLY_CAPACITY_HOURS:
+        return 'overloaded'
+    if hours < UNDERUTILIZED_HOURS:
+        return 'underutilized'
+    return 'optimal'
+
+
+def workload_distribution(week=None):
+    """Active workers grouped by load for ``week`` (default: this week)
+
+    Returns ``{'overloaded_members', 'underutilized_members',
+    'optimal_load_members'}``, each a list of ``{'worker', 'hours'}`` sorted by
+    hours, from two queries.
+    """
+    monday = week_start(week or timezone.localdate())
+    loads = {
+        load.worker_id: load.load_hours
+        for load in WorkerWeeklyLoad.objects.filter(week_start=monday)
+    }
+    buckets = {'overloaded': [], 'underutilized': [], 'optimal': []}
+    for worker in Worker.objects.filter(is_active=True):
+        hours = loads.get(worker.pk, Decimal('0'))
+        buckets[load_bucket(hours)].append({'worker': worker, 'hours': hours})
+    for members in buckets.values():
+        members.sort(key=lambda member: member['hours'], reverse=True)
+    return {
+        'week_start': monday,
+        'overloaded_members': buckets['overloaded'],
+        'underutilized_members': buckets['underutilized'],
+        'optimal_load_members': buckets['optimal'],
+    }
+
+
+def capacity_heatmap(first_week=None, weeks=12, workers=None):
+    """Load hours per worker per week as ``{'weeks': [...], 'rows': [...]}``
+
+    Each row is ``{'worker', 'hours': [...], 'buckets': [...]}`` aligned with
+    ``weeks``; weeks without a stored row count as zero hours.
+    """
+    first_week = week_start(first_week or timezone.localdate())
+    mondays = [first_week + timedelta(weeks=offset) for offset in range(weeks)]
+    if workers is None:
+        workers = Worker.objects.filter(is_active=True)
+
+    loads = WorkerWeeklyLoad.objects.filter(
+        week_start__gte=mondays[0], week_start__lte=mondays[-1],
+    )
+    if hasattr(workers, 'values'):
+        loads = loads.filter(worker__in=workers.values('pk'))
+    hours = {(load.worker_id, load.week_start): load.load_hours for load in loads}
+
+    rows = []
+    for worker in workers:
+        week_hours = [hours.get((worker.pk, monday), Decimal('0')) for monday in mondays]
+        rows.append({
+            'worker': worker,
+            'hours': week_hours,
+            'buckets': [load_bucket(value) for value in week_hours],
+        })
+    return {'weeks': mondays, 'rows': rows}
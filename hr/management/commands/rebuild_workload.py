@@ -0,0 +1,28 @@
+"""
+rebuild_workload.py - Recompute the per-worker weekly load table used by the
+team workload and capacity reports. Meant to run nightly from cron.
+"""
+
+from django.core.management.base import BaseCommand
+
+from hr.capacity import rebuild_weekly_loads
+
+
+class Command(BaseCommand):
+    help = 'Rebuild WorkerWeeklyLoad rows from tasks, schedule events and timecards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--weeks-back', type=int, default=4,
+            help='Past weeks to recompute (default: 4)',
+        )
+        parser.add_argument(
+            '--weeks-ahead', type=int, default=52,
+            help='Future weeks to recompute (default: 52)',
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_weekly_loads(
+            weeks_back=options['weeks_back'], weeks_ahead=options['weeks_ahead'],
+        )
+        self.stdout.write(f'Stored {count} weekly load rows.')
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.13 on 2026-10-19 12:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_worker_roles(apps, schema_editor):
+    Worker = apps.get_model("hr", "Worker")
+    WorkerRole = apps.get_model("hr", "WorkerRole")
+
+    rows = []
+    for worker_id, roles in Worker.objects.values_list("id", "roles").iterator():
+        seen = set()
+        for order, role in enumerate(roles or []):
+            if role and role not in seen:
+                seen.add(role)
+                rows.append(WorkerRole(worker_id=worker_id, role=role, sort_order=order))
+    WorkerRole.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0002_alter_worker_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(max_length=50)),
+                ('sort_order', models.PositiveSmallIntegerField(default=0, help_text="Position in the worker's roles list (0 = primary role)")),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='role_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['role', 'worker'], name='hr_workerro_role_48e454_idx')],
+                'unique_together': {('worker', 'role')},
+            },
+        ),
+        migrations.RunPython(backfill_worker_roles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.13 on 2026-10-19 12:22
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('company', '0004_businessapplication_company_business_apps'),
+        ('hr', '0003_worker_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(django.db.models.functions.text.Upper('first_name'), name='hr_worker_first_name_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(django.db.models.functions.text.Upper('last_name'), name='hr_worker_last_name_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='hr_worker_email_upper'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.13 on 2026-10-19 13:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0004_worker_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerWeeklyLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField(help_text='Monday of the week')),
+                ('task_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('scheduled_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('logged_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_loads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['week_start', 'worker'], name='hr_workerwe_week_st_03aa2c_idx')],
+                'unique_together': {('worker', 'week_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.13 on 2026-10-19 14:03
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """AddIndex that only touches the database on PostgreSQL
+
+    text_pattern_ops is a PostgreSQL operator class; other backends (the
+    SQLite test database) keep the model state but get no index.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('company', '0004_businessapplication_company_business_apps'),
+        ('hr', '0005_workerweeklyload'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='worker',
+            name='hr_worker_first_name_upper',
+        ),
+        migrations.RemoveIndex(
+            model_name='worker',
+            name='hr_worker_last_name_upper',
+        ),
+        migrations.RemoveIndex(
+            model_name='worker',
+            name='hr_worker_email_upper',
+        ),
+        AddPostgresIndex(
+            model_name='worker',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='text_pattern_ops'), name='hr_worker_first_name_like'),
+        ),
+        AddPostgresIndex(
+            model_name='worker',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='text_pattern_ops'), name='hr_worker_last_name_like'),
+        ),
+        AddPostgresIndex(
+            model_name='worker',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='text_pattern_ops'), name='hr_worker_email_like'),
+        ),
+    ]
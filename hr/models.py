@@ -1,6 +1,8 @@
 # hr/models.py - Universal HR Management Model
 
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.contrib.auth.models import (BaseUserManager, AbstractBaseUser, Group, Permission)
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
@@ -224,6 +226,12 @@ class WorkerManager(BaseUserManager):
         extra_fields.setdefault('is_superuser', True)
         return self.create_user(email, password, **extra_fields)
 
+    def with_role(self, *roles):
+        """Workers with any of ``roles`` in their roles list (indexed lookup)"""
+        return self.filter(
+            id__in=WorkerRole.objects.filter(role__in=roles).values('worker_id')
+        )
+
 class Worker(AbstractBaseUser, UUIDModel, TimeStampedModel):
     """Universal worker/employee model"""
     
@@ -398,7 +406,26 @@ class Worker(AbstractBaseUser, UUIDModel, TimeStampedModel):
 
     @property
     def role(self):
-        """Primary role for backwards compatibility."""
+        """Primary role for backwards compatibility.
+
+        The resolved value is cached on the instance and recomputed only
+        when one of the fields it depends on changes.
+        """
+        key = (
+            tuple(self.roles or ()),
+            self.is_superuser,
+            self.is_admin,
+            self.is_staff,
+            self.position_id,
+        )
+        cached = self.__dict__.get('_resolved_role')
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        role = self._resolve_role()
+        self.__dict__['_resolved_role'] = (key, role)
+        return role
+
+    def _resolve_role(self):
         if self.roles:
             return self.roles[0]
         if self.is_superuser or self.is_admin:
@@ -423,6 +450,33 @@ class Worker(AbstractBaseUser, UUIDModel, TimeStampedModel):
             return False
         return role_name in self.roles or self.role == role_name
 
+    def sync_role_entries(self):
+        """Mirror the ``roles`` list into WorkerRole rows"""
+        wanted = {}
+        for order, role in enumerate(self.roles or []):
+            if role:
+                wanted.setdefault(role, order)
+        existing = dict(
+            self.role_entries.values_list('role', 'sort_order')
+        )
+        stale = [role for role in existing if role not in wanted]
+        if stale:
+            self.role_entries.filter(role__in=stale).delete()
+
+        WorkerRole.objects.bulk_create([
+            WorkerRole(worker=self, role=role, sort_order=order)
+            for role, order in wanted.items() if role not in existing
+        ])
+        for role, order in wanted.items():
+            if role in existing and existing[role] != order:
+                self.role_entries.filter(role=role).update(sort_order=order)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'roles' in update_fields:
+            self.sync_role_entries()
+
     @property
     def is_employee(self):
         """Generic employee role used for most workers."""
@@ -495,6 +549,15 @@ class Worker(AbstractBaseUser, UUIDModel, TimeStampedModel):
             models.Index(fields=['department']),
             models.Index(fields=['manager']),
             models.Index(fields=['employee_id']),
+            # Case-insensitive prefix search (owner autocomplete): __istartswith
+            # runs as UPPER(col) LIKE 'X%', which needs text_pattern_ops under
+            # a non-C collation. PostgreSQL only; see migration 0006.
+            models.Index(OpClass(Upper('first_name'), name='text_pattern_ops'),
+                         name='hr_worker_first_name_like'),
+            models.Index(OpClass(Upper('last_name'), name='text_pattern_ops'),
+                         name='hr_worker_last_name_like'),
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'),
+                         name='hr_worker_email_like'),
         ]
         permissions = [
             ("view_compensation", "Can view compensation information"),
@@ -633,6 +696,33 @@ class Worker(AbstractBaseUser, UUIDModel, TimeStampedModel):
             'certifications': expiring_certs
         }
 
+class WorkerRole(models.Model):
+    """Normalized, indexed copy of ``Worker.roles``.
+
+    ``Worker.roles`` stays the source of truth; these rows are rewritten by
+    ``Worker.save()`` so role lookups can use an index on every database.
+    """
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name='role_entries'
+    )
+    role = models.CharField(max_length=50)
+    sort_order = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Position in the worker\'s roles list (0 = primary role)'
+    )
+
+    class Meta:
+        app_label = 'hr'
+        unique_together = ['worker', 'role']
+        indexes = [
+            models.Index(fields=['role', 'worker']),
+        ]
+
+    def __str__(self):
+        return f"{self.worker} - {self.role}"
+
 class WorkerClearance(TimeStampedModel):
     """Junction table for worker clearances with dates"""
     worker = models.ForeignKey(Worker, on_delete=models.CASCADE)
@@ -861,6 +951,42 @@ class PerformanceReview(TimeStampedModel):
     def __str__(self):
         return f"{self.worker.get_full_name()} - {self.review_type} ({self.review_date})"
 
+class WorkerWeeklyLoad(models.Model):
+    """Precomputed hours per worker per week (Monday start).
+
+    Rebuilt nightly by ``hr.capacity.rebuild_weekly_loads`` from assigned
+    tasks, scheduled events and timecards so workload reports are lookups.
+    """
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name='weekly_loads'
+    )
+    week_start = models.DateField(help_text='Monday of the week')
+    task_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    scheduled_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    logged_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'hr'
+        unique_together = ['worker', 'week_start']
+        indexes = [
+            models.Index(fields=['week_start', 'worker']),
+        ]
+
+    def __str__(self):
+        return f"{self.worker} - week of {self.week_start}"
+
+    @property
+    def planned_hours(self):
+        return self.task_hours + self.scheduled_hours
+
+    @property
+    def load_hours(self):
+        """Planned hours, or logged hours when more time was actually booked"""
+        return max(self.planned_hours, self.logged_hours)
+
 # Default data creation functions
 def create_default_hr_data():
     """Create default HR data for different business types"""
@@ -1,3 +1,126 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from .models import WorkerRole
+
+
+class WorkerRoleTests(TestCase):
+    def setUp(self):
+        self.User = get_user_model()
+        self.worker = self.User.objects.create_user(
+            email="worker@example.com", password="pass", employee_id="E1",
+            roles=["supervisor", "worker"],
+        )
+
+    def test_roles_are_mirrored_on_save(self):
+        self.assertEqual(
+            set(self.worker.role_entries.values_list("role", flat=True)),
+            {"supervisor", "worker"},
+        )
+
+        self.worker.role = "project_manager"
+        self.worker.roles.remove("worker")
+        self.worker.save()
+        self.assertEqual(
+            dict(self.worker.role_entries.values_list("role", "sort_order")),
+            {"project_manager": 0, "supervisor": 1},
+        )
+
+    def test_with_role_lookup(self):
+        self.User.objects.create_user(
+            email="pm@example.com", password="pass", employee_id="E2",
+            roles=["project_manager"],
+        )
+        self.assertEqual(
+            list(self.User.objects.with_role("worker")), [self.worker]
+        )
+        self.assertEqual(self.User.objects.with_role("worker", "project_manager").count(), 2)
+        self.assertFalse(WorkerRole.objects.filter(role="admin").exists())
+
+    def test_role_is_cached_until_inputs_change(self):
+        self.assertEqual(self.worker.role, "supervisor")
+        with self.assertNumQueries(0):
+            self.assertTrue(self.worker.has_role("supervisor"))
+            self.assertTrue(self.worker.is_supervisor)
+
+        self.worker.roles = []
+        self.worker.is_staff = True
+        self.assertEqual(self.worker.role, "staff")
+
+
+class WorkloadCapacityTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import Group
+        from todo.models import TaskList
+
+        self.worker = get_user_model().objects.create_user(
+            email="crew@example.com", password="pass", employee_id="E1",
+        )
+        group = Group.objects.create(name="Crew")
+        self.task_list = TaskList.objects.create(
+            group=group, name="Jobs", slug="jobs", created_by=self.worker,
+        )
+        # Monday 2 March 2026
+        from datetime import date
+
+        self.monday = date(2026, 3, 2)
+
+    def test_spread_hours_by_week(self):
+        from datetime import timedelta
+        from decimal import Decimal
+
+        from .capacity import spread_hours, workdays_by_week
+
+        friday_next = self.monday + timedelta(days=11)
+        self.assertEqual(
+            workdays_by_week(self.monday + timedelta(days=3), friday_next),
+            {self.monday: 2, self.monday + timedelta(weeks=1): 5},
+        )
+        self.assertEqual(
+            spread_hours(Decimal("14"), self.monday + timedelta(days=3), friday_next),
+            {self.monday: Decimal("4"), self.monday + timedelta(weeks=1): Decimal("10")},
+        )
+
+    def test_rebuild_and_buckets(self):
+        from datetime import datetime, time, timedelta
+        from decimal import Decimal
+
+        from django.utils import timezone
+        from schedule.models import Calendar, Event
+        from timecard.models import TimeCard
+        from todo.models import Task
+
+        from .capacity import capacity_heatmap, rebuild_weekly_loads, workload_distribution
+        from .models import WorkerWeeklyLoad
+
+        Task.objects.create(
+            created_by=self.worker, assigned_to=self.worker, title="Install",
+            task_list=self.task_list, allotted_time=Decimal("60"), team_size=2,
+            start_date=self.monday, due_date=self.monday + timedelta(days=4),
+        )
+        start = timezone.make_aware(datetime.combine(self.monday, time(8)))
+        event = Event.objects.create(
+            title="Site visit", start=start, end=start + timedelta(hours=12),
+            calendar=Calendar.objects.create(name="Cal", slug="cal", owner=self.worker),
+            creator=self.worker,
+        )
+        event.workers.add(self.worker)
+        TimeCard.objects.bulk_create([
+            TimeCard(worker=self.worker, date=self.monday - timedelta(weeks=1),
+                     start_time=time(8), end_time=time(17), break_minutes=60),
+        ])
+
+        self.assertEqual(rebuild_weekly_loads(today=self.monday), 2)
+        load = WorkerWeeklyLoad.objects.get(week_start=self.monday)
+        self.assertEqual(load.task_hours, Decimal("60.00"))
+        self.assertEqual(load.scheduled_hours, Decimal("12.00"))
+        self.assertEqual(
+            WorkerWeeklyLoad.objects.get(week_start=self.monday - timedelta(weeks=1)).logged_hours,
+            Decimal("8.00"),
+        )
+
+        workload = workload_distribution(self.monday)
+        self.assertEqual([m["worker"] for m in workload["overloaded_members"]], [self.worker])
+
+        heatmap = capacity_heatmap(self.monday - timedelta(weeks=1), weeks=2)
+        self.assertEqual(heatmap["rows"][0]["buckets"], ["underutilized", "overloaded"])
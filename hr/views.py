@@ -17,19 +17,28 @@ from .models import (
 )
 from .forms import RegisterForm
 from company.models import Company, Department, Office
+from home.stats import StatsQuery
 
 
 @login_required
 def index(request):
     """HR Dashboard view"""
-    # Get basic statistics
-    total_workers = Worker.objects.filter(is_active=True).count()
-    pending_time_off = TimeOffRequest.objects.filter(approval_status='pending').count()
-    expiring_clearances = WorkerClearance.objects.filter(
+    # Get basic statistics (one aggregate per table, cached until it changes)
+    today = date.today()
+    total_workers = StatsQuery(
+        'hr_workers', Worker.objects.all(), tags=('workers',)
+    ).count('total', is_active=True).get()['total']
+    pending_time_off = StatsQuery(
+        'hr_time_off', TimeOffRequest.objects.all(), tags=('time_off',)
+    ).count('pending', approval_status='pending').get()['pending']
+    expiring_clearances = StatsQuery(
+        f'hr_clearances:{today.isoformat()}', WorkerClearance.objects.all(), tags=('clearances',)
+    ).count(
+        'expiring',
         is_active=True,
-        expiration_date__lte=date.today() + timedelta(days=30),
-        expiration_date__gte=date.today()
-    ).count()
+        expiration_date__lte=today + timedelta(days=30),
+        expiration_date__gte=today,
+    ).get()['expiring']
     
     # Recent hires (last 30 days)
     recent_hires = Worker.objects.filter(
@@ -0,0 +1,72 @@
+"""Geohash helpers for the location map tile API."""
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # ~5m cells; stored on Location.geohash
+
+# Map zoom level -> geohash prefix length used as the cluster grid.
+# Cells get roughly as wide as a few hundred screen pixels at each zoom.
+ZOOM_CLUSTER_PRECISION = [
+    (3, 1),
+    (5, 2),
+    (8, 3),
+    (10, 4),
+    (13, 5),
+    (15, 6),
+]
+
+# At or above this zoom level tiles always return raw points
+POINTS_MIN_ZOOM = 16
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of ``latitude``/``longitude`` at ``precision`` chars."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude = float(latitude)
+    longitude = float(longitude)
+
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cluster_precision_for_zoom(zoom):
+    """Geohash prefix length used to cluster points at ``zoom``."""
+    for max_zoom, precision in ZOOM_CLUSTER_PRECISION:
+        if zoom <= max_zoom:
+            return precision
+    return ZOOM_CLUSTER_PRECISION[-1][1]
+
+
+def snap_bbox(west, south, east, north, zoom):
+    """Expand a bounding box outward onto the slippy-map tile grid for ``zoom``.
+
+    Snapping makes nearby viewports share a cache key, so panning a little
+    reuses the same tile response.
+    """
+    step = 360.0 / (2 ** max(zoom, 0))
+    snap_down = lambda value: (value // step) * step  # noqa: E731
+    snap_up = lambda value: -((-value) // step) * step  # noqa: E731
+    return (
+        max(snap_down(west), -180.0),
+        max(snap_down(south), -90.0),
+        min(snap_up(east), 180.0),
+        min(snap_up(north), 90.0),
+    )
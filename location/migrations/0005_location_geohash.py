@@ -0,0 +1,35 @@
+# Generated by Django 5.2.13 on 2026-10-19 12:11
+
+from django.db import migrations, models
+
+
+def backfill_geohash(apps, schema_editor):
+    from location.geo import encode_geohash
+
+    Location = apps.get_model("location", "Location")
+    batch = []
+    located = Location.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    for location in located.only("id", "latitude", "longitude").iterator():
+        location.geohash = encode_geohash(location.latitude, location.longitude)
+        batch.append(location)
+        if len(batch) >= 1000:
+            Location.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    if batch:
+        Location.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0004_add_location_logistics_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of the coordinates, used to cluster map tiles', max_length=12),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -9,6 +9,8 @@ import uuid
 # Import from your modernized client app
 from client.models import Client, Address, Contact, TimeStampedModel, UUIDModel
 
+from .terminology import get_business_category, get_choices
+
 # Dynamic configuration models for any business type
 class BusinessCategory(TimeStampedModel):
     """Define different business categories (Construction, Entertainment, Investigation, etc.)"""
@@ -171,18 +173,12 @@ class ConfigurableChoice(TimeStampedModel):
 
 # Helper function to get dynamic choices
 def get_dynamic_choices(choice_type, category=None):
-    """Get choices for a field type, optionally filtered by business category"""
-    queryset = ConfigurableChoice.objects.filter(
-        choice_type=choice_type,
-        is_active=True
-    )
-    
-    if category:
-        queryset = queryset.filter(
-            models.Q(category=category) | models.Q(applicable_to_all=True)
-        )
-    
-    return [(choice.value, choice.display_name) for choice in queryset.order_by('sort_order', 'display_name')]
+    """Get choices for a field type, optionally filtered by business category
+
+    ``category`` may be a BusinessCategory or its pk. Results come from the
+    in-process registry in ``location.terminology``.
+    """
+    return get_choices(choice_type, category or None)
 
 class LocationType(TimeStampedModel):
     """Define different types of locations - now business agnostic"""
@@ -261,6 +257,14 @@ class Location(UUIDModel, TimeStampedModel):
         help_text='Longitude coordinate'
     )
     
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Geohash of the coordinates, used to cluster map tiles'
+    )
+    
     # Maps integration
     google_maps_url = models.URLField(
         blank=True, 
@@ -377,22 +381,37 @@ class Location(UUIDModel, TimeStampedModel):
     def get_absolute_url(self):
         return reverse('location:location-detail', args=[str(self.id)])
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'latitude', 'longitude'} & set(update_fields):
+            self.geohash = self.compute_geohash()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+    
+    def compute_geohash(self):
+        """Geohash for the current coordinates ('' when not geocoded)"""
+        from .geo import encode_geohash
+        if self.latitude is None or self.longitude is None:
+            return ''
+        return encode_geohash(self.latitude, self.longitude)
+    
     # Dynamic choice methods
     def get_available_statuses(self):
         """Get available statuses for this location's business category"""
-        return get_dynamic_choices('location_status', self.business_category)
+        return get_dynamic_choices('location_status', self.business_category_id)
     
     def get_available_location_types(self):
         """Get available location types for this business category"""
-        return get_dynamic_choices('location_type', self.business_category)
+        return get_dynamic_choices('location_type', self.business_category_id)
     
     def get_available_access_requirements(self):
         """Get available access requirements for this business category"""
-        return get_dynamic_choices('access_requirement', self.business_category)
+        return get_dynamic_choices('access_requirement', self.business_category_id)
     
     def get_available_work_hours(self):
         """Get available work hours for this business category"""
-        return get_dynamic_choices('work_hours', self.business_category)
+        return get_dynamic_choices('work_hours', self.business_category_id)
     
     @property
     def primary_address(self):
@@ -446,15 +465,17 @@ class Location(UUIDModel, TimeStampedModel):
     @property
     def project_term(self):
         """Get the business-specific term for projects"""
-        if self.business_category:
-            return self.business_category.project_term
+        category = get_business_category(self.business_category_id)
+        if category:
+            return category.project_term
         return "Projects"
     
     @property
     def project_term_singular(self):
         """Get the business-specific singular term for projects"""
-        if self.business_category:
-            return self.business_category.project_term_singular
+        category = get_business_category(self.business_category_id)
+        if category:
+            return category.project_term_singular
         return "Project"
     
     def calculate_total_contract_value(self):
@@ -526,7 +547,7 @@ class LocationDocument(TimeStampedModel):
     
     def get_available_document_types(self):
         """Get available document types for this location's business category"""
-        return get_dynamic_choices('document_type', self.location.business_category)
+        return get_dynamic_choices('document_type', self.location.business_category_id)
 
 class LocationNote(TimeStampedModel):
     """Notes and updates about a location - configurable for any business type"""
@@ -572,11 +593,11 @@ class LocationNote(TimeStampedModel):
     
     def get_available_note_types(self):
         """Get available note types for this location's business category"""
-        return get_dynamic_choices('note_type', self.location.business_category)
+        return get_dynamic_choices('note_type', self.location.business_category_id)
     
     def get_available_priority_levels(self):
         """Get available priority levels for this location's business category"""
-        return get_dynamic_choices('priority_level', self.location.business_category)
+        return get_dynamic_choices('priority_level', self.location.business_category_id)
 
 # Default data creation function
 def create_default_business_categories():
@@ -686,10 +707,52 @@ def create_default_business_categories():
             )
 
 # Management functions
-def update_all_location_totals():
-    """Update contract totals for all locations"""
-    for location in Location.objects.all():
-        location.calculate_total_contract_value()
+LOCATION_TOTALS_LAST_RUN_KEY = 'location_totals_last_run'
+
+
+def update_all_location_totals(incremental=False, batch_size=1000):
+    """Update contract totals for all locations
+
+    Sums ``Project.contract_value`` per location in one grouped query and
+    writes changed totals back with ``bulk_update``. With
+    ``incremental=True`` only locations linked to projects saved since the
+    previous run are recomputed. Returns the number of locations updated.
+    """
+    from django.core.cache import cache
+    from django.utils import timezone
+    from project.models import Project  # Avoid circular import
+
+    started = timezone.now()
+    links = Project.locations.through.objects.all()
+    locations = Location.objects.all()
+    last_run = cache.get(LOCATION_TOTALS_LAST_RUN_KEY) if incremental else None
+    if last_run is not None:
+        changed = links.filter(project__updated_at__gte=last_run).values('location_id')
+        links = links.filter(location_id__in=changed)
+        locations = locations.filter(id__in=changed)
+
+    totals = dict(
+        links.values('location_id')
+        .annotate(total=models.Sum('project__contract_value'))
+        .order_by()
+        .values_list('location_id', 'total')
+    )
+
+    updated = 0
+    pending = []
+    for location in locations.only('id', 'total_contract_value'):
+        total = totals.get(location.id) or Decimal('0.00')
+        if location.total_contract_value != total:
+            location.total_contract_value = total
+            pending.append(location)
+        if len(pending) >= batch_size:
+            updated += Location.objects.bulk_update(pending, ['total_contract_value'])
+            pending = []
+    if pending:
+        updated += Location.objects.bulk_update(pending, ['total_contract_value'])
+
+    cache.set(LOCATION_TOTALS_LAST_RUN_KEY, started, None)
+    return updated
 
 def get_locations_needing_followup():
     """Get locations with notes requiring follow-up"""
@@ -0,0 +1,31 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BusinessCategory, ConfigurableChoice, Location
+from .terminology import invalidate_terminology
+
+# Bumped whenever a Location changes so cached map tiles stop matching
+MAP_TILE_VERSION_KEY = 'location_map_tile_version'
+
+
+def invalidate_map_tiles():
+    cache.add(MAP_TILE_VERSION_KEY, 0, None)
+    try:
+        cache.incr(MAP_TILE_VERSION_KEY)
+    except ValueError:
+        cache.set(MAP_TILE_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, **kwargs):
+    invalidate_map_tiles()
+
+
+@receiver(post_save, sender=BusinessCategory)
+@receiver(post_delete, sender=BusinessCategory)
+@receiver(post_save, sender=ConfigurableChoice)
+@receiver(post_delete, sender=ConfigurableChoice)
+def terminology_changed(sender, **kwargs):
+    invalidate_terminology()
@@ -0,0 +1,101 @@
+"""Process-local registry of business terminology and configurable choices.
+
+BusinessCategory rows and ConfigurableChoice lists rarely change but are read
+for almost every label on project and location pages. Both are cached here in
+process memory. Saving or deleting either model bumps a shared version key, and
+each process drops its copies the next time it checks that key (at most every
+``VERSION_CHECK_INTERVAL`` seconds; the process that made the change clears
+immediately).
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+
+TERMINOLOGY_VERSION_KEY = 'business_terminology_version'
+VERSION_CHECK_INTERVAL = 5  # seconds
+
+_lock = threading.Lock()
+_state = {'version': None, 'checked_at': 0.0}
+_categories = {}
+_choices = {}
+
+
+def _category_key(category):
+    pk = getattr(category, 'pk', category)
+    return None if pk in (None, '') else str(pk)
+
+
+def _sync_version():
+    now = time.monotonic()
+    if _state['version'] is not None and now - _state['checked_at'] < VERSION_CHECK_INTERVAL:
+        return
+    version = cache.get_or_set(TERMINOLOGY_VERSION_KEY, 0, None)
+    with _lock:
+        if version != _state['version']:
+            _categories.clear()
+            _choices.clear()
+            _state['version'] = version
+        _state['checked_at'] = now
+
+
+def get_business_category(category):
+    """Return the cached BusinessCategory for ``category`` (instance or pk)"""
+    from .models import BusinessCategory
+
+    key = _category_key(category)
+    if key is None:
+        return None
+
+    _sync_version()
+    try:
+        return _categories[key]
+    except KeyError:
+        pass
+
+    resolved = BusinessCategory.objects.filter(pk=key).first()
+    with _lock:
+        _categories[key] = resolved
+    return resolved
+
+
+def get_choices(choice_type, category=None):
+    """Return ``[(value, display_name)]`` active choices of ``choice_type``
+
+    With a category, only choices of that category or those applicable to
+    all categories are included.
+    """
+    from django.db.models import Q
+    from .models import ConfigurableChoice
+
+    key = (choice_type, _category_key(category))
+    _sync_version()
+    try:
+        return list(_choices[key])
+    except KeyError:
+        pass
+
+    queryset = ConfigurableChoice.objects.filter(choice_type=choice_type, is_active=True)
+    if key[1] is not None:
+        queryset = queryset.filter(Q(category_id=key[1]) | Q(applicable_to_all=True))
+    choices = tuple(
+        queryset.order_by('sort_order', 'display_name').values_list('value', 'display_name')
+    )
+    with _lock:
+        _choices[key] = choices
+    return list(choices)
+
+
+def invalidate_terminology():
+    """Drop cached terminology and choices in every process"""
+    with _lock:
+        _categories.clear()
+        _choices.clear()
+        _state['version'] = None
+
+    cache.add(TERMINOLOGY_VERSION_KEY, 0, None)
+    try:
+        cache.incr(TERMINOLOGY_VERSION_KEY)
+    except ValueError:
+        cache.set(TERMINOLOGY_VERSION_KEY, 1, None)
@@ -1,3 +1,184 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from client.models import Client
+
+from .geo import encode_geohash, snap_bbox
+from .models import BusinessCategory, ConfigurableChoice, Location, get_dynamic_choices
+
+
+class LocationMapTileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_obj = Client.objects.create(company_name="Client")
+        self.url = reverse("location:map-tiles")
+
+    def _location(self, name, lat, lng, **kwargs):
+        return Location.objects.create(
+            client=self.client_obj,
+            name=name,
+            description="d",
+            latitude=Decimal(str(lat)),
+            longitude=Decimal(str(lng)),
+            **kwargs,
+        )
+
+    def test_encode_geohash(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(encode_geohash(-25.382708, -49.265506, 5), "6gkzw")
+
+    def test_geohash_follows_coordinates(self):
+        location = self._location("Site", 40.0, -105.0)
+        self.assertEqual(location.geohash, encode_geohash(40.0, -105.0))
+
+        location.latitude = Decimal("41.000000")
+        location.save(update_fields=["latitude"])
+        location.refresh_from_db()
+        self.assertEqual(location.geohash, encode_geohash(41.0, -105.0))
+
+    def test_snap_bbox_covers_viewport(self):
+        west, south, east, north = snap_bbox(-105.3, 39.6, -104.7, 40.1, 6)
+        self.assertLessEqual(west, -105.3)
+        self.assertLessEqual(south, 39.6)
+        self.assertGreaterEqual(east, -104.7)
+        self.assertGreaterEqual(north, 40.1)
+
+    def test_points_are_limited_to_bbox(self):
+        inside = self._location("Denver", 39.74, -104.99, status="active")
+        self._location("Boston", 42.36, -71.06)
+
+        response = self.client.get(
+            self.url, {"bbox": "-106,39,-104,41", "zoom": 8}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["type"], "points")
+        self.assertEqual([row["id"] for row in data["locations"]], [str(inside.pk)])
+        self.assertEqual(data["locations"][0]["url"], inside.get_absolute_url())
+
+    def test_dense_viewport_is_clustered(self):
+        for i in range(3):
+            self._location(f"Denver {i}", 39.74 + i * 0.001, -104.99)
+        self._location("Boston", 42.36, -71.06)
+
+        with mock.patch("location.views.MAP_TILE_POINT_LIMIT", 2):
+            data = self.client.get(
+                self.url, {"bbox": "-180,-85,180,85", "zoom": 3}
+            ).json()
+
+        self.assertEqual(data["type"], "clusters")
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(sorted(c["count"] for c in data["clusters"]), [1, 3])
+
+    def test_saving_location_invalidates_cached_tiles(self):
+        params = {"bbox": "-106,39,-104,41", "zoom": 8}
+        self.assertEqual(self.client.get(self.url, params).json()["total"], 0)
+        self._location("Denver", 39.74, -104.99)
+        self.assertEqual(self.client.get(self.url, params).json()["total"], 1)
+
+    def test_bbox_is_required(self):
+        response = self.client.get(self.url, {"zoom": 4})
+        self.assertEqual(response.status_code, 400)
+
+
+class TerminologyRegistryTests(TestCase):
+    def setUp(self):
+        from .terminology import invalidate_terminology
+
+        invalidate_terminology()
+        self.category = BusinessCategory.objects.create(
+            name="Entertainment", project_nickname="Events", project_nickname_singular="Event"
+        )
+        ConfigurableChoice.objects.create(
+            category=self.category, choice_type="location_status",
+            value="booked", display_name="Booked",
+        )
+
+    def test_choices_are_cached_until_changed(self):
+        self.assertEqual(
+            get_dynamic_choices("location_status", self.category), [("booked", "Booked")]
+        )
+        with self.assertNumQueries(0):
+            get_dynamic_choices("location_status", self.category.pk)
+
+        ConfigurableChoice.objects.create(
+            category=self.category, choice_type="location_status",
+            value="aired", display_name="Aired", sort_order=1,
+        )
+        self.assertEqual(
+            [value for value, _ in get_dynamic_choices("location_status", self.category)],
+            ["aired", "booked"],
+        )
+
+    def test_project_terms_resolve_once_per_list(self):
+        from project.models import Project
+
+        location = Location.objects.create(
+            client=Client.objects.create(company_name="Client"),
+            business_category=self.category, name="Venue", description="d",
+        )
+        for i in range(3):
+            Project.objects.create(job_number=f"P{i}", name="Show", primary_location=location)
+
+        with self.assertNumQueries(3):  # projects, category, choice list: once each
+            terms = [
+                (p.project_term, p.project_term_plural, p.get_available_statuses())
+                for p in Project.objects.with_business_category()
+            ]
+        self.assertEqual(terms, [("Event", "Events", [])] * 3)
+
+
+class LocationTotalsTests(TestCase):
+    def setUp(self):
+        from project.models import Project
+
+        cache.clear()
+        client = Client.objects.create(company_name="Client")
+        self.venue = Location.objects.create(client=client, name="Venue", description="d")
+        self.depot = Location.objects.create(client=client, name="Depot", description="d")
+        self.show = Project.objects.create(job_number="P1", name="Show", contract_value=100)
+        self.tour = Project.objects.create(job_number="P2", name="Tour", contract_value=40)
+        self.show.locations.add(self.venue, self.depot)
+        self.tour.locations.add(self.venue)
+
+    def test_totals_are_recomputed_in_bulk(self):
+        from .models import update_all_location_totals
+
+        with self.assertNumQueries(3):  # totals, locations, one bulk update
+            self.assertEqual(update_all_location_totals(), 2)
+
+        self.venue.refresh_from_db()
+        self.depot.refresh_from_db()
+        self.assertEqual(self.venue.total_contract_value, Decimal("140"))
+        self.assertEqual(self.depot.total_contract_value, Decimal("100"))
+
+    def test_incremental_run_only_recomputes_changed_locations(self):
+        from .models import update_all_location_totals
+
+        update_all_location_totals()
+        Location.objects.filter(pk=self.depot.pk).update(total_contract_value=1)
+        self.tour.contract_value = 60
+        self.tour.save()
+
+        self.assertEqual(update_all_location_totals(incremental=True), 1)
+
+        self.venue.refresh_from_db()
+        self.depot.refresh_from_db()
+        self.assertEqual(self.venue.total_contract_value, Decimal("160"))
+        self.assertEqual(self.depot.total_contract_value, Decimal("1"))
+
+    def test_project_rollup_counts_each_project_once(self):
+        from project.models import Project
+
+        with self.assertNumQueries(1):
+            rollup = Project.objects.for_locations(Location.objects.all()).contract_rollup()
+        self.assertEqual(rollup["total"], Decimal("140"))
+        self.assertEqual(rollup["count"], 2)
+        self.assertEqual(rollup["average"], Decimal("70"))
 
-# Create your tests here.
+        client_rollup = Project.objects.for_client(self.venue.client).contract_rollup()
+        self.assertEqual(client_rollup["total"], Decimal("140"))
@@ -55,6 +55,7 @@ urlpatterns = [
     # Map views
     path('map/', views.locations_map_view, name='locations-map'),
     path('api/map-data/', views.location_map_data, name='map-data'),
+    path('api/map-tiles/', views.location_map_tiles, name='map-tiles'),
     
     # AJAX endpoints
     path('ajax/location-types/', views.get_location_types, name='ajax-location-types'),
@@ -10,7 +10,10 @@ from django.views.generic import (
 )
 from django.urls import reverse, reverse_lazy
 from django.contrib import messages
-from django.db.models import Q, Sum, Count
+from django.db.models import Q, Sum, Count, Avg
+from django.db.models.functions import Substr
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
 from django.http import JsonResponse, HttpResponse
 from django.core.paginator import Paginator
 from django.contrib.auth.mixins import (
@@ -33,6 +36,8 @@ from .models import (
     LocationNote,
     get_dynamic_choices as model_get_dynamic_choices,
 )
+from .geo import POINTS_MIN_ZOOM, cluster_precision_for_zoom, snap_bbox
+from .signals import MAP_TILE_VERSION_KEY
 from .forms import (
     LocationForm,
     LocationDocumentForm,
@@ -61,9 +66,9 @@ def location_dashboard(request):
     # Get contract value total (if projects exist)
     try:
         from project.models import Project
-        total_contract_value = Project.objects.filter(
-            locations__in=locations
-        ).aggregate(total=Sum('contract_value'))['total'] or 0
+        total_contract_value = Project.objects.for_locations(
+            locations.values('id')
+        ).contract_rollup()['total']
     except ImportError:
         total_contract_value = 0
     
@@ -535,6 +540,115 @@ def location_map_data(request):
     return JsonResponse({'locations': map_data})
 
 
+# Tile requests with more matching locations than this are clustered
+MAP_TILE_POINT_LIMIT = 500
+MAP_TILE_CACHE_TIMEOUT = 60 * 10
+
+
+def location_map_tiles(request):
+    """Return map data for one viewport: raw points, or clusters when dense.
+
+    Query parameters: ``bbox`` (``west,south,east,north`` in degrees),
+    ``zoom`` (map zoom level) and optional ``status`` and
+    ``business_category`` filters. The bounding box is snapped to the tile
+    grid for the zoom level and responses are cached per tile.
+    """
+    try:
+        west, south, east, north = (
+            float(value) for value in request.GET['bbox'].split(',')
+        )
+        zoom = min(max(int(request.GET.get('zoom', 0)), 0), 22)
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {'error': 'bbox=west,south,east,north and zoom are required'},
+            status=400,
+        )
+
+    status = request.GET.get('status', '')
+    business_category = request.GET.get('business_category', '')
+    bbox = snap_bbox(west, south, east, north, zoom)
+
+    version = cache.get_or_set(MAP_TILE_VERSION_KEY, 0, None)
+    cache_key = 'location_map_tile:{}:{}:{}:{}:{}'.format(
+        version, zoom, ','.join('%.6f' % value for value in bbox),
+        status, business_category,
+    )
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = _build_map_tile(bbox, zoom, status, business_category)
+        cache.set(cache_key, payload, MAP_TILE_CACHE_TIMEOUT)
+
+    response = JsonResponse(payload)
+    patch_cache_control(response, private=True, max_age=60)
+    return response
+
+
+def _build_map_tile(bbox, zoom, status, business_category):
+    west, south, east, north = bbox
+    locations = Location.objects.filter(
+        latitude__gte=south,
+        latitude__lte=north,
+    ).exclude(geohash='').order_by()
+
+    if west <= east:
+        locations = locations.filter(longitude__gte=west, longitude__lte=east)
+    else:
+        # Viewport crosses the antimeridian
+        locations = locations.filter(Q(longitude__gte=west) | Q(longitude__lte=east))
+
+    if status:
+        locations = locations.filter(status=status)
+    if business_category:
+        locations = locations.filter(business_category_id=business_category)
+
+    total = locations.count()
+    payload = {'zoom': zoom, 'bbox': list(bbox), 'total': total}
+
+    if zoom >= POINTS_MIN_ZOOM or total <= MAP_TILE_POINT_LIMIT:
+        # Build detail URLs from one reversed template instead of per row
+        placeholder = '00000000-0000-0000-0000-000000000000'
+        url_template = reverse('location:location-detail', args=[placeholder])
+        rows = locations.values(
+            'id', 'name', 'client__company_name', 'latitude', 'longitude',
+            'status', 'business_category_id', 'business_category__name',
+        )[:MAP_TILE_POINT_LIMIT]
+        payload['type'] = 'points'
+        payload['truncated'] = total > MAP_TILE_POINT_LIMIT
+        payload['locations'] = [
+            {
+                'id': str(row['id']),
+                'name': row['name'],
+                'client': row['client__company_name'],
+                'lat': float(row['latitude']),
+                'lng': float(row['longitude']),
+                'status': row['status'],
+                'business_category': row['business_category__name'] or '',
+                'business_category_id': row['business_category_id'],
+                'url': url_template.replace(placeholder, str(row['id'])),
+            }
+            for row in rows
+        ]
+        return payload
+
+    precision = cluster_precision_for_zoom(zoom)
+    cells = (
+        locations.annotate(cell=Substr('geohash', 1, precision))
+        .values('cell')
+        .annotate(count=Count('id'), lat=Avg('latitude'), lng=Avg('longitude'))
+    )
+    payload['type'] = 'clusters'
+    payload['clusters'] = [
+        {
+            'geohash': cell['cell'],
+            'count': cell['count'],
+            'lat': float(cell['lat']),
+            'lng': float(cell['lng']),
+        }
+        for cell in cells
+    ]
+    return payload
+
+
 def locations_map_view(request):
     """Display all locations on a map"""
     return render(request, 'location/locations_map.html')
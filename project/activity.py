@@ -0,0 +1,144 @@
+"""Recording and reading the project activity stream.
+
+Entries are appended by the handlers in ``project.signals`` and never
+updated. Reads walk the ``(project, occurred_at, id)`` index newest first
+with an opaque keyset cursor, so every page of a long-running project's
+history costs the same single range scan.
+"""
+
+import base64
+from datetime import datetime, time
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Project, ProjectActivity
+
+ACTIVITY_PAGE_SIZE = 50
+DESCRIPTION_LENGTH = 500
+
+
+def source_label(instance):
+    return f"{instance._meta.app_label}.{instance._meta.model_name}"
+
+
+def record_activity(project_id, kind, title, description="", actor=None,
+                    occurred_at=None, source=None):
+    """Append one activity entry; ``source`` is the model instance it describes"""
+    if not project_id:
+        return None
+    description = description or ""
+    if len(description) > DESCRIPTION_LENGTH:
+        description = description[: DESCRIPTION_LENGTH - 3] + "..."
+    return ProjectActivity.objects.create(
+        project_id=project_id,
+        kind=kind,
+        title=title[:255],
+        description=description,
+        actor=actor,
+        occurred_at=occurred_at or timezone.now(),
+        source=source_label(source) if source is not None else "",
+        source_id=str(source.pk) if source is not None else "",
+    )
+
+
+def encode_cursor(entry):
+    token = f"{entry.occurred_at.isoformat()}|{entry.pk}"
+    return base64.urlsafe_b64encode(token.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return ``(occurred_at, id)`` for a cursor, or ``None`` if it is invalid"""
+    try:
+        occurred_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    occurred_at = parse_datetime(occurred_at)
+    if occurred_at is None:
+        return None
+    return occurred_at, pk
+
+
+def activity_page(project, cursor=None, limit=ACTIVITY_PAGE_SIZE):
+    """Return ``(entries, next_cursor)`` for the entries older than ``cursor``
+
+    ``next_cursor`` is ``None`` on the last page. An invalid cursor reads the
+    first page.
+    """
+    queryset = ProjectActivity.objects.filter(project=project).select_related("actor")
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        occurred_at, pk = position
+        queryset = queryset.filter(
+            Q(occurred_at__lt=occurred_at) | Q(occurred_at=occurred_at, id__lt=pk)
+        )
+
+    # One extra row tells us whether another page exists
+    entries = list(queryset.order_by("-occurred_at", "-id")[: limit + 1])
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    return entries[:limit], next_cursor
+
+
+def recent_activity(project, limit=10):
+    return activity_page(project, limit=limit)[0]
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def backfill_activity():
+    """Seed the stream for projects that have no entries yet
+
+    Recreates what the timeline showed before the log existed: project
+    creation, change requests and approvals, and completed milestones.
+    Returns the number of entries written.
+    """
+    projects = Project.objects.filter(
+        ~Exists(ProjectActivity.objects.filter(project=OuterRef("pk")))
+    ).prefetch_related("changes", "milestones")
+
+    entries = []
+    for project in projects.iterator(chunk_size=200):
+        entries.append(ProjectActivity(
+            project=project, kind="project_created", title="Project Created",
+            description=f"Project {project.job_number} created",
+            occurred_at=project.created_at, source="project.project",
+            source_id=str(project.pk),
+        ))
+        for change in project.changes.all():
+            title = f"{change.change_type.title()} Request"
+            entries.append(ProjectActivity(
+                project=project, kind="change_requested", title=title,
+                description=change.description[:DESCRIPTION_LENGTH],
+                occurred_at=change.created_at, source="project.projectchange",
+                source_id=str(change.pk),
+            ))
+            if change.is_approved:
+                entries.append(ProjectActivity(
+                    project=project, kind="change_approved", title=title,
+                    description="Approved",
+                    occurred_at=(
+                        _day_start(change.approved_date) if change.approved_date
+                        else change.updated_at
+                    ),
+                    source="project.projectchange", source_id=str(change.pk),
+                ))
+        for milestone in project.milestones.all():
+            if milestone.is_complete:
+                entries.append(ProjectActivity(
+                    project=project, kind="milestone_completed",
+                    title=f"Milestone: {milestone.name}", description="Completed",
+                    occurred_at=(
+                        _day_start(milestone.actual_date) if milestone.actual_date
+                        else milestone.updated_at
+                    ),
+                    source="project.projectmilestone", source_id=str(milestone.pk),
+                ))
+
+    with transaction.atomic():
+        ProjectActivity.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
@@ -0,0 +1,16 @@
+"""
+backfill_project_activity.py - Seed the project activity stream from existing
+changes and milestones for projects that have no activity entries yet.
+"""
+
+from django.core.management.base import BaseCommand
+
+from project.activity import backfill_activity
+
+
+class Command(BaseCommand):
+    help = 'Create ProjectActivity entries for projects recorded before the activity log.'
+
+    def handle(self, *args, **options):
+        count = backfill_activity()
+        self.stdout.write(f'Stored {count} project activity entries.')
@@ -0,0 +1,17 @@
+"""
+snapshot_project_progress.py - Record today's progress snapshot for every
+project whose figures changed. Meant to run nightly from cron; rerunning on
+the same day is safe.
+"""
+
+from django.core.management.base import BaseCommand
+
+from project.progress import record_progress_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Store ProjectProgressSnapshot rows for projects whose progress changed.'
+
+    def handle(self, *args, **options):
+        created, updated = record_progress_snapshots()
+        self.stdout.write(f'Stored {created} new and {updated} updated progress snapshots.')
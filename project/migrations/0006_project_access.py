@@ -0,0 +1,54 @@
+# Generated by Django 5.2.13 on 2026-10-19 11:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_project_access(apps, schema_editor):
+    Project = apps.get_model("project", "Project")
+    ProjectAccess = apps.get_model("project", "ProjectAccess")
+
+    rows = []
+    fk_fields = {
+        "project_manager": "project_manager_id",
+        "estimator": "estimator_id",
+        "supervisor": "supervisor_id",
+    }
+    for project in Project.objects.only("id", *fk_fields.values()).iterator():
+        for level, field in fk_fields.items():
+            user_id = getattr(project, field)
+            if user_id:
+                rows.append(ProjectAccess(project_id=project.id, user_id=user_id, access_level=level))
+
+    for level, field in (("team_lead", "team_leads"), ("team_member", "team_members")):
+        through = getattr(Project, field).through
+        for project_id, user_id in through.objects.values_list("project_id", "worker_id").iterator():
+            rows.append(ProjectAccess(project_id=project_id, user_id=user_id, access_level=level))
+
+    ProjectAccess.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0005_project_locations_project_primary_location_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('access_level', models.CharField(choices=[('project_manager', 'Project Manager'), ('estimator', 'Estimator'), ('supervisor', 'Supervisor'), ('team_lead', 'Team Lead'), ('team_member', 'Team Member')], max_length=20)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_entries', to='project.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'access_level', 'project'], name='project_pro_user_id_9244ce_idx')],
+                'unique_together': {('user', 'project', 'access_level')},
+            },
+        ),
+        migrations.RunPython(backfill_project_access, migrations.RunPython.noop),
+    ]
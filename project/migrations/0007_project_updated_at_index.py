@@ -0,0 +1,21 @@
+# Generated by Django 5.2.13 on 2026-10-19 12:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0004_servicelocation'),
+        ('location', '0005_location_geohash'),
+        ('project', '0006_project_access'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['updated_at', 'id'], name='project_pro_updated_8db4f8_idx'),
+        ),
+    ]
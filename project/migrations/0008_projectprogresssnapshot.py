@@ -0,0 +1,32 @@
+# Generated by Django 5.2.13 on 2026-10-19 13:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0007_project_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectProgressSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('percent_complete', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('tasks_done', models.PositiveIntegerField(default=0)),
+                ('tasks_total', models.PositiveIntegerField(default=0)),
+                ('cost_to_date', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('invoiced_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_snapshots', to='project.project')),
+            ],
+            options={
+                'ordering': ['project', 'date'],
+                'indexes': [models.Index(fields=['date'], name='project_pro_date_effa94_idx')],
+                'unique_together': {('project', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.13 on 2026-10-19 13:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0008_projectprogresssnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('kind', models.CharField(choices=[('project_created', 'Project Created'), ('status_changed', 'Status Changed'), ('change_requested', 'Change Requested'), ('change_approved', 'Change Approved'), ('milestone_added', 'Milestone Added'), ('milestone_completed', 'Milestone Completed'), ('material_added', 'Material Added'), ('material_status', 'Material Status'), ('task_created', 'Task Created'), ('task_completed', 'Task Completed'), ('event_scheduled', 'Event Scheduled'), ('time_logged', 'Time Logged')], max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('source', models.CharField(blank=True, max_length=50)),
+                ('source_id', models.CharField(blank=True, max_length=64)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='project_activity', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='project.project')),
+            ],
+            options={
+                'ordering': ['-occurred_at', '-id'],
+                'indexes': [models.Index(fields=['project', 'occurred_at', 'id'], name='project_pro_project_0c0ddc_idx')],
+            },
+        ),
+    ]
@@ -1,10 +1,12 @@
 # project/models.py - Modernized Project Model
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, Count, F, Q, Sum
 from django.urls import reverse
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.contenttypes.fields import GenericRelation
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.apps import apps
 from decimal import Decimal
 import uuid
@@ -12,7 +14,8 @@ from datetime import date, timedelta
 
 # Import from your modernized apps
 from client.models import TimeStampedModel, UUIDModel
-from location.models import BusinessCategory, ConfigurableChoice, get_dynamic_choices
+from location.models import BusinessCategory, ConfigurableChoice, Location, get_dynamic_choices
+from location.terminology import get_business_category
 from hr.models import Worker
 
 # from todo.models import Task
@@ -83,6 +86,74 @@ class ProjectTemplate(TimeStampedModel):
         return f"{self.name} ({self.business_category.name})"
 
 
+# Roles resolved through the ProjectAccess table. Each entry lists the
+# access levels that make a project visible to a worker holding that role.
+PROJECT_ACCESS_LEVELS_BY_ROLE = {
+    "project_manager": ["project_manager", "estimator", "team_lead"],
+    "supervisor": ["supervisor", "team_lead", "team_member"],
+    "worker": ["supervisor", "team_lead", "team_member"],
+}
+
+
+class ProjectQuerySet(models.QuerySet):
+    """Queryset helpers for scoping projects to a user"""
+
+    def for_member(self, user, access_levels=None):
+        """Projects where ``user`` holds any of ``access_levels`` (default: any role).
+
+        Uses an indexed semi-join against ProjectAccess so the result never
+        needs ``.distinct()``.
+        """
+        access = ProjectAccess.objects.filter(user=user)
+        if access_levels is not None:
+            access = access.filter(access_level__in=access_levels)
+        return self.filter(id__in=access.values("project_id"))
+
+    def visible_to(self, user):
+        """Apply the standard role-based project scoping for ``user``"""
+        role = getattr(user, "role", None)
+        if role == "admin":
+            return self
+        if role in PROJECT_ACCESS_LEVELS_BY_ROLE:
+            return self.for_member(user, PROJECT_ACCESS_LEVELS_BY_ROLE[role])
+        if role == "client" and hasattr(user, "client"):
+            return self.filter(primary_location__client=user.client)
+        return self.none()
+
+    def with_business_category(self):
+        """Annotate ``business_category_id`` so terminology lookups skip the join per row"""
+        return self.annotate(business_category_id=F("primary_location__business_category"))
+
+    def for_locations(self, locations):
+        """Projects linked to any of ``locations`` (a queryset, list or ids).
+
+        Filters through an indexed semi-join on the project/location link
+        table, so a project with several matching locations appears once and
+        aggregates over the result never double-count it.
+        """
+        links = Project.locations.through.objects.filter(location__in=locations)
+        return self.filter(id__in=links.values("project_id"))
+
+    def for_client(self, client):
+        """Projects linked to any location of ``client``"""
+        links = Project.locations.through.objects.filter(location__client=client)
+        return self.filter(id__in=links.values("project_id"))
+
+    def contract_rollup(self):
+        """Return ``{"total", "count", "average"}`` contract figures in one query.
+
+        ``count`` and ``average`` only consider projects with a contract value.
+        """
+        rollup = self.aggregate(
+            total=Sum("contract_value"),
+            count=Count("id", filter=Q(contract_value__isnull=False)),
+            average=Avg("contract_value"),
+        )
+        rollup["total"] = rollup["total"] or Decimal("0.00")
+        rollup["average"] = rollup["average"] or Decimal("0.00")
+        return rollup
+
+
 class Project(UUIDModel, TimeStampedModel):
     """Modernized project model - works for any business type"""
 
@@ -330,6 +401,8 @@ class Project(UUIDModel, TimeStampedModel):
         max_length=2000, blank=True, help_text="Pricing terms and disclaimers"
     )
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         ordering = ["-job_number"]
         indexes = [
@@ -337,6 +410,7 @@ class Project(UUIDModel, TimeStampedModel):
             models.Index(fields=["project_manager", "status"]),
             models.Index(fields=["job_number"]),
             models.Index(fields=["start_date", "due_date"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
 
     def __str__(self):
@@ -351,61 +425,79 @@ class Project(UUIDModel, TimeStampedModel):
         )
 
     # Business-specific terminology
+    @cached_property
+    def business_category_id(self):
+        """Business category of the primary location
+
+        Annotated in bulk by ``Project.objects.with_business_category()``.
+        """
+        if self.primary_location_id is None:
+            return None
+        if Project.primary_location.is_cached(self):
+            return self.primary_location.business_category_id
+        return (
+            Location.objects.filter(pk=self.primary_location_id)
+            .values_list("business_category_id", flat=True)
+            .first()
+        )
+
     @property
     def business_category(self):
-        """Get business category from the first service location if available"""
-        loc = self.service_locations.first()
-        if loc and hasattr(loc.client, "business_category"):
-            return loc.client.business_category
-        return None
+        """Get the business category from the terminology registry"""
+        return get_business_category(self.business_category_id)
 
     @property
     def project_term(self):
         """Get the business-specific term for this project"""
-        if self.business_category:
-            return self.business_category.project_term_singular
+        category = self.business_category
+        if category:
+            return category.project_term_singular
         return "Project"
 
     @property
     def project_term_plural(self):
         """Get the business-specific plural term"""
-        if self.business_category:
-            return self.business_category.project_term
+        category = self.business_category
+        if category:
+            return category.project_term
         return "Projects"
 
     @property
     def material_term(self):
-        if self.business_category:
-            return self.business_category.material_term
+        category = self.business_category
+        if category:
+            return category.material_term
         return "Materials"
 
     @property
     def material_term_singular(self):
-        if self.business_category:
-            return self.business_category.material_term_singular
+        category = self.business_category
+        if category:
+            return category.material_term_singular
         return "Material"
 
     def get_material_type_term(self, slug):
-        if self.business_category:
-            return self.business_category.get_material_type_term(slug)
+        category = self.business_category
+        if category:
+            return category.get_material_type_term(slug)
         return slug.title()
 
     # Dynamic choice methods
     def get_available_statuses(self):
         """Get available statuses for this project's business category"""
-        return get_dynamic_choices("project_status", self.business_category)
+        return get_dynamic_choices("project_status", self.business_category_id)
 
     def get_available_tax_statuses(self):
         """Get available tax statuses for this business category"""
-        return get_dynamic_choices("tax_status", self.business_category)
+        return get_dynamic_choices("tax_status", self.business_category_id)
 
     def get_available_divisions(self):
         """Get available divisions for this business category"""
-        return get_dynamic_choices("division", self.business_category)
+        return get_dynamic_choices("division", self.business_category_id)
 
     def get_available_project_types(self):
         """Get available project types for this business category"""
-        return get_dynamic_choices("project_type", self.business_category)
+        return get_dynamic_choices("project_type", self.business_category_id)
 
     # Financial calculations
     @property
@@ -550,6 +642,124 @@ class Project(UUIDModel, TimeStampedModel):
         return None
 
 
+class ProjectAccess(models.Model):
+    """Denormalized (user, project, access level) membership rows.
+
+    Mirrors the project's team foreign keys and many-to-many fields so that
+    role scoping is a single indexed lookup. Rows are maintained by the
+    signal handlers in ``project.signals``.
+    """
+
+    ACCESS_LEVELS = [
+        ("project_manager", "Project Manager"),
+        ("estimator", "Estimator"),
+        ("supervisor", "Supervisor"),
+        ("team_lead", "Team Lead"),
+        ("team_member", "Team Member"),
+    ]
+
+    # Project foreign keys mirrored into ProjectAccess, keyed by access level
+    FK_ACCESS_FIELDS = {
+        "project_manager": "project_manager_id",
+        "estimator": "estimator_id",
+        "supervisor": "supervisor_id",
+    }
+    # Project many-to-many fields mirrored into ProjectAccess
+    M2M_ACCESS_FIELDS = {
+        "team_lead": "team_leads",
+        "team_member": "team_members",
+    }
+
+    user = models.ForeignKey(
+        Worker, on_delete=models.CASCADE, related_name="project_access"
+    )
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="access_entries"
+    )
+    access_level = models.CharField(max_length=20, choices=ACCESS_LEVELS)
+
+    class Meta:
+        unique_together = [("user", "project", "access_level")]
+        indexes = [
+            models.Index(fields=["user", "access_level", "project"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.project_id} ({self.access_level})"
+
+    @classmethod
+    def sync_foreign_keys(cls, project):
+        """Bring the rows for the project's FK roles in line with the project"""
+        wanted = {
+            (getattr(project, field), level)
+            for level, field in cls.FK_ACCESS_FIELDS.items()
+            if getattr(project, field)
+        }
+        existing = set(
+            cls.objects.filter(
+                project=project, access_level__in=cls.FK_ACCESS_FIELDS
+            ).values_list("user_id", "access_level")
+        )
+        for user_id, level in existing - wanted:
+            cls.objects.filter(
+                project=project, user_id=user_id, access_level=level
+            ).delete()
+        cls.objects.bulk_create(
+            [
+                cls(project=project, user_id=user_id, access_level=level)
+                for user_id, level in wanted - existing
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def has_access(cls, project, user, access_levels):
+        """Whether ``user`` holds any of ``access_levels`` on ``project``
+
+        Foreign key levels are read straight off the loaded project; the
+        many-to-many levels cost at most one EXISTS query.
+        """
+        for level in access_levels:
+            field = cls.FK_ACCESS_FIELDS.get(level)
+            if field and getattr(project, field) == user.pk:
+                return True
+        m2m_levels = [level for level in access_levels if level in cls.M2M_ACCESS_FIELDS]
+        if not m2m_levels:
+            return False
+        return cls.objects.filter(
+            project_id=project.pk, user_id=user.pk, access_level__in=m2m_levels
+        ).exists()
+
+    @classmethod
+    def rebuild(cls, projects=None):
+        """Recreate access rows from scratch for ``projects`` (default: all)"""
+        if projects is None:
+            projects = Project.objects.all()
+        projects = projects.only("id", *cls.FK_ACCESS_FIELDS.values())
+
+        rows = []
+        for project in projects.iterator():
+            for level, field in cls.FK_ACCESS_FIELDS.items():
+                user_id = getattr(project, field)
+                if user_id:
+                    rows.append(cls(project_id=project.id, user_id=user_id, access_level=level))
+
+        for level, field in cls.M2M_ACCESS_FIELDS.items():
+            through = getattr(Project, field).through
+            links = through.objects.filter(project__in=projects).values_list(
+                "project_id", "worker_id"
+            )
+            rows.extend(
+                cls(project_id=project_id, user_id=user_id, access_level=level)
+                for project_id, user_id in links.iterator()
+            )
+
+        with transaction.atomic():
+            cls.objects.filter(project__in=projects).delete()
+            cls.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        return len(rows)
+
+
 # Scope of Work - Enhanced
 class ScopeOfWork(TimeStampedModel):
     """Enhanced scope of work items"""
@@ -748,3 +958,123 @@ class ProjectMilestone(TimeStampedModel):
 
     class Meta:
         ordering = ["target_date"]
+
+
+# Progress history
+class ProjectProgressSnapshot(models.Model):
+    """Point-in-time progress figures for a project, used by progress charts.
+
+    Written by ``project.progress.record_progress_snapshots``, which stores a
+    row only when a project's figures differ from its previous snapshot, so
+    the value on any date is the latest snapshot on or before it.
+    """
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="progress_snapshots"
+    )
+    date = models.DateField()
+    percent_complete = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    tasks_done = models.PositiveIntegerField(default=0)
+    tasks_total = models.PositiveIntegerField(default=0)
+    cost_to_date = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    invoiced_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["project", "date"]
+        unique_together = [("project", "date")]
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} on {self.date}: {self.percent_complete}%"
+
+
+# Activity stream
+class ProjectActivity(models.Model):
+    """Append-only activity log entry for a project.
+
+    Rows are written by the signal handlers in ``project.signals`` when
+    projects, changes, milestones, materials, tasks, events and timecards are
+    created or change state, and read newest first with keyset pagination
+    through ``project.activity``.
+    """
+
+    KIND_CHOICES = [
+        ("project_created", "Project Created"),
+        ("status_changed", "Status Changed"),
+        ("change_requested", "Change Requested"),
+        ("change_approved", "Change Approved"),
+        ("milestone_added", "Milestone Added"),
+        ("milestone_completed", "Milestone Completed"),
+        ("material_added", "Material Added"),
+        ("material_status", "Material Status"),
+        ("task_created", "Task Created"),
+        ("task_completed", "Task Completed"),
+        ("event_scheduled", "Event Scheduled"),
+        ("time_logged", "Time Logged"),
+    ]
+
+    # kind -> (Font Awesome icon, Bootstrap color) for timelines
+    KIND_STYLES = {
+        "project_created": ("fa-plus-circle", "primary"),
+        "status_changed": ("fa-exchange-alt", "info"),
+        "change_requested": ("fa-edit", "warning"),
+        "change_approved": ("fa-check", "success"),
+        "milestone_added": ("fa-flag", "secondary"),
+        "milestone_completed": ("fa-flag-checkered", "success"),
+        "material_added": ("fa-box", "secondary"),
+        "material_status": ("fa-truck", "info"),
+        "task_created": ("fa-tasks", "secondary"),
+        "task_completed": ("fa-check-square", "success"),
+        "event_scheduled": ("fa-calendar-alt", "primary"),
+        "time_logged": ("fa-clock", "secondary"),
+    }
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="activity", db_index=False
+    )
+    occurred_at = models.DateTimeField(default=timezone.now)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    actor = models.ForeignKey(
+        Worker,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="project_activity",
+    )
+    # "app_label.model" and primary key of the record the entry describes
+    source = models.CharField(max_length=50, blank=True)
+    source_id = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        ordering = ["-occurred_at", "-id"]
+        indexes = [
+            models.Index(fields=["project", "occurred_at", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.kind} at {self.occurred_at}"
+
+    # Keys used by the activity templates
+    @property
+    def type(self):
+        return self.kind
+
+    @property
+    def date(self):
+        return self.occurred_at
+
+    @property
+    def user(self):
+        return self.actor
+
+    @property
+    def icon(self):
+        return self.KIND_STYLES.get(self.kind, ("fa-circle", "secondary"))[0]
+
+    @property
+    def color(self):
+        return self.KIND_STYLES.get(self.kind, ("fa-circle", "secondary"))[1]
@@ -0,0 +1,77 @@
+"""Keyset pagination for the project sync API."""
+
+import base64
+from urllib.parse import urlencode
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class UpdatedAtCursorPagination(BasePagination):
+    """Cursor pagination over ``(updated_at, id)``.
+
+    Each page is a single indexed range scan: no COUNT(*) and no OFFSET, so
+    page cost stays flat however deep a client paginates. The cursor is an
+    opaque token for the last row of the previous page.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 100
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def encode_cursor(obj):
+        token = f"{obj.updated_at.isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(token.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            updated_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound("Invalid cursor")
+        updated_at = parse_datetime(updated_at)
+        if updated_at is None:
+            raise NotFound("Invalid cursor")
+        return updated_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by("updated_at", "id")
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            updated_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk)
+            )
+
+        # One extra row tells us whether another page exists
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        params = self.request.query_params.copy()
+        params[self.cursor_query_param] = self.encode_cursor(self.page[-1])
+        return self.request.build_absolute_uri(
+            f"{self.request.path}?{urlencode(params, doseq=True)}"
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -1,7 +1,48 @@
 from django.contrib.auth.mixins import UserPassesTestMixin, PermissionRequiredMixin
-
-
-class ProjectAccessMixin(UserPassesTestMixin):
+from django.views.generic.detail import SingleObjectMixin
+
+from .models import Project, ProjectAccess
+
+# Relations the access checks read, fetched with the object itself
+PROJECT_ACCESS_RELATED = ("primary_location",)
+
+# Access levels that satisfy the object-level check for each user role
+PROJECT_OBJECT_ACCESS_LEVELS = {
+    "project_manager": ("project_manager", "estimator", "team_lead"),
+    "supervisor": ("supervisor", "team_lead", "team_member"),
+    "worker": ("team_member",),
+}
+
+
+class ProjectObjectMixin:
+    """Fetch the view's object once per request.
+
+    ``get_object()`` is called by the permission checks and again by the
+    view itself; the first result is kept on the view so later calls are
+    free. Projects are loaded together with the relations the access checks
+    need.
+    """
+
+    def has_object(self):
+        """Whether the view looks up a single object at all"""
+        return hasattr(super(), "get_object")
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if "_project_object" not in self.__dict__:
+            if isinstance(self, SingleObjectMixin):
+                queryset = self.get_queryset()
+                if queryset.model is Project:
+                    queryset = queryset.select_related(*PROJECT_ACCESS_RELATED)
+                self._project_object = super().get_object(queryset)
+            else:
+                # DRF views take no queryset argument
+                self._project_object = super().get_object()
+        return self._project_object
+
+
+class ProjectAccessMixin(ProjectObjectMixin, UserPassesTestMixin):
     """Object-level access checks for Project views."""
 
     def test_func(self):
@@ -11,7 +52,7 @@ class ProjectAccessMixin(UserPassesTestMixin):
         if self.request.method in ("GET", "HEAD", "OPTIONS"):
             return user.is_authenticated and user.is_active
 
-        if not hasattr(self, "get_object"):
+        if not self.has_object():
             return user.is_authenticated
 
         try:
@@ -24,28 +65,19 @@ class ProjectAccessMixin(UserPassesTestMixin):
                 if user.business_category != project.business_category:
                     return False
 
-            if user.role == "admin":
+            role = user.role
+            if role == "admin":
                 return True
-            elif user.role == "project_manager":
-                return (
-                    project.project_manager == user
-                    or project.estimator == user
-                    or user in project.team_leads.all()
-                )
-            elif user.role == "supervisor":
-                return (
-                    project.supervisor == user
-                    or user in project.team_leads.all()
-                    or user in project.team_members.all()
+            elif role in PROJECT_OBJECT_ACCESS_LEVELS:
+                return ProjectAccess.has_access(
+                    project, user, PROJECT_OBJECT_ACCESS_LEVELS[role]
                 )
-            elif user.role == "worker":
-                return user in project.team_members.all()
-            elif user.role == "staff":
+            elif role == "staff":
                 return True
-            elif user.role == "client":
+            elif role == "client":
                 return (
                     hasattr(user, "client")
-                    and project.primary_location.client == user.client
+                    and project.primary_location.client_id == user.client.pk
                 )
 
             return False
@@ -53,23 +85,23 @@ class ProjectAccessMixin(UserPassesTestMixin):
             return self.request.user.is_authenticated
 
 
-class ProjectPermissionMixin(PermissionRequiredMixin):
+class ProjectPermissionMixin(ProjectObjectMixin, PermissionRequiredMixin):
     """Permission mixin for project-level operations."""
 
     def has_permission(self):
         if not super().has_permission():
             return False
 
-        if hasattr(self, "get_object"):
+        if self.has_object():
             try:
                 project = self.get_object()
             except Exception:
                 return False
 
             user = self.request.user
-            return user.is_superuser or project.project_manager == user
+            return user.is_superuser or project.project_manager_id == user.pk
 
         return True
 
 
-__all__ = ["ProjectAccessMixin", "ProjectPermissionMixin"]
+__all__ = ["ProjectAccessMixin", "ProjectObjectMixin", "ProjectPermissionMixin"]
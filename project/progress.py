@@ -0,0 +1,181 @@
+"""Daily progress snapshots and the time series behind the progress charts.
+
+``record_progress_snapshots`` reads every project's current completion, task
+counts, scope cost and invoicing in one query, compares them with each
+project's latest snapshot and writes rows only for projects whose figures
+changed. A project's value on any date is therefore its latest snapshot on or
+before that date, and the chart series carry values forward between rows.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from home.widgets import invalidate_dashboard_widgets
+
+from .models import Project, ProjectProgressSnapshot, ScopeOfWork
+from .reports import with_task_counts
+
+PROGRESS_TAG = "project_progress"
+SNAPSHOT_FIELDS = (
+    "percent_complete",
+    "tasks_done",
+    "tasks_total",
+    "cost_to_date",
+    "invoiced_amount",
+)
+
+MONEY = DecimalField(max_digits=20, decimal_places=2)
+ZERO = Decimal("0")
+
+
+def _current_figures(projects):
+    cost = (
+        ScopeOfWork.objects.filter(project=OuterRef("pk"))
+        .order_by()
+        .values("project")
+        .annotate(total=Sum("actual_cost"))
+        .values("total")
+    )
+    return with_task_counts(projects.order_by()).annotate(
+        scope_cost=Coalesce(Subquery(cost, output_field=MONEY), ZERO, output_field=MONEY),
+    )
+
+
+def _latest_snapshot(before):
+    return (
+        ProjectProgressSnapshot.objects.filter(project=OuterRef("pk"), date__lte=before)
+        .order_by("-date")
+        .values("pk")[:1]
+    )
+
+
+def record_progress_snapshots(today=None, projects=None):
+    """Snapshot every project (or ``projects``) whose figures changed
+
+    Rerunning on the same day updates that day's rows instead of adding more.
+    Returns ``(created, updated)`` row counts.
+    """
+    today = today or date.today()
+    if projects is None:
+        projects = Project.objects.all()
+
+    rows = list(
+        _current_figures(projects)
+        .annotate(last_snapshot=Subquery(_latest_snapshot(today)))
+        .values(
+            "pk", "percent_complete", "task_total", "tasks_done",
+            "scope_cost", "invoiced_amount", "last_snapshot",
+        )
+    )
+    previous = ProjectProgressSnapshot.objects.in_bulk(
+        [row["last_snapshot"] for row in rows if row["last_snapshot"]]
+    )
+
+    created, updated = [], []
+    for row in rows:
+        figures = {
+            "percent_complete": row["percent_complete"] or ZERO,
+            "tasks_done": row["tasks_done"],
+            "tasks_total": row["task_total"],
+            "cost_to_date": row["scope_cost"] or ZERO,
+            "invoiced_amount": row["invoiced_amount"] or ZERO,
+        }
+        last = previous.get(row["last_snapshot"])
+        if last is not None and all(
+            getattr(last, field) == figures[field] for field in SNAPSHOT_FIELDS
+        ):
+            continue
+        if last is not None and last.date == today:
+            for field in SNAPSHOT_FIELDS:
+                setattr(last, field, figures[field])
+            updated.append(last)
+        else:
+            created.append(
+                ProjectProgressSnapshot(project_id=row["pk"], date=today, **figures)
+            )
+
+    with transaction.atomic():
+        ProjectProgressSnapshot.objects.bulk_create(created, batch_size=1000)
+        ProjectProgressSnapshot.objects.bulk_update(
+            updated, SNAPSHOT_FIELDS, batch_size=1000
+        )
+    if created or updated:
+        invalidate_dashboard_widgets(PROGRESS_TAG)
+    return len(created), len(updated)
+
+
+def series_dates(weeks=12, today=None):
+    """Weekly chart points ending on ``today``"""
+    today = today or date.today()
+    return [today - timedelta(weeks=weeks - 1 - index) for index in range(weeks)]
+
+
+def _snapshots_by_project(projects, points):
+    """Snapshots inside the window plus each project's last one before it"""
+    first, last = points[0], points[-1]
+    baseline = projects.annotate(
+        baseline=Subquery(_latest_snapshot(first - timedelta(days=1)))
+    ).values("baseline")
+    rows = (
+        ProjectProgressSnapshot.objects.filter(project__in=projects.values("pk"))
+        .filter(Q(date__gte=first, date__lte=last) | Q(pk__in=baseline))
+        .order_by("project", "date")
+        .values("project_id", "date", *SNAPSHOT_FIELDS)
+    )
+    snapshots = defaultdict(list)
+    for row in rows:
+        snapshots[row["project_id"]].append(row)
+    return snapshots
+
+
+def _values_at(snapshots, points):
+    """For each point, the latest snapshot on or before it (or ``None``)"""
+    values, index, current = [], 0, None
+    for point in points:
+        while index < len(snapshots) and snapshots[index]["date"] <= point:
+            current = snapshots[index]
+            index += 1
+        values.append(current)
+    return values
+
+
+def project_progress_series(project, weeks=12, today=None):
+    """Weekly ``[{date, percent_complete, tasks_done, ...}]`` for one project"""
+    points = series_dates(weeks, today)
+    projects = Project.objects.filter(pk=project.pk)
+    snapshots = _snapshots_by_project(projects, points).get(project.pk, [])
+    return [
+        {"date": point, **{field: value[field] for field in SNAPSHOT_FIELDS}}
+        for point, value in zip(points, _values_at(snapshots, points))
+        if value is not None
+    ]
+
+
+def portfolio_progress_series(projects=None, weeks=12, today=None):
+    """Weekly portfolio totals and average completion across ``projects``"""
+    points = series_dates(weeks, today)
+    if projects is None:
+        projects = Project.objects.all()
+
+    totals = [
+        {"date": point, "projects": 0, **{field: ZERO for field in SNAPSHOT_FIELDS}}
+        for point in points
+    ]
+    for snapshots in _snapshots_by_project(projects.order_by(), points).values():
+        for total, value in zip(totals, _values_at(snapshots, points)):
+            if value is None:
+                continue
+            total["projects"] += 1
+            for field in SNAPSHOT_FIELDS:
+                total[field] += value[field]
+
+    for total in totals:
+        total["avg_completion"] = (
+            total.pop("percent_complete") / total["projects"] if total["projects"] else ZERO
+        )
+    return totals
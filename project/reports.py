@@ -0,0 +1,218 @@
+"""Query layer behind the project financial and progress reports.
+
+Each report is built from a handful of flat queries over ``Project``: bucket
+counts, averages and margins come from one ``aggregate()`` pass with filtered
+aggregates, and task/milestone counts are attached through correlated
+subqueries only for the rows that are listed. Results are kept in the
+two-tier ``home.caching`` cache per filter set under the dashboard
+invalidation tags, so saving a project, task or milestone expires them.
+"""
+
+from datetime import date, timedelta
+
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    DecimalField,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, TruncMonth
+
+from home.caching import cached, make_key
+
+from .models import Project, ProjectMilestone
+
+REPORT_CACHE_TIMEOUT = 300
+FINANCIAL_REPORT_TAGS = ("projects",)
+PROGRESS_REPORT_TAGS = ("projects", "tasks", "milestones", "project_progress")
+
+# (label, lower bound inclusive, upper bound exclusive) on percent_complete
+COMPLETION_RANGES = [
+    ("0-25%", None, 25),
+    ("25-50%", 25, 50),
+    ("50-75%", 50, 75),
+    ("75-100%", 75, None),
+]
+
+PROFIT_MARGIN = Case(
+    When(
+        contract_value__gt=0,
+        then=(F("contract_value") - F("estimated_cost")) * 100 / F("contract_value"),
+    ),
+    default=Value(0),
+    output_field=DecimalField(max_digits=12, decimal_places=2),
+)
+
+
+def cached_report(name, params, tags, build):
+    """Return ``build()`` cached for ``params`` until any of ``tags`` changes"""
+    return cached(
+        make_key("project_report", name, **params), build,
+        ttl=REPORT_CACHE_TIMEOUT, tags=tags,
+    )
+
+
+def _count_subquery(queryset, project_path):
+    counts = (
+        queryset.filter(**{project_path: OuterRef("pk")})
+        .order_by()
+        .values(project_path)
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def with_task_counts(queryset):
+    """Annotate task and milestone totals without joining them into the row set
+
+    The names avoid the ``Project.completed_tasks``-style properties, which
+    annotations cannot overwrite.
+    """
+    from todo.models import Task
+
+    tasks = Task.objects.all()
+    milestones = ProjectMilestone.objects.all()
+    return queryset.annotate(
+        task_total=_count_subquery(tasks, "task_list__project"),
+        tasks_done=_count_subquery(tasks.filter(completed=True), "task_list__project"),
+        milestone_total=_count_subquery(milestones, "project"),
+        milestones_done=_count_subquery(
+            milestones.filter(is_complete=True), "project"
+        ),
+    )
+
+
+def financial_report(date_from=None, date_to=None):
+    """Summary, per-status profitability, monthly trend and top projects"""
+
+    def build():
+        queryset = Project.objects.all()
+        if date_from:
+            queryset = queryset.filter(start_date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(start_date__lte=date_to)
+        queryset = queryset.order_by()
+
+        summary = queryset.aggregate(
+            total_contract_value=Sum("contract_value"),
+            total_estimated_cost=Sum("estimated_cost"),
+            total_invoiced=Sum("invoiced_amount"),
+            total_paid=Sum("paid_amount"),
+            avg_profit_margin=Avg(PROFIT_MARGIN),
+            project_count=Count("id"),
+        )
+        status_profitability = list(
+            queryset.values("status")
+            .annotate(
+                count=Count("id"),
+                total_value=Sum("contract_value"),
+                total_cost=Sum("estimated_cost"),
+                avg_margin=Avg(PROFIT_MARGIN),
+            )
+            .order_by("-total_value")
+        )
+        monthly_trends = list(
+            queryset.annotate(month=TruncMonth("start_date"))
+            .values("month")
+            .annotate(
+                project_count=Count("id"),
+                total_value=Sum("contract_value"),
+                total_cost=Sum("estimated_cost"),
+            )
+            .order_by("month")
+        )
+        top_projects = list(
+            queryset.filter(contract_value__isnull=False, estimated_cost__isnull=False)
+            .annotate(profit=F("contract_value") - F("estimated_cost"), margin=PROFIT_MARGIN)
+            .order_by("-profit")[:10]
+        )
+        return {
+            "financial_summary": summary,
+            "status_profitability": status_profitability,
+            "monthly_trends": monthly_trends,
+            "top_projects": top_projects,
+        }
+
+    params = {"date_from": date_from, "date_to": date_to}
+    return cached_report("financial", params, FINANCIAL_REPORT_TAGS, build)
+
+
+def progress_report(today=None):
+    """Completion statistics, buckets, manager performance and recent completions"""
+    today = today or date.today()
+
+    def build():
+        projects = Project.objects.order_by()
+
+        buckets = {}
+        for index, (_label, lower, upper) in enumerate(COMPLETION_RANGES):
+            condition = Q()
+            if lower is not None:
+                condition &= Q(percent_complete__gte=lower)
+            if upper is not None:
+                condition &= Q(percent_complete__lt=upper)
+            buckets[f"range_{index}"] = Count("id", filter=condition)
+
+        result = projects.aggregate(
+            total_projects=Count("id"),
+            on_track=Count("id", filter=Q(percent_complete__gte=50)),
+            behind_schedule=Count(
+                "id",
+                filter=Q(due_date__lt=today + timedelta(days=30), percent_complete__lt=75),
+            ),
+            avg_completion=Avg("percent_complete"),
+            **buckets,
+        )
+        progress_stats = {
+            "total_projects": result["total_projects"],
+            "on_track": result["on_track"],
+            "behind_schedule": result["behind_schedule"],
+            "avg_completion": result["avg_completion"] or 0,
+        }
+        completion_ranges = [
+            (label, result[f"range_{index}"])
+            for index, (label, _lower, _upper) in enumerate(COMPLETION_RANGES)
+        ]
+
+        manager_performance = list(
+            projects.values(
+                "project_manager__email",
+                "project_manager__first_name",
+                "project_manager__last_name",
+            )
+            .annotate(
+                project_count=Count("id"),
+                avg_completion=Avg("percent_complete"),
+                on_time_projects=Count("id", filter=Q(completed_date__lte=F("due_date"))),
+            )
+            .order_by("-avg_completion")
+        )
+
+        recent_completions = list(
+            with_task_counts(
+                Project.objects.select_related("project_manager").filter(
+                    status="complete",
+                    completed_date__gte=today - timedelta(days=30),
+                )
+            ).order_by("-completed_date")[:10]
+        )
+        from .progress import portfolio_progress_series
+
+        return {
+            "progress_stats": progress_stats,
+            "completion_ranges": completion_ranges,
+            "manager_performance": manager_performance,
+            "recent_completions": recent_completions,
+            "progress_trend": portfolio_progress_series(today=today),
+        }
+
+    return cached_report("progress", {"today": today}, PROGRESS_REPORT_TAGS, build)
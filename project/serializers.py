@@ -9,6 +9,23 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class ProjectSyncSerializer(serializers.ModelSerializer):
+    """Project representation for the v2 sync API.
+
+    Pass ``fields`` to serialize only a subset (``?fields=`` on the API).
+    """
+
+    class Meta:
+        model = Project
+        fields = "__all__"
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 class ScopeOfWorkSerializer(serializers.ModelSerializer):
     class Meta:
         model = ScopeOfWork
@@ -0,0 +1,214 @@
+# project/signals.py - Keep denormalized project data in sync
+from django.db.models.signals import m2m_changed, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .activity import record_activity
+from .models import Project, ProjectAccess
+
+
+@receiver(post_save, sender=Project)
+def sync_project_access_foreign_keys(sender, instance, raw=False, **kwargs):
+    """Mirror project_manager/estimator/supervisor into ProjectAccess."""
+    if raw:
+        return
+    ProjectAccess.sync_foreign_keys(instance)
+
+
+def _sync_project_access_m2m(access_level, instance, action, reverse, pk_set, **kwargs):
+    """Apply a team_leads/team_members change to ProjectAccess.
+
+    Handles both sides of the relation: ``project.team_members.add(worker)``
+    and ``worker.assigned_projects.add(project)``. Touches the affected
+    projects' ``updated_at`` so ``?since=`` API syncs pick up team changes.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        if reverse:
+            changed = Project.objects.filter(pk__in=pk_set or ())
+            if action == "post_clear":
+                changed = Project.objects.filter(
+                    access_entries__user=instance, access_entries__access_level=access_level
+                )
+        else:
+            changed = Project.objects.filter(pk=instance.pk)
+        changed.update(updated_at=timezone.now())
+
+    if action == "post_add":
+        if reverse:
+            rows = [
+                ProjectAccess(project_id=pk, user=instance, access_level=access_level)
+                for pk in pk_set
+            ]
+        else:
+            rows = [
+                ProjectAccess(project=instance, user_id=pk, access_level=access_level)
+                for pk in pk_set
+            ]
+        ProjectAccess.objects.bulk_create(rows, ignore_conflicts=True)
+    elif action == "post_remove":
+        if reverse:
+            stale = {"user": instance, "project_id__in": pk_set}
+        else:
+            stale = {"project": instance, "user_id__in": pk_set}
+        ProjectAccess.objects.filter(access_level=access_level, **stale).delete()
+    elif action == "post_clear":
+        owner = "user" if reverse else "project"
+        ProjectAccess.objects.filter(access_level=access_level, **{owner: instance}).delete()
+
+
+@receiver(m2m_changed, sender=Project.team_leads.through)
+def sync_project_access_team_leads(sender, **kwargs):
+    _sync_project_access_m2m("team_lead", **kwargs)
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def sync_project_access_team_members(sender, **kwargs):
+    _sync_project_access_m2m("team_member", **kwargs)
+
+
+# Activity stream -----------------------------------------------------------
+
+# Fields whose transitions are logged, per model (lazy "app_label.Model")
+ACTIVITY_TRACKED_FIELDS = {
+    "project.Project": ("status",),
+    "project.ProjectChange": ("is_approved",),
+    "project.ProjectMilestone": ("is_complete",),
+    "project.ProjectMaterial": ("status",),
+    "todo.Task": ("completed",),
+}
+
+
+def _remember_tracked_fields(sender, instance, raw=False, **kwargs):
+    """Stash the stored values of tracked fields before an update."""
+    instance._activity_previous = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    fields = ACTIVITY_TRACKED_FIELDS[sender._meta.label]
+    instance._activity_previous = (
+        sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+    )
+
+
+for _model in ACTIVITY_TRACKED_FIELDS:
+    pre_save.connect(
+        _remember_tracked_fields, sender=_model, dispatch_uid=f"project_activity:{_model}"
+    )
+
+
+def _changed(instance, field):
+    """Previous value of ``field`` if this save changed it, else ``None``"""
+    previous = getattr(instance, "_activity_previous", None)
+    if previous is not None and previous[field] != getattr(instance, field):
+        return previous[field]
+    return None
+
+
+@receiver(post_save, sender=Project)
+def log_project_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record_activity(
+            instance.pk, "project_created", "Project Created",
+            f"Project {instance.job_number} created", source=instance,
+        )
+        return
+    previous_status = _changed(instance, "status")
+    if previous_status is not None:
+        record_activity(
+            instance.pk, "status_changed", "Status Changed",
+            f"{previous_status} to {instance.status}", source=instance,
+        )
+
+
+@receiver(post_save, sender="project.ProjectChange")
+def log_change_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    title = f"{instance.change_type.title()} Request"
+    if created:
+        record_activity(
+            instance.project_id, "change_requested", title, instance.description,
+            source=instance,
+        )
+    if instance.is_approved and (created or _changed(instance, "is_approved") is not None):
+        record_activity(
+            instance.project_id, "change_approved", title,
+            f"Approved by {instance.approved_by}" if instance.approved_by else "Approved",
+            source=instance,
+        )
+
+
+@receiver(post_save, sender="project.ProjectMilestone")
+def log_milestone_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    title = f"Milestone: {instance.name}"
+    if created:
+        record_activity(
+            instance.project_id, "milestone_added", title,
+            f"Target {instance.target_date}", source=instance,
+        )
+    if instance.is_complete and (created or _changed(instance, "is_complete") is not None):
+        record_activity(
+            instance.project_id, "milestone_completed", title, "Completed", source=instance,
+        )
+
+
+@receiver(post_save, sender="project.ProjectMaterial")
+def log_material_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    name = instance.product.name if instance.product_id else instance.material_type
+    if created:
+        record_activity(
+            instance.project_id, "material_added", f"Material: {name}",
+            f"Quantity {instance.quantity}", source=instance,
+        )
+    elif _changed(instance, "status") is not None:
+        record_activity(
+            instance.project_id, "material_status", f"Material: {name}",
+            f"Status {instance.status}", source=instance,
+        )
+
+
+@receiver(post_save, sender="todo.Task")
+def log_task_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    completed = instance.completed and (created or _changed(instance, "completed") is not None)
+    if not (created or completed):
+        return
+    project_id = instance.task_list.project_id
+    if created:
+        record_activity(
+            project_id, "task_created", f"Task: {instance.title}",
+            instance.description, actor=instance.created_by, source=instance,
+        )
+    if completed:
+        record_activity(
+            project_id, "task_completed", f"Task: {instance.title}", "Completed",
+            actor=instance.assigned_to, source=instance,
+        )
+
+
+@receiver(post_save, sender="schedule.Event")
+def log_event_activity(sender, instance, created, raw=False, **kwargs):
+    if raw or not created or not instance.project_id:
+        return
+    start = timezone.localtime(instance.start) if timezone.is_aware(instance.start) else instance.start
+    record_activity(
+        instance.project_id, "event_scheduled", f"Scheduled: {instance.title}",
+        f"{start:%Y-%m-%d %H:%M}", actor=instance.creator, source=instance,
+    )
+
+
+@receiver(post_save, sender="timecard.TimeCard")
+def log_timecard_activity(sender, instance, created, raw=False, **kwargs):
+    if raw or not created or not instance.project_id:
+        return
+    record_activity(
+        instance.project_id, "time_logged", f"{instance.total_hours} hours logged",
+        f"{instance.date}: {instance.description}" if instance.description else str(instance.date),
+        actor=instance.worker, source=instance,
+    )
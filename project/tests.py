@@ -1,9 +1,15 @@
 from django.test import TestCase, RequestFactory
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
 from .views import ProjectScheduleView
 from .models import Project
 import types, sys
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+from home.testing import QueryBudgetMixin
 
 
 class ScheduleViewTests(TestCase):
@@ -20,8 +26,9 @@ class ScheduleViewTests(TestCase):
         dummy_event.objects.filter.return_value.select_related.return_value.order_by.return_value.__getitem__.return_value = (
             []
         )
-        sys.modules["schedule.models"] = types.SimpleNamespace(Event=dummy_event)
-        response = ProjectScheduleView.as_view()(request)
+        fake_models = types.SimpleNamespace(Event=dummy_event)
+        with patch.dict(sys.modules, {"schedule.models": fake_models}):
+            response = ProjectScheduleView.as_view()(request)
         self.assertEqual(response.status_code, 200)
 
 
@@ -68,3 +75,433 @@ class ProjectAssetTests(TestCase):
         AssetAssignment.objects.create(asset=asset, assigned_to_project=project)
 
         self.assertEqual(list(project.allocated_assets), [asset])
+
+
+class ProjectAccessTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.manager = User.objects.create_user(
+            email="pm@example.com", password="pass", employee_id="E1",
+            roles=["project_manager"],
+        )
+        self.worker = User.objects.create_user(
+            email="worker@example.com", password="pass", employee_id="E2",
+            roles=["worker"],
+        )
+        self.project = Project.objects.create(
+            job_number="P1", name="Proj", project_manager=self.manager
+        )
+
+    def _levels(self, user):
+        from .models import ProjectAccess
+
+        return set(
+            ProjectAccess.objects.filter(user=user, project=self.project)
+            .values_list("access_level", flat=True)
+        )
+
+    def test_foreign_keys_are_mirrored(self):
+        self.assertEqual(self._levels(self.manager), {"project_manager"})
+
+        self.project.project_manager = self.worker
+        self.project.save()
+        self.assertEqual(self._levels(self.manager), set())
+        self.assertEqual(self._levels(self.worker), {"project_manager"})
+
+    def test_team_changes_are_mirrored(self):
+        self.project.team_members.add(self.worker)
+        self.manager.led_projects.add(self.project)
+        self.assertEqual(self._levels(self.worker), {"team_member"})
+        self.assertEqual(self._levels(self.manager), {"project_manager", "team_lead"})
+
+        self.worker.assigned_projects.remove(self.project)
+        self.project.team_leads.clear()
+        self.assertEqual(self._levels(self.worker), set())
+        self.assertEqual(self._levels(self.manager), {"project_manager"})
+
+    def test_visible_to_scopes_by_role(self):
+        other = Project.objects.create(job_number="P2", name="Other")
+        self.project.team_members.add(self.worker)
+        self.project.team_leads.add(self.worker)
+
+        self.assertEqual(list(Project.objects.visible_to(self.worker)), [self.project])
+        self.assertEqual(list(Project.objects.visible_to(self.manager)), [self.project])
+        self.assertNotIn(other, Project.objects.visible_to(self.manager))
+
+    def test_rebuild_restores_rows(self):
+        from .models import ProjectAccess
+
+        self.project.team_members.add(self.worker)
+        ProjectAccess.objects.all().delete()
+        ProjectAccess.rebuild()
+        self.assertEqual(self._levels(self.worker), {"team_member"})
+        self.assertEqual(self._levels(self.manager), {"project_manager"})
+
+    def test_access_mixin_fetches_project_once(self):
+        from django.views.generic import DetailView
+        from .permissions import ProjectAccessMixin
+
+        class View(ProjectAccessMixin, DetailView):
+            model = Project
+            slug_field = "job_number"
+            slug_url_kwarg = "job_number"
+
+        self.project.team_members.add(self.worker)
+        request = RequestFactory().post("/")
+        request.user = self.worker
+        self.worker.role  # resolve outside the query count
+
+        view = View()
+        view.setup(request, job_number="P1")
+        with self.assertNumQueries(2):  # project + membership EXISTS
+            self.assertTrue(view.test_func())
+            self.assertEqual(view.get_object(), self.project)
+
+        self.project.team_members.remove(self.worker)
+        view = View()
+        view.setup(request, job_number="P1")
+        self.assertFalse(view.test_func())
+
+
+class ProjectSyncAPITests(TestCase):
+    def setUp(self):
+        from rest_framework.test import APIClient
+
+        self.manager = get_user_model().objects.create_user(
+            email="pm@example.com", password="pass", employee_id="E1",
+            roles=["project_manager"],
+        )
+        self.projects = [
+            Project.objects.create(job_number=f"P{i}", name=f"Proj {i}", project_manager=self.manager)
+            for i in range(3)
+        ]
+        Project.objects.create(job_number="X1", name="Not mine")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("project:api-v2-project-list")
+
+    def test_cursor_pages_are_scoped_and_ordered(self):
+        response = self.api.get(self.url, {"page_size": 2, "fields": "job_number,name"})
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        self.assertEqual(set(first["results"][0]), {"job_number", "name"})
+
+        second = self.api.get(first["next"]).json()
+        self.assertIsNone(second["next"])
+        seen = [row["job_number"] for row in first["results"] + second["results"]]
+        self.assertEqual(sorted(seen), ["P0", "P1", "P2"])
+
+    def test_since_and_etag(self):
+        Project.objects.filter(pk=self.projects[0].pk).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.api.get(self.url, {"since": since, "fields": "job_number"})
+        self.assertEqual(
+            sorted(row["job_number"] for row in response.json()["results"]), ["P1", "P2"]
+        )
+
+        cached = self.api.get(
+            self.url, {"since": since, "fields": "job_number"},
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(cached.status_code, 304)
+
+        self.projects[1].name = "Renamed"
+        self.projects[1].save()
+        changed = self.api.get(
+            self.url, {"since": since, "fields": "job_number"},
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(changed.status_code, 200)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.api.get(self.url, {"fields": "job_number,secret"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ProjectReportTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        today = timezone.now().date()
+        for i, percent in enumerate([10, 30, 60, 100]):
+            Project.objects.create(
+                job_number=f"R{i}", name="Report", percent_complete=percent,
+                contract_value=100, estimated_cost=80,
+                status="complete" if percent == 100 else "active",
+                completed_date=today if percent == 100 else None,
+            )
+
+    def test_progress_report_is_one_pass_and_cached(self):
+        from .models import ProjectMilestone
+        from .reports import progress_report
+
+        # stats, managers, recent completions, progress trend
+        with self.assertNumQueries(4):
+            report = progress_report()
+        self.assertEqual(report["progress_stats"]["total_projects"], 4)
+        self.assertEqual(report["progress_stats"]["on_track"], 2)
+        self.assertEqual(
+            report["completion_ranges"],
+            [("0-25%", 1), ("25-50%", 1), ("50-75%", 1), ("75-100%", 1)],
+        )
+        self.assertEqual(report["recent_completions"][0].milestone_total, 0)
+
+        with self.assertNumQueries(0):
+            progress_report()
+
+        ProjectMilestone.objects.create(
+            project=report["recent_completions"][0], name="Done", is_complete=True,
+            target_date=timezone.now().date(),
+        )
+        completed = progress_report()["recent_completions"][0]
+        self.assertEqual(completed.milestones_done, 1)
+
+    def test_financial_report_margins(self):
+        from .reports import financial_report
+
+        report = financial_report()
+        self.assertEqual(report["financial_summary"]["project_count"], 4)
+        self.assertEqual(report["financial_summary"]["avg_profit_margin"], 20)
+        self.assertEqual(report["top_projects"][0].margin, 20)
+
+
+class ProjectProgressSnapshotTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.project = Project.objects.create(
+            job_number="S1", name="Snapshots", percent_complete=10, invoiced_amount=0
+        )
+        self.today = timezone.now().date()
+
+    def test_snapshots_only_store_changes(self):
+        from .models import ProjectProgressSnapshot, ScopeOfWork
+        from .progress import record_progress_snapshots
+
+        week_ago = self.today - timedelta(days=7)
+        self.assertEqual(record_progress_snapshots(today=week_ago), (1, 0))
+        self.assertEqual(record_progress_snapshots(today=self.today), (0, 0))
+
+        ScopeOfWork.objects.create(
+            project=self.project, area="A", system_type="S", actual_cost=250
+        )
+        Project.objects.filter(pk=self.project.pk).update(percent_complete=40)
+        self.assertEqual(record_progress_snapshots(today=self.today), (1, 0))
+
+        # Rerunning the same day rewrites that day's row
+        Project.objects.filter(pk=self.project.pk).update(percent_complete=45)
+        self.assertEqual(record_progress_snapshots(today=self.today), (0, 1))
+
+        latest = ProjectProgressSnapshot.objects.get(date=self.today)
+        self.assertEqual(latest.percent_complete, 45)
+        self.assertEqual(latest.cost_to_date, 250)
+        self.assertEqual(ProjectProgressSnapshot.objects.count(), 2)
+
+    def test_series_carry_values_forward(self):
+        from .progress import (
+            portfolio_progress_series,
+            project_progress_series,
+            record_progress_snapshots,
+        )
+
+        record_progress_snapshots(today=self.today - timedelta(days=30))
+        Project.objects.filter(pk=self.project.pk).update(percent_complete=50)
+        record_progress_snapshots(today=self.today - timedelta(days=3))
+
+        series = project_progress_series(self.project, weeks=3, today=self.today)
+        self.assertEqual(
+            [point["percent_complete"] for point in series], [10, 10, 50]
+        )
+
+        Project.objects.create(job_number="S2", name="Other", percent_complete=30)
+        record_progress_snapshots(today=self.today)
+        portfolio = portfolio_progress_series(weeks=2, today=self.today)
+        self.assertEqual([point["projects"] for point in portfolio], [1, 2])
+        self.assertEqual(portfolio[-1]["avg_completion"], 40)
+
+
+class ProjectActivityTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="activity@example.com", password="pass", employee_id="ACT1"
+        )
+        self.project = Project.objects.create(job_number="AC1", name="Activity")
+
+    def kinds(self):
+        from .models import ProjectActivity
+
+        return list(
+            ProjectActivity.objects.filter(project=self.project)
+            .order_by("occurred_at", "id")
+            .values_list("kind", flat=True)
+        )
+
+    def test_signals_append_entries_for_transitions(self):
+        from django.contrib.auth.models import Group
+        from todo.models import Task, TaskList
+        from .models import ProjectChange, ProjectMilestone
+
+        self.project.name = "Renamed"
+        self.project.save()
+        self.project.status = "active"
+        self.project.save()
+
+        change = ProjectChange.objects.create(
+            project=self.project, change_type="scope", description="More"
+        )
+        change.is_approved = True
+        change.save()
+        change.save()
+
+        milestone = ProjectMilestone.objects.create(
+            project=self.project, name="Rough-in", target_date=timezone.now().date()
+        )
+        milestone.is_complete = True
+        milestone.save()
+
+        task_list = TaskList.objects.create(
+            group=Group.objects.create(name="Crew"), name="Jobs", slug="jobs",
+            created_by=self.user, project=self.project,
+        )
+        task = Task.objects.create(title="Pull cable", task_list=task_list, created_by=self.user)
+        task.completed = True
+        task.completion_percentage = 100
+        task.status = "completed"
+        task.save()
+
+        self.assertEqual(self.kinds(), [
+            "project_created", "status_changed", "change_requested", "change_approved",
+            "milestone_added", "milestone_completed", "task_created", "task_completed",
+        ])
+
+    def test_keyset_pages_do_not_overlap(self):
+        from .activity import activity_page, record_activity
+
+        for index in range(5):
+            record_activity(self.project.pk, "status_changed", f"Entry {index}")
+
+        first, cursor = activity_page(self.project, limit=4)
+        self.assertEqual(first[0].title, "Entry 4")
+        self.assertIsNotNone(cursor)
+        with self.assertNumQueries(1):
+            second, last_cursor = activity_page(self.project, cursor, limit=4)
+        self.assertIsNone(last_cursor)
+        self.assertEqual(
+            [entry.title for entry in first + second],
+            ["Entry 4", "Entry 3", "Entry 2", "Entry 1", "Entry 0", "Project Created"],
+        )
+
+    def test_backfill_skips_projects_with_activity(self):
+        from .activity import backfill_activity
+        from .models import ProjectActivity
+
+        ProjectActivity.objects.all().delete()
+        self.assertEqual(backfill_activity(), 1)
+        self.assertEqual(backfill_activity(), 0)
+
+
+class JobNumberTests(TestCase):
+    def test_job_numbers_continue_from_existing_and_skip_taken(self):
+        from .utils import allocate_job_numbers, generate_job_number, preview_job_number
+
+        Project.objects.create(job_number="0099", name="Old")
+        Project.objects.create(job_number="X-500", name="Lettered")
+        self.assertEqual(preview_job_number(), "0100")
+        self.assertEqual(generate_job_number(), "0100")
+
+        Project.objects.create(job_number="0102", name="Typed in")
+        self.assertEqual(allocate_job_numbers(3), ["0101", "0103", "0104"])
+        self.assertEqual(preview_job_number(), "0105")
+
+    def test_duplicate_allocates_job_number_on_save(self):
+        from django.db.models.fields.files import FieldFile
+
+        manager = get_user_model().objects.create_user(
+            email="dup@example.com", password="pass", employee_id="D1",
+            roles=["employee", "project_manager"], is_superuser=True,
+        )
+        original = Project.objects.create(
+            job_number="0100", name="Original", project_manager=manager
+        )
+        self.client.force_login(manager)
+        url = reverse("project:project-duplicate", kwargs={"job_number": "0100"})
+
+        form = self.client.get(url).context["form"]
+        self.assertNotIn("job_number", form.initial)
+        self.assertEqual(form.fields["job_number"].widget.attrs["placeholder"], "0101")
+
+        # Another project takes the previewed number before the copy is saved
+        Project.objects.create(job_number="0101", name="Concurrent")
+        data = {
+            name: value for name, value in form.initial.items()
+            if value is not None and not isinstance(value, (list, FieldFile))
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        copy = Project.objects.get(name="Copy of Original")
+        self.assertEqual(copy.job_number, "0102")
+        self.assertNotEqual(copy.pk, original.pk)
+
+
+class ProjectHealthCheckTests(TestCase):
+    def test_health_check_does_not_count_projects(self):
+        from home import health
+
+        health.reset_readiness()
+        self.addCleanup(health.reset_readiness)
+        # The probe's SELECT 1 runs on the readiness thread, not the request's
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("project:health-check"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "healthy")
+        self.assertIn("database:default", response.json()["checks"])
+
+    def test_system_status_is_staff_only(self):
+        User = get_user_model()
+        worker = User.objects.create_user(
+            email="status-worker@example.com", password="pass", employee_id="S1",
+            roles=["employee"],
+        )
+        self.client.force_login(worker)
+        self.assertEqual(self.client.get(reverse("project:system-status")).status_code, 403)
+
+        staff = User.objects.create_user(
+            email="status-staff@example.com", password="pass", employee_id="S2",
+            roles=["employee"], is_staff=True,
+        )
+        self.client.force_login(staff)
+        response = self.client.get(reverse("project:system-status"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("worker_cache", response.context["deep_status"])
+
+
+class ProjectQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.manager = User.objects.create_user(
+            email="budget@example.com", password="pass", employee_id="QB1",
+            roles=["employee", "project_manager"],
+        )
+        member = User.objects.create_user(
+            email="budget-member@example.com", password="pass", employee_id="QB2",
+            roles=["employee", "worker"],
+        )
+        for number in range(5):
+            project = Project.objects.create(
+                job_number=f"QB{number}", name=f"Budget {number}",
+                project_manager=self.manager,
+            )
+            project.team_members.add(self.manager, member)
+        self.client.force_login(self.manager)
+
+    def test_project_list_budget(self):
+        self.assertViewQueryBudget(reverse("project:project-list"))
+
+    def test_project_detail_budget(self):
+        self.assertViewQueryBudget(
+            reverse("project:project-detail", kwargs={"job_number": "QB0"})
+        )
@@ -189,6 +189,10 @@ urlpatterns = [
         path('projects/', views.ProjectListAPIView.as_view(), name='api-project-list'),
         path('projects/<str:job_number>/', views.ProjectDetailAPIView.as_view(), name='api-project-detail'),
         path('scope/', views.ScopeOfWorkListAPIView.as_view(), name='api-scope-list'),
+
+        # v2 sync API: cursor pagination, ?fields=, ?since= and ETags
+        path('v2/projects/', views.ProjectSyncListAPIView.as_view(), name='api-v2-project-list'),
+        path('v2/projects/<str:job_number>/', views.ProjectSyncDetailAPIView.as_view(), name='api-v2-project-detail'),
     ])),
     
     # ============================================
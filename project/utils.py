@@ -1,27 +1,64 @@
 """Utility functions for the project app."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast
+
+from home.sequences import allocate_numbers, peek
 
 from .models import Project
 
 
+JOB_NUMBER_SCOPE = "project.job_number"
+
+
+def _highest_job_number() -> int:
+    """Largest all-digit job number in use; seeds the sequence on first use."""
+    highest = (
+        Project.objects.filter(job_number__regex=r"^[0-9]+$")
+        .annotate(number=Cast("job_number", BigIntegerField()))
+        .aggregate(highest=Max("number"))["highest"]
+    )
+    return highest or 0
+
+
+def _taken_job_numbers(numbers):
+    return Project.objects.filter(job_number__in=numbers).values_list(
+        "job_number", flat=True
+    )
+
+
+def _format_job_number(value: int) -> str:
+    return f"{value:04d}"
+
+
 def generate_job_number(business_category: Optional["BusinessCategory"] = None) -> str:
-    """Return a unique job number.
+    """Allocate the next job number.
 
-    If ``business_category`` is provided, the sequence is scoped to
-    that category. Job numbers are numeric and zero padded.
+    Job numbers are numeric and zero padded and come from one counter shared
+    by every business category, because ``job_number`` is unique across all
+    projects. ``business_category`` is accepted for compatibility. Call this
+    inside the transaction that saves the project so a rollback returns the
+    number.
     """
-    qs = Project.objects.all()
-    if business_category:
-        qs = qs.filter(locations__business_category=business_category)
+    return allocate_job_numbers(1)[0]
+
+
+def allocate_job_numbers(count: int) -> List[str]:
+    """Allocate a block of ``count`` job numbers for bulk imports."""
+    return allocate_numbers(
+        JOB_NUMBER_SCOPE,
+        count,
+        _format_job_number,
+        taken=_taken_job_numbers,
+        seed=_highest_job_number,
+    )
 
-    last_project = qs.order_by("-job_number").first()
-    last_number = 0
-    if last_project and last_project.job_number.isdigit():
-        last_number = int(last_project.job_number)
 
-    new_number = last_number + 1
-    return f"{new_number:04d}"
+def preview_job_number(business_category: Optional["BusinessCategory"] = None) -> str:
+    """The job number the next project would get, without reserving it."""
+    return _format_job_number(peek(JOB_NUMBER_SCOPE, seed=_highest_job_number))
 
 
 def calculate_project_metrics(project: Project) -> Dict[str, Any]:
@@ -1,6 +1,7 @@
 # project/views.py - Modern Django Views for Project Management
 
 import asyncio
+import hashlib
 import json
 from datetime import date, timedelta
 from decimal import Decimal
@@ -14,7 +15,6 @@ from django.contrib.auth.mixins import (
     PermissionRequiredMixin,
     UserPassesTestMixin,
 )
-from django.core.cache import cache
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.paginator import Paginator
 from django.db import transaction
@@ -36,6 +36,9 @@ from django.http import JsonResponse, HttpResponse, Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from django.utils.http import parse_etags
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.cache import cache_page
@@ -54,11 +57,16 @@ from django.forms.models import model_to_dict
 
 from rest_framework import generics, viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from home import health
+from home.caching import cached, make_key
+
 from .models import (
+    PROJECT_ACCESS_LEVELS_BY_ROLE,
     Project,
     ProjectTemplate,
     ScopeOfWork,
@@ -66,6 +74,8 @@ from .models import (
     ProjectChange,
     ProjectMilestone,
 )
+from .activity import activity_page, recent_activity
+from .reports import financial_report, progress_report
 from .forms import (
     ProjectForm,
     ScopeOfWorkForm,
@@ -76,9 +86,10 @@ from .forms import (
     TravelForm,
     ProjectStatusForm,
 )
-from .serializers import ProjectSerializer, ScopeOfWorkSerializer
+from .serializers import ProjectSerializer, ProjectSyncSerializer, ScopeOfWorkSerializer
+from .pagination import UpdatedAtCursorPagination
 
-from .utils import generate_job_number, calculate_project_metrics
+from .utils import generate_job_number, preview_job_number, calculate_project_metrics
 from .permissions import ProjectAccessMixin, ProjectPermissionMixin
 from todo.models import TaskList
 
@@ -148,6 +159,9 @@ class OptimizedQuerysetMixin:
 # ============================================
 
 
+DASHBOARD_CACHE_TAGS = ("projects", "milestones")
+
+
 class ProjectDashboardView(LoginRequiredMixin, TemplateView):
     """Modern project dashboard with real-time metrics"""
 
@@ -157,14 +171,13 @@ class ProjectDashboardView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         user = self.request.user
 
-        # Cache key for user-specific dashboard data
-        cache_key = f"dashboard_data_{user.id}_{user.role}"
-        dashboard_data = cache.get(cache_key)
-
-        if not dashboard_data:
-            dashboard_data = self._build_dashboard_data(user)
-            cache.set(cache_key, dashboard_data, 60 * 15)  # 15 minutes
-
+        # User-specific dashboard data, expired by project and user changes
+        dashboard_data = cached(
+            make_key("project_dashboard", user.pk, user.role),
+            lambda: self._build_dashboard_data(user),
+            ttl=60 * 15,
+            tags=DASHBOARD_CACHE_TAGS + (f"user:{user.pk}",),
+        )
         context.update(dashboard_data)
 
         # Real-time notifications (not cached)
@@ -193,14 +206,14 @@ class ProjectDashboardView(LoginRequiredMixin, TemplateView):
         )
 
         # Recent projects
-        recent_projects = (
+        recent_projects = list(
             base_queryset.select_related("primary_location", "project_manager")
             .prefetch_related("team_members")
             .order_by("-updated_at")[:10]
         )
 
         # Upcoming milestones
-        upcoming_milestones = (
+        upcoming_milestones = list(
             ProjectMilestone.objects.filter(
                 project__in=base_queryset,
                 target_date__gte=date.today(),
@@ -228,21 +241,7 @@ class ProjectDashboardView(LoginRequiredMixin, TemplateView):
 
     def _get_user_projects(self, user):
         """Get projects accessible to the user"""
-        if user.role == "admin":
-            return Project.objects.all()
-        elif user.role == "project_manager":
-            return Project.objects.filter(
-                Q(project_manager=user) | Q(estimator=user) | Q(team_leads=user)
-            ).distinct()
-        elif user.role in ["supervisor", "worker"]:
-            return Project.objects.filter(
-                Q(supervisor=user) | Q(team_leads=user) | Q(team_members=user)
-            ).distinct()
-        elif user.role == "client":
-            if hasattr(user, "client"):
-                return Project.objects.filter(primary_location__client=user.client)
-
-        return Project.objects.none()
+        return Project.objects.visible_to(user)
 
     def _get_user_notifications(self, user):
         """Get real-time notifications for user"""
@@ -392,14 +391,10 @@ class ProjectListView(LoginRequiredMixin, OptimizedQuerysetMixin, ListView):
         # Role-based filtering
         if user.role == "admin":
             pass  # Admin sees all projects
-        elif user.role == "project_manager":
-            queryset = queryset.filter(
-                Q(project_manager=user) | Q(estimator=user) | Q(team_leads=user)
-            ).distinct()
-        elif user.role in ["supervisor", "worker"]:
-            queryset = queryset.filter(
-                Q(supervisor=user) | Q(team_leads=user) | Q(team_members=user)
-            ).distinct()
+        elif user.role in PROJECT_ACCESS_LEVELS_BY_ROLE:
+            queryset = queryset.for_member(
+                user, PROJECT_ACCESS_LEVELS_BY_ROLE[user.role]
+            )
         elif user.role == "client":
             if hasattr(user, "client"):
                 queryset = queryset.filter(primary_location__client=user.client)
@@ -454,10 +449,7 @@ class ProjectListView(LoginRequiredMixin, OptimizedQuerysetMixin, ListView):
                     else []
                 ),
                 "priority_choices": Project.PRIORITY_CHOICES,
-                "managers": User.objects.filter(
-                    Q(roles__contains=["admin"])
-                    | Q(roles__contains=["project_manager"])
-                ),
+                "managers": User.objects.with_role("admin", "project_manager"),
                 "current_filters": {
                     "search": self.request.GET.get("search", ""),
                     "status": self.request.GET.get("status", ""),
@@ -633,43 +625,7 @@ class ProjectDetailView(ProjectAccessMixin, DetailView):
 
     def _get_recent_activity(self, project):
         """Get recent project activity"""
-        activities = []
-
-        # Recent changes
-        recent_changes = project.changes.order_by("-created_at")[:5]
-        for change in recent_changes:
-            activities.append(
-                {
-                    "type": "change",
-                    "title": f"{change.change_type.title()} Request",
-                    "description": (
-                        change.description[:100] + "..."
-                        if len(change.description) > 100
-                        else change.description
-                    ),
-                    "date": change.created_at,
-                    "user": change.requested_by,
-                    "status": "approved" if change.is_approved else "pending",
-                }
-            )
-
-        # Recent milestone completions
-        recent_milestones = project.milestones.filter(
-            is_complete=True, actual_date__isnull=False
-        ).order_by("-actual_date")[:3]
-
-        for milestone in recent_milestones:
-            activities.append(
-                {
-                    "type": "milestone",
-                    "title": f"Milestone: {milestone.name}",
-                    "description": "Completed",
-                    "date": milestone.actual_date,
-                    "status": "completed",
-                }
-            )
-
-        return sorted(activities, key=lambda x: x["date"], reverse=True)[:10]
+        return recent_activity(project, limit=10)
 
 
 class ProjectCreateView(LoginRequiredMixin, AjaxResponseMixin, CreateView):
@@ -692,14 +648,6 @@ class ProjectCreateView(LoginRequiredMixin, AjaxResponseMixin, CreateView):
         if not form.instance.project_manager:
             form.instance.project_manager = self.request.user
 
-        # Generate job number if not provided
-        if not form.instance.job_number:
-            form.instance.job_number = generate_job_number(
-                form.instance.primary_location.business_category
-                if form.instance.primary_location
-                else None
-            )
-
         # Validate user's project limits
         if self.request.user.role == "project_manager":
             active_projects = Project.objects.filter(
@@ -716,6 +664,14 @@ class ProjectCreateView(LoginRequiredMixin, AjaxResponseMixin, CreateView):
                 return self.form_invalid(form)
 
         with transaction.atomic():
+            # Allocate the job number in the same transaction as the save
+            if not form.instance.job_number:
+                form.instance.job_number = generate_job_number(
+                    form.instance.primary_location.business_category
+                    if form.instance.primary_location
+                    else None
+                )
+
             response = super().form_valid(form)
 
             # Create default milestones if template is used
@@ -919,20 +875,30 @@ class ProjectDuplicateView(ProjectAccessMixin, ProjectPermissionMixin, CreateVie
             exclude=["id", "pk", "job_number", "revision", "created_at", "updated_at"],
         )
         initial["name"] = f"Copy of {original.name}"
-        initial["job_number"] = generate_job_number(original.business_category)
         return initial
 
+    def get_form(self, form_class=None):
+        # The job number is allocated in form_valid; the preview is only a
+        # hint, since another project may take it before this one is saved
+        form = super().get_form(form_class)
+        field = form.fields["job_number"]
+        field.required = False
+        field.widget.attrs["placeholder"] = preview_job_number()
+        field.help_text = "Leave blank to use the next job number."
+        return form
+
     def form_valid(self, form):
         form.instance.created_by = self.request.user
 
-        if not form.instance.job_number:
-            form.instance.job_number = generate_job_number(
-                form.instance.primary_location.business_category
-                if form.instance.primary_location
-                else None
-            )
+        with transaction.atomic():
+            if not form.instance.job_number:
+                form.instance.job_number = generate_job_number(
+                    form.instance.primary_location.business_category
+                    if form.instance.primary_location
+                    else None
+                )
 
-        response = super().form_valid(form)
+            response = super().form_valid(form)
 
         original = get_object_or_404(Project, job_number=self.kwargs["job_number"])
         self.object.team_leads.set(original.team_leads.all())
@@ -1129,7 +1095,9 @@ class ProjectProgressView(ProjectAccessMixin, DetailView):
                 "milestone_data": milestone_data,
                 "team_productivity": team_productivity,
                 "time_tracking": time_tracking,
-                "progress_chart_data": self._get_progress_chart_data(project),
+                "progress_chart_data": self._get_progress_chart_data(
+                    project, scope_progress, milestone_data
+                ),
             }
         )
 
@@ -1189,14 +1157,30 @@ class ProjectProgressView(ProjectAccessMixin, DetailView):
             ),
         }
 
-    def _get_progress_chart_data(self, project):
+    def _get_progress_chart_data(self, project, scope_progress, milestone_data):
         """Get data for progress charts"""
-        # This would typically integrate with your task management system
-        # For now, return sample structure
+        from .progress import project_progress_series
+
         return {
-            "weekly_progress": [],  # Weekly progress data points
-            "scope_breakdown": [],  # Progress by scope area
-            "milestone_timeline": [],  # Milestone timeline data
+            # Weekly points from the nightly progress snapshots
+            "weekly_progress": project_progress_series(project),
+            "scope_breakdown": [
+                {
+                    "area": item["area"],
+                    "system_type": item["system_type"],
+                    "percent_complete": item["percent_complete"],
+                }
+                for item in scope_progress
+            ],
+            "milestone_timeline": [
+                {
+                    "name": milestone["name"],
+                    "target_date": milestone["target_date"],
+                    "actual_date": milestone["actual_date"],
+                    "is_complete": milestone["is_complete"],
+                }
+                for milestone in milestone_data
+            ],
         }
 
 
@@ -1212,56 +1196,12 @@ class ProjectTimelineView(ProjectAccessMixin, DetailView):
         context = super().get_context_data(**kwargs)
         project = self.object
 
-        # Build comprehensive timeline
-        timeline_events = []
-
-        # Project creation
-        timeline_events.append(
-            {
-                "date": project.created_at.date(),
-                "type": "project_created",
-                "title": "Project Created",
-                "description": f'Project created by {project.created_by.get_full_name() if project.created_by else "System"}',
-                "user": project.created_by,
-                "icon": "fa-plus-circle",
-                "color": "primary",
-            }
+        # Latest entries from the activity log, shown oldest first
+        entries, next_cursor = activity_page(
+            project, self.request.GET.get("before"), limit=100
         )
-
-        # Changes
-        for change in project.changes.order_by("created_at"):
-            timeline_events.append(
-                {
-                    "date": change.created_at.date(),
-                    "type": "change",
-                    "title": f"{change.change_type.title()} Request",
-                    "description": change.description,
-                    "user": change.requested_by,
-                    "icon": "fa-edit",
-                    "color": "warning" if not change.is_approved else "success",
-                    "status": "approved" if change.is_approved else "pending",
-                }
-            )
-
-        # Milestones
-        for milestone in project.milestones.order_by("target_date"):
-            if milestone.is_complete:
-                timeline_events.append(
-                    {
-                        "date": milestone.actual_date,
-                        "type": "milestone",
-                        "title": f"Milestone: {milestone.name}",
-                        "description": milestone.description,
-                        "icon": "fa-flag-checkered",
-                        "color": "success",
-                        "is_critical": milestone.is_critical,
-                    }
-                )
-
-        # Sort by date
-        timeline_events.sort(key=lambda x: x["date"])
-
-        context["timeline_events"] = timeline_events
+        context["timeline_events"] = entries[::-1]
+        context["next_cursor"] = next_cursor
         return context
 
 
@@ -1275,41 +1215,13 @@ class ProjectActivityView(ProjectAccessMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["activities"] = self._get_activity(self.object)
+        activities, next_cursor = activity_page(
+            self.object, self.request.GET.get("before")
+        )
+        context["activities"] = activities
+        context["next_cursor"] = next_cursor
         return context
 
-    def _get_activity(self, project):
-        activities = []
-
-        # All changes
-        for change in project.changes.order_by("-created_at"):
-            activities.append(
-                {
-                    "type": "change",
-                    "title": f"{change.change_type.title()} Request",
-                    "description": change.description,
-                    "date": change.created_at,
-                    "user": change.requested_by,
-                    "status": "approved" if change.is_approved else "pending",
-                }
-            )
-
-        # Completed milestones
-        for milestone in project.milestones.filter(
-            is_complete=True, actual_date__isnull=False
-        ).order_by("-actual_date"):
-            activities.append(
-                {
-                    "type": "milestone",
-                    "title": f"Milestone: {milestone.name}",
-                    "description": "Completed",
-                    "date": milestone.actual_date,
-                    "status": "completed",
-                }
-            )
-
-        return sorted(activities, key=lambda x: x["date"], reverse=True)
-
 
 class ProjectFinancialView(ProjectAccessMixin, DetailView):
     """Project financial details and analysis"""
@@ -2338,14 +2250,14 @@ class ProjectTeamView(ProjectAccessMixin, DetailView):
         project = self.object
 
         # Available team members (not already on project)
-        available_members = User.objects.filter(
-            Q(roles__contains=["worker"]) | Q(roles__contains=["supervisor"])
-        ).exclude(id__in=project.team_members.values_list("id", flat=True))
+        available_members = User.objects.with_role("worker", "supervisor").exclude(
+            id__in=project.team_members.values_list("id", flat=True)
+        )
 
         # Available team leads
-        available_leads = User.objects.filter(
-            Q(roles__contains=["supervisor"]) | Q(roles__contains=["project_manager"])
-        ).exclude(id__in=project.team_leads.values_list("id", flat=True))
+        available_leads = User.objects.with_role("supervisor", "project_manager").exclude(
+            id__in=project.team_leads.values_list("id", flat=True)
+        )
 
         context.update(
             {
@@ -2414,13 +2326,9 @@ class MyProjectAssignmentsView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         user = self.request.user
         return (
-            Project.objects.filter(
-                Q(team_members=user)
-                | Q(team_leads=user)
-                | Q(project_manager=user)
-                | Q(supervisor=user)
+            Project.objects.for_member(
+                user, ["team_member", "team_lead", "project_manager", "supervisor"]
             )
-            .distinct()
             .select_related("primary_location", "project_manager")
             .order_by("-updated_at")
         )
@@ -2471,24 +2379,23 @@ def project_search_api(request):
 @permission_classes([IsAuthenticated])
 def dashboard_stats_api(request):
     """API endpoint for dashboard statistics"""
-    user = request.user
-    cache_key = f"dashboard_stats_{user.id}"
-
-    stats = cache.get(cache_key)
-    if not stats:
-        projects = Project.objects.all()  # Apply user filtering as needed
-
-        stats = {
-            "total_projects": projects.count(),
-            "active_projects": projects.filter(status="active").count(),
-            "completed_projects": projects.filter(status="complete").count(),
-            "overdue_projects": projects.filter(
-                due_date__lt=date.today(), status__in=["active", "installing"]
-            ).count(),
-        }
+    today = date.today()
 
-        cache.set(cache_key, stats, 60 * 5)  # 5 minutes
+    def build():
+        # The counts are not user specific, so every user shares one entry
+        return Project.objects.aggregate(
+            total_projects=Count("id"),
+            active_projects=Count("id", filter=Q(status="active")),
+            completed_projects=Count("id", filter=Q(status="complete")),
+            overdue_projects=Count(
+                "id",
+                filter=Q(due_date__lt=today, status__in=["active", "installing"]),
+            ),
+        )
 
+    stats = cached(
+        make_key("project_dashboard_stats", today), build, ttl=60 * 5, tags=("projects",)
+    )
     return Response(stats)
 
 
@@ -2586,6 +2493,109 @@ class ScopeOfWorkListAPIView(ProjectPermissionMixin, generics.ListAPIView):
     permission_required = "project.view_scopeofwork"
 
 
+# ============================================
+# v2 Sync API
+# ============================================
+
+
+def _project_rows_etag(request, rows):
+    """ETag for a response built from ``rows`` (projects) at this URL"""
+    digest = hashlib.md5(request.get_full_path().encode())
+    for project in rows:
+        digest.update(f"{project.pk}:{project.updated_at.isoformat()}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+class ProjectSyncAPIMixin:
+    """Shared scoping, ``?fields=`` and ETag handling for the v2 project API
+
+    Projects are scoped with ``Project.objects.visible_to`` like the HTML
+    dashboard. ``?fields=a,b`` limits both the serialized fields and the
+    columns loaded; many-to-many fields are prefetched only when requested.
+    """
+
+    serializer_class = ProjectSyncSerializer
+    filter_backends = []
+
+    @cached_property
+    def sparse_fields(self):
+        raw = self.request.query_params.get("fields")
+        if not raw:
+            return None
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = set(names) - set(ProjectSyncSerializer().fields)
+        if unknown:
+            raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return names
+
+    def get_queryset(self):
+        queryset = Project.objects.visible_to(self.request.user)
+        m2m_fields = [field.name for field in Project._meta.many_to_many]
+        fields = self.sparse_fields
+        if fields is None:
+            return queryset.prefetch_related(*m2m_fields)
+
+        concrete = {field.name for field in Project._meta.concrete_fields}
+        return queryset.only(
+            "id", "updated_at", "job_number", *[name for name in fields if name in concrete]
+        ).prefetch_related(*[name for name in fields if name in m2m_fields])
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["fields"] = self.sparse_fields
+        return super().get_serializer(*args, **kwargs)
+
+    def not_modified(self, etag):
+        return etag in parse_etags(self.request.headers.get("If-None-Match", ""))
+
+
+class ProjectSyncListAPIView(ProjectSyncAPIMixin, generics.ListAPIView):
+    """Projects ordered by ``(updated_at, id)`` with cursor pagination
+
+    ``?since=<ISO datetime>`` returns only projects changed at or after that
+    time, so integrations can poll for updates.
+    """
+
+    pagination_class = UpdatedAtCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        since = self.request.query_params.get("since")
+        if since:
+            since_dt = parse_datetime(since.replace(" ", "+"))
+            if since_dt is None:
+                raise ParseError("since must be an ISO 8601 datetime")
+            if timezone.is_naive(since_dt):
+                since_dt = timezone.make_aware(since_dt)
+            queryset = queryset.filter(updated_at__gte=since_dt)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        etag = _project_rows_etag(request, page)
+        if self.not_modified(etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response["ETag"] = etag
+        return response
+
+
+class ProjectSyncDetailAPIView(ProjectSyncAPIMixin, generics.RetrieveAPIView):
+    """A single project, honouring ``?fields=`` and If-None-Match"""
+
+    lookup_field = "job_number"
+
+    def retrieve(self, request, *args, **kwargs):
+        project = self.get_object()
+        etag = _project_rows_etag(request, [project])
+        if self.not_modified(etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response = Response(self.get_serializer(project).data)
+        response["ETag"] = etag
+        return response
+
+
 # ============================================
 # Report and Analytics Views
 # ============================================
@@ -2642,106 +2652,11 @@ class FinancialReportView(LoginRequiredMixin, TemplateView):
         date_from = self.request.GET.get("date_from")
         date_to = self.request.GET.get("date_to")
 
-        queryset = Project.objects.all()
-        if date_from:
-            queryset = queryset.filter(start_date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(start_date__lte=date_to)
-
-        # Financial aggregations
-        financial_summary = queryset.aggregate(
-            total_contract_value=Sum("contract_value"),
-            total_estimated_cost=Sum("estimated_cost"),
-            total_invoiced=Sum("invoiced_amount"),
-            total_paid=Sum("paid_amount"),
-            avg_profit_margin=Avg(
-                Case(
-                    When(
-                        contract_value__gt=0,
-                        then=(F("contract_value") - F("estimated_cost"))
-                        * 100
-                        / F("contract_value"),
-                    ),
-                    default=Value(0),
-                    output_field=IntegerField(),
-                )
-            ),
-            project_count=Count("id"),
-        )
-
-        # Profitability by status
-        status_profitability = (
-            queryset.values("status")
-            .annotate(
-                count=Count("id"),
-                total_value=Sum("contract_value"),
-                total_cost=Sum("estimated_cost"),
-                avg_margin=Avg(
-                    Case(
-                        When(
-                            contract_value__gt=0,
-                            then=(F("contract_value") - F("estimated_cost"))
-                            * 100
-                            / F("contract_value"),
-                        ),
-                        default=Value(0),
-                        output_field=IntegerField(),
-                    )
-                ),
-            )
-            .order_by("-total_value")
-        )
-
-        # Monthly financial trends
-        monthly_trends = self._calculate_monthly_trends(queryset)
-
-        # Top performing projects
-        top_projects = (
-            queryset.filter(contract_value__isnull=False, estimated_cost__isnull=False)
-            .annotate(
-                profit=F("contract_value") - F("estimated_cost"),
-                margin=Case(
-                    When(
-                        contract_value__gt=0,
-                        then=(F("contract_value") - F("estimated_cost"))
-                        * 100
-                        / F("contract_value"),
-                    ),
-                    default=Value(0),
-                    output_field=IntegerField(),
-                ),
-            )
-            .order_by("-profit")[:10]
-        )
-
-        context.update(
-            {
-                "financial_summary": financial_summary,
-                "status_profitability": status_profitability,
-                "monthly_trends": monthly_trends,
-                "top_projects": top_projects,
-                "date_from": date_from,
-                "date_to": date_to,
-            }
-        )
+        context.update(financial_report(date_from, date_to))
+        context.update({"date_from": date_from, "date_to": date_to})
 
         return context
 
-    def _calculate_monthly_trends(self, queryset):
-        """Calculate monthly financial trends"""
-        from django.db.models.functions import TruncMonth
-
-        return (
-            queryset.annotate(month=TruncMonth("start_date"))
-            .values("month")
-            .annotate(
-                project_count=Count("id"),
-                total_value=Sum("contract_value"),
-                total_cost=Sum("estimated_cost"),
-            )
-            .order_by("month")
-        )
-
 
 class ProgressReportView(LoginRequiredMixin, TemplateView):
     """Project progress report"""
@@ -2751,76 +2666,7 @@ class ProgressReportView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        projects = Project.objects.select_related("project_manager").annotate(
-            task_count=Count("task_lists__tasks", distinct=True),
-            completed_tasks=Count(
-                "task_lists__tasks",
-                filter=Q(task_lists__tasks__completed=True),
-                distinct=True,
-            ),
-            milestone_count=Count("milestones"),
-            completed_milestones=Count(
-                "milestones", filter=Q(milestones__is_complete=True)
-            ),
-        )
-
-        # Progress statistics
-        progress_stats = {
-            "total_projects": projects.count(),
-            "on_track": projects.filter(percent_complete__gte=50).count(),
-            "behind_schedule": projects.filter(
-                due_date__lt=date.today() + timedelta(days=30), percent_complete__lt=75
-            ).count(),
-            "avg_completion": projects.aggregate(avg=Avg("percent_complete"))["avg"]
-            or 0,
-        }
-
-        # Projects by completion range
-        completion_ranges = [
-            ("0-25%", projects.filter(percent_complete__lt=25).count()),
-            (
-                "25-50%",
-                projects.filter(
-                    percent_complete__gte=25, percent_complete__lt=50
-                ).count(),
-            ),
-            (
-                "50-75%",
-                projects.filter(
-                    percent_complete__gte=50, percent_complete__lt=75
-                ).count(),
-            ),
-            ("75-100%", projects.filter(percent_complete__gte=75).count()),
-        ]
-
-        # Manager performance
-        manager_performance = (
-            projects.values(
-                "project_manager__username",
-                "project_manager__first_name",
-                "project_manager__last_name",
-            )
-            .annotate(
-                project_count=Count("id"),
-                avg_completion=Avg("percent_complete"),
-                on_time_projects=Count(
-                    "id", filter=Q(completed_date__lte=F("due_date"))
-                ),
-            )
-            .order_by("-avg_completion")
-        )
-
-        context.update(
-            {
-                "progress_stats": progress_stats,
-                "completion_ranges": completion_ranges,
-                "manager_performance": manager_performance,
-                "recent_completions": projects.filter(
-                    status="complete",
-                    completed_date__gte=date.today() - timedelta(days=30),
-                ).order_by("-completed_date")[:10],
-            }
-        )
+        context.update(progress_report())
 
         return context
 
@@ -2835,11 +2681,7 @@ class TeamPerformanceReportView(LoginRequiredMixin, TemplateView):
 
         # Team member statistics
         team_stats = (
-            User.objects.filter(
-                Q(roles__contains=["worker"])
-                | Q(roles__contains=["supervisor"])
-                | Q(roles__contains=["project_manager"])
-            )
+            User.objects.with_role("worker", "supervisor", "project_manager")
             .annotate(
                 active_projects=Count(
                     "assigned_projects",
@@ -2880,13 +2722,12 @@ class TeamPerformanceReportView(LoginRequiredMixin, TemplateView):
         return context
 
     def _calculate_workload_distribution(self):
-        """Calculate team workload distribution"""
-        # This would integrate with your task/time tracking system
-        return {
-            "overloaded_members": [],  # Members with >40 hours/week
-            "underutilized_members": [],  # Members with <20 hours/week
-            "optimal_load_members": [],  # Members with 20-40 hours/week
-        }
+        """Calculate team workload distribution from precomputed weekly loads"""
+        from hr.capacity import capacity_heatmap, workload_distribution
+
+        workload = workload_distribution()
+        workload["capacity_heatmap"] = capacity_heatmap(workload["week_start"])
+        return workload
 
 
 class ResourceUtilizationReportView(LoginRequiredMixin, TemplateView):
@@ -2897,14 +2738,34 @@ class ResourceUtilizationReportView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Equipment/resource utilization would be calculated here
-        # This depends on your asset management integration
+        from asset.models import Asset, AssetUtilizationRollup
+        from asset.utilization import find_conflicts
+
+        today = date.today()
+
+        # Average daily utilization per asset category over the last 30 days
+        equipment_utilization = list(
+            AssetUtilizationRollup.objects.filter(date__gte=today - timedelta(days=29))
+            .values("category__name")
+            .annotate(asset_days=Sum("asset_count"), in_use_days=Sum("assets_in_use"))
+            .order_by("category__name")
+        )
+        for row in equipment_utilization:
+            row["utilization_rate"] = round(
+                row["in_use_days"] / row["asset_days"] * 100 if row["asset_days"] else 0, 1
+            )
+
+        # Double-booked assets from last month through the next quarter
+        conflicts = find_conflicts(today - timedelta(days=30), today + timedelta(days=90))
+        assets = Asset.objects.in_bulk({conflict["asset_id"] for conflict in conflicts})
+        for conflict in conflicts:
+            conflict["asset"] = assets.get(conflict["asset_id"])
 
         context.update(
             {
-                "equipment_utilization": [],
+                "equipment_utilization": equipment_utilization,
                 "material_usage": [],
-                "resource_conflicts": [],
+                "resource_conflicts": conflicts,
             }
         )
 
@@ -3029,7 +2890,7 @@ class GenerateJobNumberView(LoginRequiredMixin, View):
                 id=business_category_id
             ).first()
 
-        job_number = generate_job_number(business_category)
+        job_number = preview_job_number(business_category)
 
         return JsonResponse({"job_number": job_number})
 
@@ -3120,13 +2981,9 @@ class RecentlyViewedProjectsView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         # This would integrate with a session-based tracking system
         # For now, return recent projects for the user
-        return (
-            Project.objects.filter(
-                Q(project_manager=self.request.user) | Q(team_members=self.request.user)
-            )
-            .distinct()
-            .order_by("-updated_at")[:10]
-        )
+        return Project.objects.for_member(
+            self.request.user, ["project_manager", "team_member"]
+        ).order_by("-updated_at")[:10]
 
 
 class ProjectSettingsView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
@@ -3203,9 +3060,9 @@ def project_calendar_events_api(request):
     events = []
 
     # Get user's projects
-    user_projects = Project.objects.filter(
-        Q(project_manager=request.user) | Q(team_members=request.user)
-    ).distinct()
+    user_projects = Project.objects.for_member(
+        request.user, ["project_manager", "team_member"]
+    )
 
     if event_type in ["deadlines", "all"]:
         # Project deadlines
@@ -3268,100 +3125,54 @@ def project_calendar_events_api(request):
 
 
 class ProjectHealthCheckView(View):
-    """System health check for project module"""
-
-    def get(self, request):
-        checks = {
-            "database": self._check_database(),
-            "cache": self._check_cache(),
-            "permissions": self._check_permissions(),
-            "business_logic": self._check_business_logic(),
-        }
+    """System health check for project module
 
-        overall_status = all(check["status"] for check in checks.values())
+    Backed by the shared readiness probe (``SELECT 1`` and a cache ping,
+    rechecked at most once a second) so load balancer polling stays cheap.
+    """
 
+    def get(self, request):
+        readiness = health.readiness()
+        checks = dict(readiness["checks"])
         return JsonResponse(
             {
-                "status": "healthy" if overall_status else "unhealthy",
+                "status": "healthy" if readiness["status"] == "ready" else "unhealthy",
                 "checks": checks,
                 "timestamp": timezone.now().isoformat(),
-            }
+            },
+            status=200 if readiness["status"] == "ready" else 503,
         )
 
-    def _check_database(self):
-        """Check database connectivity and basic queries"""
-        try:
-            Project.objects.count()
-            return {"status": True, "message": "Database accessible"}
-        except Exception as e:
-            return {"status": False, "message": f"Database error: {str(e)}"}
-
-    def _check_cache(self):
-        """Check cache functionality"""
-        try:
-            cache.set("health_check", "ok", 60)
-            value = cache.get("health_check")
-            return {
-                "status": value == "ok",
-                "message": "Cache functional" if value == "ok" else "Cache not working",
-            }
-        except Exception as e:
-            return {"status": False, "message": f"Cache error: {str(e)}"}
-
-    def _check_permissions(self):
-        """Check permission system"""
-        try:
-            # Basic permission check
-            from django.contrib.auth.models import Permission
-
-            Permission.objects.filter(content_type__app_label="project").exists()
-            return {"status": True, "message": "Permissions configured"}
-        except Exception as e:
-            return {"status": False, "message": f"Permission error: {str(e)}"}
-
-    def _check_business_logic(self):
-        """Check business logic functions"""
-        try:
-            # Test job number generation
-            test_number = generate_job_number()
-            return {"status": bool(test_number), "message": "Business logic functional"}
-        except Exception as e:
-            return {"status": False, "message": f"Business logic error: {str(e)}"}
 
-
-class SystemStatusView(LoginRequiredMixin, TemplateView):
-    """System status dashboard"""
+class SystemStatusView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """System status dashboard (staff only, like /health/status/)"""
 
     template_name = "project/system_status.html"
 
+    def test_func(self):
+        return self.request.user.is_staff
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         # System statistics
         context["system_stats"] = {
-            "total_projects": Project.objects.count(),
-            "active_projects": Project.objects.filter(status="active").count(),
-            "total_users": User.objects.count(),
-            "active_users": User.objects.filter(is_active=True).count(),
-            "database_size": self._get_database_size(),
-            "cache_usage": self._get_cache_usage(),
+            **Project.objects.aggregate(
+                total_projects=Count("id"),
+                active_projects=Count("id", filter=Q(status="active")),
+            ),
+            **User.objects.aggregate(
+                total_users=Count("id"),
+                active_users=Count("id", filter=Q(is_active=True)),
+            ),
         }
+        context["deep_status"] = health.system_status()
 
         # Recent activity
         context["recent_activity"] = self._get_recent_system_activity()
 
         return context
 
-    def _get_database_size(self):
-        """Get database size estimate"""
-        # This would depend on your database backend
-        return "N/A"
-
-    def _get_cache_usage(self):
-        """Get cache usage statistics"""
-        # This would depend on your cache backend
-        return "N/A"
-
     def _get_recent_system_activity(self):
         """Get recent system activity"""
         activities = []
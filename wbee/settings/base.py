@@ -81,6 +81,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # ==============================================================================
 
 MIDDLEWARE = [
+    'home.profiling.QueryProfilingMiddleware',  # Per-view query budgets, see query_report
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files in production
@@ -408,6 +409,19 @@ CACHES = {
     }
 }
 
+# Health probes (home.health): readiness is rechecked at most once per
+# interval per process; the deep status snapshot is rebuilt every TTL seconds.
+HEALTH_READINESS_INTERVAL = 1.0
+HEALTH_CHECK_TIMEOUT = 0.5
+HEALTH_STATUS_TTL = 300
+
+# In-process L1 in front of CACHES['default'] for home.caching. L1 entries
+# live at most TIERED_CACHE_L1_TTL seconds on workers that did not see the
+# invalidation.
+TIERED_CACHE_L1_SIZE = 1000
+TIERED_CACHE_L1_TTL = 5
+TIERED_CACHE_LOCK_TIMEOUT = 30
+
 # Session engine
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -416,6 +430,19 @@ SESSION_CACHE_ALIAS = 'default'
 # PERFORMANCE SETTINGS
 # ==============================================================================
 
+# Per-view query profiling (home.profiling). Cheap enough to leave on; lower
+# the sample rate on very busy deployments.
+QUERY_PROFILING_ENABLED = config('QUERY_PROFILING_ENABLED', default=True, cast=bool)
+QUERY_PROFILING_SAMPLE_RATE = config('QUERY_PROFILING_SAMPLE_RATE', default=1.0, cast=float)
+QUERY_PROFILING_WINDOW = 300  # seconds
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGETS = {
+    'home:index': 40,
+    'project:project-list': 25,
+    'project:project-detail': 40,
+    'asset:list': 25,
+}
+
 # Database connection pooling
 #if 'postgresql' in DATABASES['default']['ENGINE']:
 #    DATABASES['default']['OPTIONS'] = {